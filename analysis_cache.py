@@ -0,0 +1,142 @@
+import argparse
+import hashlib
+import json
+import logging
+import os
+import time
+
+ANALYSIS_CACHE_DIR = os.getenv("ANALYSIS_CACHE_DIR", ".analysis_cache")
+ANALYSIS_CACHE_MAX_ENTRIES = int(os.getenv("ANALYSIS_CACHE_MAX_ENTRIES", "2000"))
+ANALYSIS_CACHE_MAX_BYTES = int(os.getenv("ANALYSIS_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+FINGERPRINT_FILE = "PROMPT_FINGERPRINT"
+
+logger = logging.getLogger("interviewer.analysis_cache")
+
+
+def fingerprint(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def analysis_cache_key(transcript_text: str, jd: str, model: str, prompt_version: str) -> str:
+    """Content address of an analysis: compacted transcript, JD, model and prompt version"""
+    payload = json.dumps(
+        {"transcript": transcript_text, "jd": jd, "model": model, "prompt_version": prompt_version},
+        sort_keys=True, ensure_ascii=False,
+    )
+    return fingerprint(payload)
+
+
+class AnalysisCache:
+    """Persistent content-addressed cache of AI analysis results with size-bounded LRU eviction.
+
+    `prompt_fingerprint` identifies the prompt template; when it changes every entry is dropped.
+    """
+
+    def __init__(self, directory: str = ANALYSIS_CACHE_DIR, prompt_fingerprint: str = None,
+                 max_entries: int = ANALYSIS_CACHE_MAX_ENTRIES, max_bytes: int = ANALYSIS_CACHE_MAX_BYTES) -> None:
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+        if prompt_fingerprint is not None:
+            self._check_fingerprint(prompt_fingerprint)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _entries(self):
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.is_file() and entry.name.endswith(".json"):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def _check_fingerprint(self, prompt_fingerprint: str):
+        path = os.path.join(self.directory, FINGERPRINT_FILE)
+        try:
+            with open(path, encoding="utf-8") as f:
+                stored = f.read().strip()
+        except FileNotFoundError:
+            stored = None
+        if stored != prompt_fingerprint:
+            if stored is not None:
+                removed = self.clear()
+                logger.info(f"♻️ Analysis prompt changed, invalidated {removed} cached analyses")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(prompt_fingerprint)
+
+    def get(self, key: str):
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                value = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.misses += 1
+            return None
+        # Touch the entry so eviction is least-recently-used
+        os.utime(path)
+        self.hits += 1
+        return value
+
+    def put(self, key: str, value) -> None:
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(value, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def evict(self) -> int:
+        entries = sorted(self._entries())
+        total_bytes = sum(size for _, size, _ in entries)
+        removed = 0
+        while entries and (len(entries) > self.max_entries or total_bytes > self.max_bytes):
+            _, size, path = entries.pop(0)
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total_bytes -= size
+            removed += 1
+        return removed
+
+    def clear(self) -> int:
+        removed = 0
+        for _, _, path in self._entries():
+            try:
+                os.remove(path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+        return removed
+
+    def stats(self) -> dict:
+        entries = self._entries()
+        return {
+            "entries": len(entries),
+            "bytes": sum(size for _, size, _ in entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "oldest_age_s": time.time() - min(mtime for mtime, _, _ in entries) if entries else None,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the AI analysis cache")
+    parser.add_argument("command", choices=["stats", "clear"])
+    parser.add_argument("--dir", default=ANALYSIS_CACHE_DIR, help="Cache directory")
+    args = parser.parse_args()
+
+    cache = AnalysisCache(args.dir)
+    if args.command == "clear":
+        print(f"Removed {cache.clear()} cached analyses from {args.dir}")
+    else:
+        print(json.dumps(cache.stats(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+
+try:
+    import fcntl
+except ImportError:  # Not on POSIX: HostRateLimiter only limits its own process
+    fcntl = None
+
+from pydantic import BaseModel, ValidationError
+from tenacity import AsyncRetrying, retry_if_exception, stop_after_attempt, wait_random_exponential
+
+from metrics import ANALYSIS_CALLS
+
+logger = logging.getLogger("interviewer.analysis")
+
+ANALYSIS_MODEL = os.getenv("ANALYSIS_MODEL", "gemini-2.0-flash")
+ANALYSIS_FALLBACK_MODEL = os.getenv("ANALYSIS_FALLBACK_MODEL", "gemini-2.0-flash-lite")
+# Upper bound on one attempt (primary plus hedge), in seconds
+ANALYSIS_CALL_DEADLINE = float(os.getenv("ANALYSIS_CALL_DEADLINE", "60"))
+ANALYSIS_MAX_ATTEMPTS = int(os.getenv("ANALYSIS_MAX_ATTEMPTS", "3"))
+# The hedge starts once the primary has been running longer than its recent p95 latency
+ANALYSIS_HEDGE_PERCENTILE = float(os.getenv("ANALYSIS_HEDGE_PERCENTILE", "95"))
+ANALYSIS_HEDGE_MIN_DELAY = float(os.getenv("ANALYSIS_HEDGE_MIN_DELAY", "2"))
+# Used until enough latencies have been observed for a percentile
+ANALYSIS_HEDGE_DEFAULT_DELAY = float(os.getenv("ANALYSIS_HEDGE_DEFAULT_DELAY", "10"))
+HEDGE_MIN_SAMPLES = 20
+NON_RETRYABLE_STATUS = {400, 401, 403, 404}
+
+
+class InterviewAnalysis(BaseModel):
+    """Structured analysis returned by Gemini. No field defaults: the Gemini schema converter rejects them."""
+    candidate_name: str
+    interest_level: str
+    readiness: str
+    experience_level: str
+    technical_skills: list[str]
+    soft_skills: list[str]
+    key_strengths: str
+    areas_for_improvement: str
+    overall_assessment: str
+    notable_quotes: list[str]
+
+
+class AnalysisFormatError(ValueError):
+    """The model returned something that doesn't validate against InterviewAnalysis"""
+
+
+class RateLimiter:
+    """Spaces out requests so no more than `requests_per_minute` start in any minute"""
+
+    def __init__(self, requests_per_minute: float) -> None:
+        self.interval = 60.0 / requests_per_minute if requests_per_minute > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            wait = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class HostRateLimiter(RateLimiter):
+    """RateLimiter whose schedule lives in `path`, so every process sharing the file draws on one
+    `requests_per_minute` budget. The file is locked with `flock` while a slot is reserved."""
+
+    def __init__(self, requests_per_minute: float, path: str) -> None:
+        super().__init__(requests_per_minute)
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    def _reserve(self) -> float:
+        """Take the next slot and return how long to wait for it"""
+        with open(self.path, "a+") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                try:
+                    next_slot = float(f.read().strip() or 0)
+                except ValueError:
+                    next_slot = 0.0
+                now = time.time()
+                f.seek(0)
+                f.truncate()
+                f.write(repr(max(now, next_slot) + self.interval))
+                f.flush()
+                return next_slot - now
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    async def acquire(self):
+        if not self.interval or fcntl is None:
+            return await super().acquire()
+        wait = await asyncio.to_thread(self._reserve)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class AnalysisCallResult:
+    def __init__(self, analysis: dict, model: str, attempts: int, hedged: bool, elapsed: float) -> None:
+        self.analysis = analysis
+        self.model = model
+        self.attempts = attempts
+        self.hedged = hedged
+        self.elapsed = elapsed
+
+
+def parse_analysis(text: str) -> dict:
+    """Validate a response against InterviewAnalysis. Tolerates code fences and prose around the JSON object."""
+    text = (text or "").strip()
+    try:
+        return InterviewAnalysis.model_validate_json(text).model_dump()
+    except ValidationError:
+        start, end = text.find("{"), text.rfind("}")
+        if start == -1 or end <= start:
+            raise AnalysisFormatError("No JSON object in analysis response")
+        try:
+            return InterviewAnalysis.model_validate_json(text[start:end + 1]).model_dump()
+        except ValidationError as e:
+            raise AnalysisFormatError(f"Analysis response failed validation: {e.error_count()} error(s)") from e
+
+
+def percentile(values, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+class LatencyTracker:
+    """Recent successful call latencies per model, used to pick the hedge delay"""
+
+    def __init__(self, maxlen: int = 200) -> None:
+        self.maxlen = maxlen
+        self._latencies = {}
+
+    def record(self, model: str, seconds: float):
+        self._latencies.setdefault(model, deque(maxlen=self.maxlen)).append(seconds)
+
+    def hedge_delay(self, model: str) -> float:
+        latencies = self._latencies.get(model)
+        if not latencies or len(latencies) < HEDGE_MIN_SAMPLES:
+            return ANALYSIS_HEDGE_DEFAULT_DELAY
+        return max(ANALYSIS_HEDGE_MIN_DELAY, percentile(latencies, ANALYSIS_HEDGE_PERCENTILE))
+
+
+_latency_tracker = LatencyTracker()
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    return getattr(exc, "code", None) not in NON_RETRYABLE_STATUS
+
+
+async def _call_model(client, model: str, contents, cached_content=None, rate_limiter=None) -> dict:
+    from google.genai import types
+    if rate_limiter is not None:
+        await rate_limiter.acquire()
+    config = types.GenerateContentConfig(
+        response_mime_type="application/json",
+        response_schema=InterviewAnalysis,
+        cached_content=cached_content,
+    )
+    started_at = time.perf_counter()
+    response = await client.aio.models.generate_content(model=model, contents=contents, config=config)
+    analysis = parse_analysis(response.text)
+    _latency_tracker.record(model, time.perf_counter() - started_at)
+    return analysis
+
+
+async def _hedged_attempt(client, prompt: str, cached_request: str, cached_content, primary: str, fallback: str,
+                          rate_limiter=None):
+    """One attempt: the primary request, plus a fallback-model request if the primary outlives the hedge
+    delay. Returns (analysis, winning_model, hedged) for the first valid response."""
+    if cached_content:
+        primary_call = _call_model(client, primary, cached_request, cached_content, rate_limiter)
+    else:
+        primary_call = _call_model(client, primary, prompt, rate_limiter=rate_limiter)
+    tasks = {asyncio.create_task(primary_call): primary}
+    hedged = False
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=_latency_tracker.hedge_delay(primary))
+        if not done and fallback and fallback != primary:
+            # Cached content belongs to the primary model, so the hedge sends the prompt inline
+            tasks[asyncio.create_task(_call_model(client, fallback, prompt, rate_limiter=rate_limiter))] = fallback
+            hedged = True
+        errors = []
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    ANALYSIS_CALLS.labels(model=tasks[task], outcome="won").inc()
+                    return task.result(), tasks[task], hedged
+                ANALYSIS_CALLS.labels(model=tasks[task], outcome="error").inc()
+                errors.append(task.exception())
+        raise errors[-1]
+    finally:
+        for task, model in tasks.items():
+            if not task.done():
+                task.cancel()
+                ANALYSIS_CALLS.labels(model=model, outcome="cancelled").inc()
+
+
+async def generate_analysis(client, prompt: str, cached_request: str = None, cached_content: str = None,
+                            primary: str = ANALYSIS_MODEL, fallback: str = ANALYSIS_FALLBACK_MODEL,
+                            deadline: float = ANALYSIS_CALL_DEADLINE,
+                            max_attempts: int = ANALYSIS_MAX_ATTEMPTS, rate_limiter: RateLimiter = None) -> AnalysisCallResult:
+    """Generate a validated analysis with hedging, a per-attempt deadline and jittered retries.
+
+    `prompt` is the full inline prompt. When `cached_content` names a context cache for the
+    primary model, the primary sends `cached_request` (the part after the cached prefix) instead.
+    `rate_limiter` is acquired before every outgoing request, retries and hedges included.
+    """
+    started_at = time.perf_counter()
+    attempts = 0
+    async for attempt in AsyncRetrying(
+        stop=stop_after_attempt(max_attempts),
+        wait=wait_random_exponential(multiplier=1, max=10),
+        retry=retry_if_exception(_is_retryable),
+        reraise=True,
+    ):
+        with attempt:
+            attempts = attempt.retry_state.attempt_number
+            try:
+                analysis, model, hedged = await asyncio.wait_for(
+                    _hedged_attempt(client, prompt, cached_request, cached_content, primary, fallback, rate_limiter),
+                    deadline,
+                )
+            except asyncio.TimeoutError:
+                ANALYSIS_CALLS.labels(model=primary, outcome="timeout").inc()
+                logger.info(f"  ⏱️ Analysis attempt {attempts} exceeded its {deadline:g}s deadline")
+                raise
+            except Exception as e:
+                logger.info(f"  🔁 Analysis attempt {attempts} failed: {e}")
+                raise
+    return AnalysisCallResult(analysis, model, attempts, hedged, time.perf_counter() - started_at)
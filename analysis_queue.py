@@ -0,0 +1,161 @@
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+
+try:
+    import fcntl
+except ImportError:  # Not on POSIX: the concurrency cap only holds within a process
+    fcntl = None
+
+from metrics import ANALYSIS_JOBS_DROPPED
+
+logger = logging.getLogger("interviewer.analysis_queue")
+
+# Analyses running at once across every job process on the host
+ANALYSIS_CONCURRENCY = int(os.getenv("ANALYSIS_CONCURRENCY", "2"))
+ANALYSIS_QUEUE_SIZE = int(os.getenv("ANALYSIS_QUEUE_SIZE", "32"))
+# Lock files that hold the host-wide analysis slots
+ANALYSIS_SLOTS_DIR = os.getenv("ANALYSIS_SLOTS_DIR", ".analysis_slots")
+SLOT_POLL_INTERVAL = 0.25
+
+
+class HostSlots:
+    """At most `count` holders at a time across every process sharing `directory`.
+
+    Each slot is a lock file held with `flock`, so a slot is freed by the OS when its
+    process dies. Acquiring polls the slots without blocking the event loop.
+    """
+
+    def __init__(self, count: int, directory: str = ANALYSIS_SLOTS_DIR) -> None:
+        self.count = max(1, count)
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    async def acquire(self):
+        """Wait for a free slot. Returns a handle to pass to `release`."""
+        if fcntl is None:
+            return None
+        while True:
+            for index in range(self.count):
+                slot = open(os.path.join(self.directory, f"slot-{index}.lock"), "a")
+                try:
+                    fcntl.flock(slot, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    return slot
+                except BlockingIOError:
+                    slot.close()
+            await asyncio.sleep(SLOT_POLL_INTERVAL)
+
+    def release(self, slot):
+        if slot is not None:
+            fcntl.flock(slot, fcntl.LOCK_UN)
+            slot.close()
+
+
+class AnalysisQueue:
+    """Bounded queue that runs post-interview analyses in the background.
+
+    LiveKit runs every job in its own process, so the queue itself is per process; the
+    concurrency cap is enforced across processes by `HostSlots`. A job that doesn't fit in
+    the queue is dropped: its interview record is already saved, and `reanalyze.py` picks
+    up records without an analysis.
+    """
+
+    def __init__(self, concurrency: int = ANALYSIS_CONCURRENCY, maxsize: int = ANALYSIS_QUEUE_SIZE,
+                 slots_dir: str = ANALYSIS_SLOTS_DIR) -> None:
+        self.concurrency = max(1, concurrency)
+        self.maxsize = maxsize
+        self._slots = HostSlots(self.concurrency, slots_dir)
+        self._queue = None
+        self._workers = []
+        self._running = 0
+        self.completed = 0
+        self.failed = 0
+        self.dropped = 0
+        self.latencies = deque(maxlen=200)
+
+    def _ensure_started(self):
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.maxsize)
+        self._workers = [w for w in self._workers if not w.done()]
+        while len(self._workers) < self.concurrency:
+            self._workers.append(asyncio.create_task(self._worker(len(self._workers))))
+
+    def submit(self, label: str, job_factory) -> bool:
+        """Queue a job without waiting. `job_factory` is a zero-argument callable returning a coroutine.
+        Returns False, and drops the job, when the queue is full."""
+        self._ensure_started()
+        try:
+            self._queue.put_nowait((label, job_factory, time.monotonic()))
+        except asyncio.QueueFull:
+            self.dropped += 1
+            ANALYSIS_JOBS_DROPPED.inc()
+            logger.warning(f"⚠️ Analysis queue full ({self.depth} pending), dropped the analysis for {label}; "
+                           f"its record is saved and `python reanalyze.py` will analyze it")
+            return False
+        logger.info(f"📥 Queued AI analysis for {label} (queue depth: {self.depth})")
+        return True
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def stats(self) -> dict:
+        latencies = sorted(self.latencies)
+        return {
+            "queue_depth": self.depth,
+            "running": self._running,
+            "completed": self.completed,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "last_latency_s": self.latencies[-1] if self.latencies else None,
+            "p50_latency_s": latencies[len(latencies) // 2] if latencies else None,
+            "max_latency_s": latencies[-1] if latencies else None,
+        }
+
+    async def _worker(self, worker_id: int):
+        while True:
+            label, job_factory, queued_at = await self._queue.get()
+            # Wait for a host-wide slot; a cancelled wait (the process is exiting) leaves the job to reanalyze
+            slot = await self._slots.acquire()
+            started_at = time.monotonic()
+            self._running += 1
+            try:
+                await job_factory()
+                self.completed += 1
+            except Exception as e:
+                self.failed += 1
+                logger.error(f"❌ Analysis job for {label} failed: {e}")
+            finally:
+                self._running -= 1
+                self._slots.release(slot)
+                finished_at = time.monotonic()
+                self.latencies.append(finished_at - started_at)
+                logger.info(
+                    f"📊 Analysis job for {label} finished in {finished_at - started_at:.1f}s "
+                    f"(waited {started_at - queued_at:.1f}s, queue depth: {self.depth})"
+                )
+                self._queue.task_done()
+
+    async def wait_idle(self, timeout: float = None) -> bool:
+        """Wait until every queued job has finished. Returns False on timeout."""
+        if self._queue is None:
+            return True
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            logger.warning(f"⚠️ Analysis queue still busy after {timeout}s ({self.depth} pending, {self._running} running)")
+            return False
+
+
+_analysis_queue = None
+
+
+def get_analysis_queue() -> AnalysisQueue:
+    """Return this process's analysis queue"""
+    global _analysis_queue
+    if _analysis_queue is None:
+        _analysis_queue = AnalysisQueue()
+    return _analysis_queue
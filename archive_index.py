@@ -0,0 +1,283 @@
+import argparse
+import json
+import logging
+import os
+import re
+import sqlite3
+import time
+from contextlib import closing
+
+from interview_record import INTERVIEW_RECORDS_DIR, find_records, read_record
+from log_pipeline import setup_logging
+
+logger = logging.getLogger("interviewer.archive")
+
+ARCHIVE_DB = os.getenv("ARCHIVE_DB", "interview_archive.db")
+# Bump when the schema changes; the index is rebuilt from the records with `backfill`
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS interviews (
+    id INTEGER PRIMARY KEY,
+    interview_key TEXT NOT NULL UNIQUE,
+    candidate_name TEXT,
+    job_description TEXT,
+    start_time TEXT,
+    duration_minutes REAL,
+    interview_status TEXT,
+    record_file TEXT,
+    analyzed INTEGER NOT NULL DEFAULT 0,
+    experience_level TEXT,
+    readiness TEXT,
+    interest_level TEXT,
+    overall_assessment TEXT,
+    indexed_at REAL
+);
+CREATE INDEX IF NOT EXISTS interviews_experience ON interviews (experience_level);
+CREATE INDEX IF NOT EXISTS interviews_readiness ON interviews (readiness);
+CREATE INDEX IF NOT EXISTS interviews_interest ON interviews (interest_level);
+CREATE TABLE IF NOT EXISTS skills (
+    interview_id INTEGER NOT NULL REFERENCES interviews (id) ON DELETE CASCADE,
+    kind TEXT NOT NULL,
+    skill TEXT NOT NULL COLLATE NOCASE
+);
+CREATE INDEX IF NOT EXISTS skills_skill ON skills (skill);
+CREATE INDEX IF NOT EXISTS skills_interview ON skills (interview_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS turns USING fts5 (
+    text, role UNINDEXED, timestamp UNINDEXED, interview_id UNINDEXED, turn_index UNINDEXED,
+    tokenize = 'porter unicode61'
+);
+"""
+
+
+class ArchiveQueryError(ValueError):
+    """A search query that is neither valid FTS5 syntax nor contains any searchable words"""
+
+
+def literal_query(text: str) -> str:
+    """Quote every word of `text` so FTS5 matches them as plain terms, ignoring query syntax"""
+    terms = re.findall(r"\w+", text)
+    if not terms:
+        raise ArchiveQueryError(f"Search query {text!r} has no searchable words")
+    return " ".join(f'"{term}"' for term in terms)
+
+
+class ArchiveIndex:
+    """SQLite index over archived interviews: one row per interview with the analysis levels,
+    a skills table, and an FTS5 table of transcript turns. Ingesting an interview again replaces it."""
+
+    def __init__(self, path: str = ARCHIVE_DB) -> None:
+        self.path = path
+        with closing(self._connect()) as conn, conn:
+            if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                conn.executescript("DROP TABLE IF EXISTS turns; DROP TABLE IF EXISTS skills; DROP TABLE IF EXISTS interviews;")
+            conn.executescript(SCHEMA)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def _connect(self) -> sqlite3.Connection:
+        # One short-lived connection per call, so ingestion can run from worker threads
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        return conn
+
+    def _upsert_interview(self, conn, key: str, fields: dict) -> int:
+        # Every column is written, so a field that is gone from the record is cleared (NULL) in the index
+        fields = {**fields, "indexed_at": time.time()}
+        columns = ", ".join(["interview_key", *fields])
+        placeholders = ", ".join("?" for _ in range(len(fields) + 1))
+        updates = ", ".join(f"{name} = excluded.{name}" for name in fields)
+        conn.execute(
+            f"INSERT INTO interviews ({columns}) VALUES ({placeholders}) "
+            f"ON CONFLICT (interview_key) DO UPDATE SET {updates}",
+            [key, *fields.values()],
+        )
+        return conn.execute("SELECT id FROM interviews WHERE interview_key = ?", (key,)).fetchone()["id"]
+
+    def _replace_turns(self, conn, interview_id: int, turns):
+        conn.execute("DELETE FROM turns WHERE interview_id = ?", (interview_id,))
+        conn.executemany(
+            "INSERT INTO turns (text, role, timestamp, interview_id, turn_index) VALUES (?, ?, ?, ?, ?)",
+            [
+                (turn.get('text', ''), turn.get('role', 'unknown'), turn.get('timestamp'), interview_id, index)
+                for index, turn in enumerate(turns or []) if turn.get('text')
+            ],
+        )
+
+    def ingest_record(self, record_file: str, record: dict = None) -> int:
+        """Index an interview record, with its analysis when it has one"""
+        if record is None:
+            record = read_record(record_file)
+        analysis = (record.get('analysis') or {}).get('result') or {}
+        with closing(self._connect()) as conn, conn:
+            interview_id = self._upsert_interview(conn, record["interview_id"], {
+                "candidate_name": analysis.get('candidate_name') or record.get('candidate_name'),
+                "job_description": record.get('job_description'),
+                "start_time": record.get('start_time'),
+                "duration_minutes": record.get('duration_minutes'),
+                "interview_status": record.get('interview_status'),
+                "record_file": os.path.abspath(record_file),
+                "analyzed": 1 if analysis else 0,
+                "experience_level": analysis.get('experience_level'),
+                "readiness": analysis.get('readiness'),
+                "interest_level": analysis.get('interest_level'),
+                "overall_assessment": analysis.get('overall_assessment'),
+            })
+            self._replace_turns(conn, interview_id, record.get('transcript'))
+            conn.execute("DELETE FROM skills WHERE interview_id = ?", (interview_id,))
+            conn.executemany(
+                "INSERT INTO skills (interview_id, kind, skill) VALUES (?, ?, ?)",
+                [(interview_id, kind, skill) for kind in ("technical", "soft")
+                 for skill in analysis.get(f'{kind}_skills', []) if skill],
+            )
+        return interview_id
+
+    def backfill(self, directory: str = INTERVIEW_RECORDS_DIR) -> dict:
+        """Index every interview record in `directory`"""
+        counts = {"records": 0, "failed": 0}
+        for path in find_records(directory):
+            try:
+                self.ingest_record(path)
+                counts["records"] += 1
+            except Exception as e:
+                counts["failed"] += 1
+                logger.error(f"❌ Could not index {os.path.basename(path)}: {e}")
+        return counts
+
+    def search(self, text: str = None, experience_level: str = None, readiness: str = None,
+               interest_level: str = None, skill: str = None, role: str = None, limit: int = 20):
+        """Find interviews by analysis fields and skills, optionally matching an FTS5 query over turns.
+        Returns dicts with the interview columns, plus matching turn snippets when `text` is given.
+        A query that isn't valid FTS5 syntax (e.g. `"foo` or a bare `AND`) is matched as plain words."""
+        where, params = [], []
+        for column, value in (("experience_level", experience_level), ("readiness", readiness),
+                              ("interest_level", interest_level)):
+            if value:
+                where.append(f"i.{column} = ? COLLATE NOCASE")
+                params.append(value)
+        if skill:
+            where.append("EXISTS (SELECT 1 FROM skills s WHERE s.interview_id = i.id AND s.skill LIKE ?)")
+            params.append(f"%{skill}%")
+
+        with closing(self._connect()) as conn:
+            if not text:
+                clause = f"WHERE {' AND '.join(where)}" if where else ""
+                rows = conn.execute(
+                    f"SELECT i.* FROM interviews i {clause} ORDER BY i.start_time DESC LIMIT ?", [*params, limit]
+                ).fetchall()
+                return [dict(row) for row in rows]
+
+            where.insert(0, "turns MATCH ?")
+            params.insert(0, text)
+            if role:
+                where.append("t.role = ?")
+                params.append(role)
+            query = (f"SELECT i.*, t.turn_index, t.role, t.timestamp, "
+                     f"snippet(turns, 0, '[', ']', '…', 12) AS snippet "
+                     f"FROM turns t JOIN interviews i ON i.id = t.interview_id "
+                     f"WHERE {' AND '.join(where)} ORDER BY i.id, t.rank")
+            try:
+                rows = conn.execute(query, params).fetchall()
+            except sqlite3.OperationalError:
+                params[0] = literal_query(text)
+                rows = conn.execute(query, params).fetchall()
+
+        results = {}
+        for row in rows:
+            result = results.get(row["id"])
+            if result is None:
+                if len(results) >= limit:
+                    continue
+                result = results[row["id"]] = {
+                    key: row[key] for key in row.keys() if key not in ("turn_index", "role", "timestamp", "snippet")
+                }
+                result["matches"] = []
+            result["matches"].append({
+                "turn_index": row["turn_index"], "role": row["role"],
+                "timestamp": row["timestamp"], "snippet": row["snippet"],
+            })
+        return list(results.values())
+
+    def skills_for(self, interview_id: int):
+        with closing(self._connect()) as conn:
+            rows = conn.execute("SELECT skill FROM skills WHERE interview_id = ? ORDER BY kind, rowid", (interview_id,))
+            return [row["skill"] for row in rows]
+
+    def stats(self) -> dict:
+        with closing(self._connect()) as conn:
+            return {
+                "interviews": conn.execute("SELECT count(*) FROM interviews").fetchone()[0],
+                "analyzed": conn.execute("SELECT count(*) FROM interviews WHERE analyzed").fetchone()[0],
+                "turns": conn.execute("SELECT count(*) FROM turns").fetchone()[0],
+                "skills": conn.execute("SELECT count(DISTINCT skill) FROM skills").fetchone()[0],
+            }
+
+
+_archive_index = None
+
+
+def get_archive_index() -> ArchiveIndex:
+    global _archive_index
+    if _archive_index is None:
+        _archive_index = ArchiveIndex()
+    return _archive_index
+
+
+def print_results(index: ArchiveIndex, results):
+    for result in results:
+        print(f"• {result['candidate_name'] or 'Candidate'} — {result['start_time'] or 'unknown date'} "
+              f"({result['interview_key']})")
+        print(f"    Experience: {result['experience_level'] or '-'} | Readiness: {result['readiness'] or '-'} "
+              f"| Interest: {result['interest_level'] or '-'}")
+        skills = index.skills_for(result['id'])
+        if skills:
+            print(f"    Skills: {', '.join(skills)}")
+        for match in result.get("matches", [])[:3]:
+            speaker = "Interviewer" if match["role"] == "assistant" else "Candidate"
+            print(f"    [{match['timestamp'] or '?'}] {speaker}: {match['snippet']}")
+    print(f"\n{len(results)} interview(s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search and maintain the interview archive index")
+    parser.add_argument("--db", default=ARCHIVE_DB, help="Archive database file")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    backfill = commands.add_parser("backfill", help="Index existing interview records")
+    backfill.add_argument("directory", nargs="?", default=INTERVIEW_RECORDS_DIR)
+
+    search = commands.add_parser("search", help="Search archived interviews")
+    search.add_argument("text", nargs="?", help="FTS5 query over transcript turns, e.g. 'pytorch OR tensorflow'")
+    search.add_argument("--experience", help="Experience level, e.g. Senior")
+    search.add_argument("--readiness", help="Readiness, e.g. Ready")
+    search.add_argument("--interest", help="Interest level, e.g. High")
+    search.add_argument("--skill", help="Skill mentioned in the analysis (substring match)")
+    search.add_argument("--role", choices=["user", "assistant"], help="Only match turns from this speaker")
+    search.add_argument("--limit", type=int, default=20)
+    search.add_argument("--json", action="store_true", help="Print results as JSON")
+
+    commands.add_parser("stats", help="Show index counts")
+    args = parser.parse_args()
+    setup_logging(log_dir="")
+
+    index = ArchiveIndex(args.db)
+    if args.command == "backfill":
+        counts = index.backfill(args.directory)
+        print(f"Indexed {counts['records']} record(s) into {args.db} ({counts['failed']} failed)")
+    elif args.command == "search":
+        try:
+            results = index.search(args.text, args.experience, args.readiness, args.interest, args.skill,
+                                   args.role, args.limit)
+        except ArchiveQueryError as e:
+            parser.error(str(e))
+        if args.json:
+            print(json.dumps(results, indent=2, ensure_ascii=False))
+        else:
+            print_results(index, results)
+    else:
+        print(json.dumps(index.stats(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
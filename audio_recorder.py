@@ -0,0 +1,260 @@
+import asyncio
+import json
+import logging
+import os
+import queue
+import re
+import threading
+import time
+from fractions import Fraction
+
+from metrics import AUDIO_FRAMES
+
+logger = logging.getLogger("interviewer.recorder")
+
+# Record candidate and agent audio for compliance archives (off by default)
+AUDIO_RECORDING = os.getenv("AUDIO_RECORDING", "0").lower() in ("1", "true", "yes")
+AUDIO_RECORDINGS_DIR = os.getenv("AUDIO_RECORDINGS_DIR", "recordings")
+# Frames (10-20ms each) buffered for the encoder; when full, new frames are dropped and counted
+AUDIO_RECORDING_QUEUE_FRAMES = int(os.getenv("AUDIO_RECORDING_QUEUE_FRAMES", "500"))
+AUDIO_RECORDING_BITRATE = int(os.getenv("AUDIO_RECORDING_BITRATE", "32000"))
+# Each track is split into Ogg/Opus files of at most this many seconds
+AUDIO_SEGMENT_SECONDS = float(os.getenv("AUDIO_SEGMENT_SECONDS", "300"))
+AUDIO_RECORDING_CLOSE_TIMEOUT = float(os.getenv("AUDIO_RECORDING_CLOSE_TIMEOUT", "10"))
+SAMPLE_RATE = 48000
+# Shorter gaps (dropped frames, muted microphone) are filled with silence so offsets stay aligned with
+# wall-clock time; longer ones start a new segment
+MAX_PAD_SECONDS = 10.0
+
+
+def _safe_name(name: str) -> str:
+    return re.sub(r"[^\w.-]", "_", name)
+
+
+class _TrackWriter:
+    """Encodes one track's PCM into Ogg/Opus segments. Only used from the encoder thread."""
+
+    def __init__(self, directory: str, track: str, segment_seconds: float, bitrate: int) -> None:
+        self.directory = directory
+        self.track = track
+        self.segment_samples = int(segment_seconds * SAMPLE_RATE)
+        self.bitrate = bitrate
+        self.segments = []
+        self._segment = None
+        self._container = None
+        self._stream = None
+        self._samples = 0
+        self.failed = False
+
+    def _open_segment(self, started_at: float):
+        import av
+        file_name = f"{_safe_name(self.track)}_{len(self.segments):03d}.ogg"
+        self._container = av.open(os.path.join(self.directory, file_name), "w", format="ogg")
+        self._stream = self._container.add_stream("libopus", rate=SAMPLE_RATE, layout="mono")
+        self._stream.bit_rate = self.bitrate
+        self._samples = 0
+        self._segment = {"track": self.track, "file": file_name, "started_at": started_at, "duration_s": 0.0}
+        self.segments.append(self._segment)
+
+    def _close_segment(self):
+        if self._container is None:
+            return
+        for packet in self._stream.encode(None):
+            self._container.mux(packet)
+        self._container.close()
+        self._container = self._stream = None
+
+    def _encode(self, samples):
+        import av
+        frame = av.AudioFrame.from_ndarray(samples.reshape(1, -1), format="s16", layout="mono")
+        frame.sample_rate = SAMPLE_RATE
+        frame.time_base = Fraction(1, SAMPLE_RATE)
+        frame.pts = self._samples
+        for packet in self._stream.encode(frame):
+            self._container.mux(packet)
+        self._samples += len(samples)
+        self._segment["duration_s"] = self._samples / SAMPLE_RATE
+
+    def write(self, pcm: bytes, captured_at: float):
+        import numpy as np
+        samples = np.frombuffer(pcm, dtype=np.int16)
+        frame_started_at = captured_at - len(samples) / SAMPLE_RATE
+        gap = 0
+        if self._container is not None:
+            gap = int((frame_started_at - self._segment["started_at"]) * SAMPLE_RATE) - self._samples
+        if self._container is None or self._samples >= self.segment_samples or gap > MAX_PAD_SECONDS * SAMPLE_RATE:
+            self._close_segment()
+            self._open_segment(frame_started_at)
+        elif gap > SAMPLE_RATE // 50:
+            self._encode(np.zeros(gap, dtype=np.int16))
+        self._encode(samples)
+
+    def close(self):
+        self._close_segment()
+
+
+class AudioRecorder:
+    """Records a room's candidate and agent audio to Ogg/Opus without touching the realtime path.
+
+    One task per subscribed audio track reads frames and hands them to a bounded queue
+    with `put_nowait`; when the encoder falls behind, frames are dropped and counted
+    rather than blocking the event loop. A single encoder thread per room writes each
+    track as segments under `<directory>/<room>/`. `mark_turn` notes when each
+    transcript turn was captured, and `aclose` writes a manifest linking every turn to
+    its segment and offset.
+    """
+
+    def __init__(self, room_name: str, directory: str = AUDIO_RECORDINGS_DIR,
+                 queue_frames: int = AUDIO_RECORDING_QUEUE_FRAMES, segment_seconds: float = AUDIO_SEGMENT_SECONDS,
+                 bitrate: int = AUDIO_RECORDING_BITRATE) -> None:
+        self.room_name = room_name or "unknown"
+        self.directory = os.path.join(directory, _safe_name(self.room_name))
+        self.manifest_path = os.path.join(self.directory, "manifest.json")
+        self.segment_seconds = segment_seconds
+        self.bitrate = bitrate
+        self.turns = []
+        self.frames = {}
+        self.dropped = {}
+        self.started_at = None
+        self._queue = queue.Queue(maxsize=max(1, queue_frames))
+        self._thread = threading.Thread(target=self._encode_loop, name=f"audio-recorder-{self.room_name}", daemon=True)
+        self._writers = {}
+        # Held by the encoder thread while it writes, so `manifest` never sees a segment half-updated
+        self._lock = threading.Lock()
+        self._tasks = {}
+        self._closed = False
+
+    def start(self, room):
+        """Record audio tracks the agent is subscribed to or publishes in `room`, now and later"""
+        from livekit import rtc
+        os.makedirs(self.directory, exist_ok=True)
+        self.started_at = time.time()
+        self._thread.start()
+
+        def on_track_subscribed(track, publication, participant):
+            if track.kind == rtc.TrackKind.KIND_AUDIO:
+                self.record_track(track, f"candidate-{participant.identity}")
+
+        def on_local_track_published(publication, track):
+            if track.kind == rtc.TrackKind.KIND_AUDIO:
+                self.record_track(track, "agent")
+
+        room.on("track_subscribed", on_track_subscribed)
+        room.on("local_track_published", on_local_track_published)
+        for participant in room.remote_participants.values():
+            for publication in participant.track_publications.values():
+                if publication.track is not None:
+                    on_track_subscribed(publication.track, publication, participant)
+        for publication in room.local_participant.track_publications.values():
+            if publication.track is not None:
+                on_local_track_published(publication, publication.track)
+        logger.info("🎙️ Recording audio to %s", self.directory, extra={"room": self.room_name})
+
+    def record_track(self, track, name: str):
+        if self._closed or name in self._tasks:
+            return
+        self._tasks[name] = asyncio.create_task(self._read_track(track, name))
+
+    async def _read_track(self, track, name: str):
+        from livekit import rtc
+        stream = rtc.AudioStream(track, sample_rate=SAMPLE_RATE, num_channels=1)
+        try:
+            async for event in stream:
+                self.offer(name, bytes(event.frame.data), time.time())
+        finally:
+            await stream.aclose()
+
+    def offer(self, track: str, pcm: bytes, captured_at: float):
+        """Queue a mono 48 kHz s16 frame for encoding, or drop it if the encoder is behind. Never blocks."""
+        try:
+            self._queue.put_nowait((track, pcm, captured_at))
+        except queue.Full:
+            self.dropped[track] = self.dropped.get(track, 0) + 1
+            AUDIO_FRAMES.labels(room=self.room_name, outcome="dropped").inc()
+            return
+        self.frames[track] = self.frames.get(track, 0) + 1
+        AUDIO_FRAMES.labels(room=self.room_name, outcome="queued").inc()
+
+    def mark_turn(self, entry: dict):
+        """Note when a transcript turn was captured, to link it to the recording"""
+        self.turns.append({"timestamp": entry.get('timestamp'), "role": entry.get('role'), "at": time.time()})
+
+    def _encode_loop(self):
+        try:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    break
+                track, pcm, captured_at = item
+                with self._lock:
+                    writer = self._writers.get(track)
+                    if writer is None:
+                        writer = self._writers[track] = _TrackWriter(self.directory, track, self.segment_seconds,
+                                                                     self.bitrate)
+                    if writer.failed:
+                        continue
+                    try:
+                        writer.write(pcm, captured_at)
+                    except Exception as e:
+                        writer.failed = True
+                        logger.error("❌ Audio encoding failed for %s, dropping the rest of its recording: %s", track, e,
+                                     extra={"room": self.room_name})
+        finally:
+            with self._lock:
+                for writer in self._writers.values():
+                    try:
+                        writer.close()
+                    except Exception as e:
+                        logger.warning("⚠️ Could not finish audio segment: %s", e, extra={"room": self.room_name})
+
+    def manifest(self) -> dict:
+        """Segments per track, and for each transcript turn the segments and offsets it falls in.
+        Safe to call while the encoder is still running; it waits for the frame being written."""
+        with self._lock:
+            segments = [dict(segment) for writer in self._writers.values() for segment in writer.segments]
+        turns = []
+        for turn in self.turns:
+            links = [
+                {"track": segment["track"], "file": segment["file"], "offset_s": round(turn["at"] - segment["started_at"], 3)}
+                for segment in segments
+                if segment["started_at"] <= turn["at"] <= segment["started_at"] + segment["duration_s"]
+            ]
+            turns.append({**turn, "audio": links})
+        return {
+            "room": self.room_name,
+            "started_at": self.started_at,
+            "sample_rate": SAMPLE_RATE,
+            "segments": segments,
+            "turns": turns,
+            "frames": self.frames,
+            "dropped_frames": self.dropped,
+        }
+
+    async def aclose(self):
+        """Stop reading tracks, let the encoder drain the queue, and write the manifest"""
+        if self._closed:
+            return
+        self._closed = True
+        for task in self._tasks.values():
+            task.cancel()
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+        if self._thread.ident is None:
+            # Never started, so nothing was recorded
+            return
+        if self._thread.is_alive():
+            await asyncio.to_thread(self._queue.put, None)
+            await asyncio.to_thread(self._thread.join, AUDIO_RECORDING_CLOSE_TIMEOUT)
+        if self._thread.is_alive():
+            logger.warning("⚠️ Audio encoder still busy after %gs, manifest covers what was encoded so far",
+                           AUDIO_RECORDING_CLOSE_TIMEOUT, extra={"room": self.room_name})
+        manifest = self.manifest()
+        await asyncio.to_thread(self._write_manifest, manifest)
+        logger.info("🎙️ Recorded %d segment(s), %d frame(s) dropped", len(manifest["segments"]),
+                    sum(self.dropped.values()), extra={"room": self.room_name})
+
+    def _write_manifest(self, manifest: dict):
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
@@ -0,0 +1,99 @@
+"""Time cohort_analytics over synthetic interview records: full build, incremental update and queries.
+
+Usage (from the repository root):
+    python -m benchmarks.cohort_bench --interviews 10000
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+from cohort_analytics import LEVELS, CohortCache
+from interview_record import new_record, record_path, write_record
+
+JOBS = ["Data Scientist", "Machine Learning Engineer", "Data Analyst", "Backend Engineer"]
+SKILLS = ["Python", "SQL", "PyTorch", "TensorFlow", "Pandas", "Spark", "AWS", "GCP", "Docker", "Kubernetes",
+          "Statistics", "A/B testing", "scikit-learn", "Airflow", "dbt", "Tableau", "Communication", "Teamwork",
+          "Leadership", "Problem solving", "Curiosity", "Mentoring"]
+
+
+def synthetic_record(index: int, rng: random.Random) -> dict:
+    analysis = {
+        "candidate_name": f"Candidate {index}",
+        "experience_level": rng.choice(LEVELS["experience"]),
+        "readiness": rng.choice(LEVELS["readiness"]),
+        "interest_level": rng.choice(LEVELS["interest"]),
+        "technical_skills": rng.sample(SKILLS[:16], rng.randint(2, 8)),
+        "soft_skills": rng.sample(SKILLS[16:], rng.randint(1, 3)),
+    }
+    started_at = datetime(2025, 1, 1, tzinfo=timezone.utc) + timedelta(minutes=37 * index)
+    return new_record({
+        "candidate_name": analysis["candidate_name"],
+        "job_description": rng.choice(JOBS),
+        "start_time": started_at.isoformat(),
+        "duration_minutes": max(1.0, rng.gauss(18, 6)),
+        "transcript": [],
+        "analysis": {"result": analysis} if rng.random() < 0.95 else None,
+    }, f"interview_synthetic_{index:06d}")
+
+
+def write_records(directory: str, start: int, count: int, rng: random.Random):
+    for index in range(start, start + count):
+        write_record(synthetic_record(index, rng), record_path(f"interview_synthetic_{index:06d}", directory, "none"))
+
+
+def timed(fn, *args):
+    started_at = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - started_at
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cohort analytics on synthetic interview records")
+    parser.add_argument("--interviews", type=int, default=10000)
+    parser.add_argument("--added", type=int, default=100, help="Records added before the incremental update")
+    parser.add_argument("--queries", type=int, default=100, help="Report queries to average over")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    workdir = tempfile.mkdtemp(prefix="lunartech_cohort_")
+    records_dir = os.path.join(workdir, "interviews")
+    cache_file = os.path.join(workdir, "cohort_cache.npz")
+    _, write_s = timed(write_records, records_dir, 0, args.interviews, rng)
+
+    cache = CohortCache()
+    _, build_s = timed(cache.update, records_dir)
+    _, save_s = timed(cache.save, cache_file)
+
+    write_records(records_dir, args.interviews, args.added, rng)
+    cache, load_s = timed(CohortCache.load, cache_file)
+    counts, update_s = timed(cache.update, records_dir)
+
+    query_s = []
+    for _ in range(args.queries):
+        _, elapsed = timed(cache.report, rng.choice(JOBS))
+        query_s.append(elapsed)
+    _, full_report_s = timed(cache.report)
+
+    print(json.dumps({
+        "interviews": len(cache),
+        "write_records_s": round(write_s, 3),
+        "full_build_s": round(build_s, 3),
+        "save_s": round(save_s, 3),
+        "cache_bytes": os.path.getsize(cache_file),
+        "load_s": round(load_s, 4),
+        "incremental_update": counts,
+        "incremental_update_s": round(update_s, 3),
+        "job_report_ms_mean": round(sum(query_s) / len(query_s) * 1000, 2),
+        "job_report_ms_max": round(max(query_s) * 1000, 2),
+        "full_report_ms": round(full_report_s * 1000, 2),
+        "workdir": workdir,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Local stand-ins for LiveKit, Gemini and Tavily used by the replay benchmarks"""
+import asyncio
+import json
+import random
+from types import SimpleNamespace
+
+from transcript_store import TranscriptStore
+
+
+def jittered(latency: float, jitter: float) -> float:
+    return max(0.0, random.uniform(latency - jitter, latency + jitter)) if jitter else latency
+
+
+class FakeSession:
+    """Minimal AgentSession replacement: supports `session.on(...)` handlers and synchronous emit"""
+
+    def __init__(self) -> None:
+        self._handlers = {}
+        self._conversation_transcript = TranscriptStore()
+
+    def on(self, event: str, callback=None):
+        def register(fn):
+            self._handlers.setdefault(event, []).append(fn)
+            return fn
+        return register(callback) if callback is not None else register
+
+    def emit(self, event: str, payload):
+        for handler in self._handlers.get(event, []):
+            handler(payload)
+
+
+def user_transcribed_event(text: str, speaker_id: str = "candidate"):
+    return SimpleNamespace(transcript=text, is_final=True, speaker_id=speaker_id)
+
+
+def conversation_item_event(text: str, interrupted: bool = False):
+    return SimpleNamespace(item=SimpleNamespace(role="assistant", text_content=text, interrupted=interrupted))
+
+
+def agent_state_event(new_state: str, old_state: str = "thinking"):
+    return SimpleNamespace(old_state=old_state, new_state=new_state)
+
+
+FAKE_ANALYSIS = {
+    "candidate_name": "Replay Candidate",
+    "interest_level": "Medium",
+    "readiness": "Somewhat Ready",
+    "experience_level": "Mid-level",
+    "technical_skills": ["Python", "SQL", "Machine Learning"],
+    "soft_skills": ["Communication"],
+    "key_strengths": "Replay analysis.",
+    "areas_for_improvement": "Replay analysis.",
+    "overall_assessment": "Replay analysis.",
+    "notable_quotes": [],
+}
+
+
+class _FakeModels:
+    def __init__(self, latency: float, jitter: float) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.calls = 0
+
+    async def generate_content(self, model: str, contents, config=None):
+        self.calls += 1
+        await asyncio.sleep(jittered(self.latency, self.jitter))
+        return SimpleNamespace(text=json.dumps(FAKE_ANALYSIS))
+
+
+class FakeGenAIClient:
+    """Replacement for `genai.Client` exposing the async `client.aio.models.generate_content` path"""
+
+    def __init__(self, latency: float = 2.0, jitter: float = 0.0) -> None:
+        self.aio = SimpleNamespace(models=_FakeModels(latency, jitter))
+
+
+class FakeSearchClient:
+    """Replacement for the Tavily HTTP client used by SearchBackend"""
+
+    def __init__(self, latency: float = 0.5, jitter: float = 0.0) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.calls = 0
+
+    async def search(self, query: str, search_depth: str = "basic") -> dict:
+        self.calls += 1
+        await asyncio.sleep(jittered(self.latency, self.jitter))
+        return {"answer": f"Replay answer for: {query}", "results": []}
+
+    async def aclose(self):
+        pass
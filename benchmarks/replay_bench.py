@@ -0,0 +1,231 @@
+"""Replay recorded interview transcripts through the real handlers and agent methods.
+
+Usage (from the repository root):
+    python -m benchmarks.replay_bench --interviews 50 --concurrency 25 --llm-latency 2 --search-latency 0.4
+"""
+import argparse
+import asyncio
+import contextlib
+import glob
+import json
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+from collections import deque
+
+import analysis_queue
+import archive_index
+import interview_analysis
+import rolling_analysis
+import search_backend
+import InterviewerAgent
+from analysis_cache import AnalysisCache
+from analysis_calls import RateLimiter
+from context_cache import LocalContextCache
+from benchmarks.fakes import (
+    FakeGenAIClient, FakeSearchClient, FakeSession,
+    agent_state_event, conversation_item_event, user_transcribed_event,
+)
+from log_pipeline import setup_logging
+from main import register_transcript_handlers
+from transcript_journal import TranscriptJournal
+
+SEARCH_QUERIES = ["Is the role remote?", "What is the salary range?", "salary range", "Is part-time possible?",
+                  "What benefits are offered?", "What cloud platforms do you use?"]
+
+
+class ReplayInterviewAgent(InterviewerAgent.InterviewAgent):
+    """InterviewAgent bound to a FakeSession instead of a running AgentSession"""
+
+    def __init__(self, fake_session, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self._fake_session = fake_session
+
+    @property
+    def session(self):
+        return self._fake_session
+
+
+def percentile(values, pct: float):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def load_transcripts(pattern: str):
+    transcripts = []
+    for path in sorted(glob.glob(pattern)):
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('transcript'):
+            transcripts.append(data)
+    if not transcripts:
+        raise SystemExit(f"No transcripts matched {pattern}")
+    return transcripts
+
+
+async def simulate_interview(index: int, recording: dict, args, timings: dict, journal_dir: str):
+    room = f"replay-room-{index}"
+    jd = recording.get('job_description', 'Undefined Position')
+    if args.unique:
+        jd = f"{jd}\n(replay {index})"
+    session = FakeSession()
+    session._transcript_journal = TranscriptJournal(room, {
+        "candidate_name": recording.get('candidate_name', 'Candidate'),
+        "job_description": jd,
+        "start_time": recording.get('start_time'),
+    }, directory=journal_dir, journal_id=str(index))
+    if args.rolling:
+        session._rolling_analysis = rolling_analysis.RollingAnalyzer(
+            jd, recording.get('candidate_name', 'Candidate'), room, every=args.rolling, min_interval=0,
+        )
+    register_transcript_handlers(session, room)
+
+    agent = ReplayInterviewAgent(session, name=recording.get('candidate_name', 'Candidate'), jd=jd)
+    agent.room_name = room
+    await agent.on_enter()
+
+    for turn_index, entry in enumerate(recording['transcript']):
+        if args.turn_gap:
+            await asyncio.sleep(args.turn_gap)
+        started_at = time.perf_counter()
+        if entry.get('role') == 'assistant':
+            session.emit("agent_state_changed", agent_state_event("speaking"))
+            session.emit("conversation_item_added", conversation_item_event(entry.get('text', '')))
+        else:
+            session.emit("user_input_transcribed", user_transcribed_event(entry.get('text', ''), entry.get('speaker_id')))
+        timings["handler"].append(time.perf_counter() - started_at)
+
+        if args.search_every and entry.get('role') != 'assistant' and turn_index % args.search_every == 0:
+            started_at = time.perf_counter()
+            await agent.web_search(random.choice(SEARCH_QUERIES))
+            timings["web_search"].append(time.perf_counter() - started_at)
+
+    started_at = time.perf_counter()
+    await agent.end_interview()
+    timings["end_interview"].append(time.perf_counter() - started_at)
+    timings["turns"] += len(recording['transcript'])
+
+
+async def run_benchmark(args) -> dict:
+    recordings = load_transcripts(os.path.abspath(args.transcripts))
+    workdir = tempfile.mkdtemp(prefix="lunartech_replay_")
+    journal_dir = os.path.join(workdir, "journals")
+
+    # Swap the network clients for local fakes
+    interview_analysis._genai_client = FakeGenAIClient(args.llm_latency, args.llm_jitter)
+    interview_analysis._analysis_cache = AnalysisCache(directory=os.path.join(workdir, "analysis_cache"))
+    interview_analysis._context_cache = LocalContextCache()
+    rolling_analysis._rate_limiter = RateLimiter(0)
+    archive_index._archive_index = archive_index.ArchiveIndex(os.path.join(workdir, "archive.db"))
+    fake_search = FakeSearchClient(args.search_latency, args.search_jitter)
+    search_backend._search_backend = search_backend.SearchBackend(
+        client=fake_search, cache=search_backend.SearchCache(os.path.join(workdir, "search_cache.db")),
+    )
+    InterviewerAgent.TAVILY_API_KEY = InterviewerAgent.TAVILY_API_KEY or "replay"
+    jobs = analysis_queue._analysis_queue = analysis_queue.AnalysisQueue(slots_dir=os.path.join(workdir, "analysis_slots"))
+    jobs.latencies = deque()
+
+    timings = {"handler": [], "web_search": [], "end_interview": [], "turns": 0}
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def run_one(index):
+        async with semaphore:
+            await simulate_interview(index, recordings[index % len(recordings)], args, timings, journal_dir)
+
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    output = open(os.devnull, 'w') if not args.verbose else sys.stdout
+    started_at = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(output):
+            await asyncio.gather(*(run_one(index) for index in range(args.interviews)))
+            interviews_done_at = time.perf_counter()
+            await jobs.wait_idle()
+    finally:
+        os.chdir(cwd)
+    finished_at = time.perf_counter()
+
+    def summarize(values):
+        return {
+            "count": len(values),
+            "p50_ms": (percentile(values, 50) or 0) * 1000,
+            "p95_ms": (percentile(values, 95) or 0) * 1000,
+            "p99_ms": (percentile(values, 99) or 0) * 1000,
+        }
+
+    return {
+        "interviews": args.interviews,
+        "concurrency": args.concurrency,
+        "turns": timings["turns"],
+        "wall_time_s": finished_at - started_at,
+        "turns_per_s": timings["turns"] / (interviews_done_at - started_at),
+        "interviews_per_s": args.interviews / (finished_at - started_at),
+        "handler": summarize(timings["handler"]),
+        "web_search": summarize(timings["web_search"]),
+        "end_interview": summarize(timings["end_interview"]),
+        "analysis_job": summarize(list(jobs.latencies)),
+        "search_cache": search_backend.get_search_backend().stats(),
+        "llm_calls": interview_analysis._genai_client.aio.models.calls,
+        "search_calls": fake_search.calls,
+        "peak_rss_mb": peak_rss_mb(),
+        "workdir": workdir,
+    }
+
+
+def print_report(report: dict):
+    print(f"REPLAY BENCHMARK")
+    print(f"================")
+    print(f"Interviews: {report['interviews']} ({report['concurrency']} concurrent), turns: {report['turns']}")
+    print(f"Wall time: {report['wall_time_s']:.2f}s")
+    print(f"Throughput: {report['turns_per_s']:.1f} turns/s, {report['interviews_per_s']:.2f} interviews/s")
+    for name in ("handler", "web_search", "end_interview", "analysis_job"):
+        stats = report[name]
+        print(f"  {name:<14} n={stats['count']:<6} p50={stats['p50_ms']:.2f}ms "
+              f"p95={stats['p95_ms']:.2f}ms p99={stats['p99_ms']:.2f}ms")
+    print(f"Search cache: {report['search_cache']}")
+    print(f"Fake LLM calls: {report['llm_calls']}, fake search calls: {report['search_calls']}")
+    print(f"Peak RSS: {report['peak_rss_mb']:.1f} MB")
+    print(f"Artifacts: {report['workdir']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded interviews against local fakes and report latency")
+    parser.add_argument("--transcripts", default="interview_*_transcript.json", help="Glob of recorded transcripts")
+    parser.add_argument("--interviews", type=int, default=20, help="Simulated interviews to run")
+    parser.add_argument("--concurrency", type=int, default=10, help="Simulated interviews running at once")
+    parser.add_argument("--turn-gap", type=float, default=0.0, help="Seconds between replayed turns")
+    parser.add_argument("--search-every", type=int, default=4, help="Call web_search every N candidate turns (0 = never)")
+    parser.add_argument("--llm-latency", type=float, default=2.0, help="Fake Gemini latency in seconds")
+    parser.add_argument("--llm-jitter", type=float, default=0.5)
+    parser.add_argument("--search-latency", type=float, default=0.4, help="Fake Tavily latency in seconds")
+    parser.add_argument("--search-jitter", type=float, default=0.1)
+    parser.add_argument("--rolling", type=int, default=0,
+                        help="Run the rolling analyzer every N candidate turns (0 = full analysis at the end)")
+    parser.add_argument("--unique", action="store_true", help="Make every interview unique so the analysis cache never hits")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    parser.add_argument("--verbose", action="store_true", help="Show the agent's log output")
+    args = parser.parse_args()
+    if args.verbose:
+        setup_logging(log_dir="")
+
+    report = asyncio.run(run_benchmark(args))
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
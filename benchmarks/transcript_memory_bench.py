@@ -0,0 +1,105 @@
+"""Measure transcript memory per turn: the baseline dict-per-turn list against TranscriptStore.
+
+The baseline kept every turn once, as a dict in `session._conversation_transcript`;
+`interview_summary` and the analysis referenced that same list. (`InterviewAgent.on_message`
+is not a LiveKit hook and never ran, so the agent's own list stayed empty.) The store keeps one
+slotted Turn per turn and hands out views.
+
+Usage (from the repository root):
+    python -m benchmarks.transcript_memory_bench --turns 20000
+"""
+import argparse
+import gc
+import glob
+import json
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+from transcript_store import TranscriptStore
+
+
+def source_turns(pattern: str):
+    turns = []
+    for path in sorted(glob.glob(pattern)):
+        with open(path, encoding='utf-8') as f:
+            turns.extend(entry for entry in json.load(f).get('transcript') or [] if entry.get('text'))
+    if not turns:
+        raise SystemExit(f"No transcript turns matched {pattern}")
+    return turns
+
+
+def incoming(source, count: int):
+    """What the transcript handlers receive per turn: fresh strings, as the STT and LLM events produce"""
+    started_at = datetime(2025, 8, 16, 11, 0, tzinfo=timezone.utc)
+    for index in range(count):
+        entry = source[index % len(source)]
+        role = 'assistant' if entry.get('role') == 'assistant' else 'user'
+        at = started_at + timedelta(seconds=7 * index)
+        speaker_id = None if role == 'assistant' else "".join(["candidate-", "1"])
+        yield role, (entry['text'] + " ")[:-1], at, speaker_id
+
+
+def build_baseline(source, count: int):
+    session_transcript = []
+    for role, text, at, speaker_id in incoming(source, count):
+        session_transcript.append({'timestamp': at.strftime("%H:%M:%S"), 'role': role, 'text': text,
+                                   'speaker_id': speaker_id})
+    # The save and analysis paths referenced the session's list
+    return session_transcript, {"transcript": session_transcript}
+
+
+def build_store(source, count: int):
+    store = TranscriptStore()
+    for role, text, at, speaker_id in incoming(source, count):
+        store.add(role, text, at.strftime("%H:%M:%S"), speaker_id)
+    # The save and analysis paths hold views, not copies
+    return store, {"transcript": store.view()}, store.view()
+
+
+def measure(build, source, count: int) -> int:
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    result = build(source, count)
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    del result
+    return used
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare transcript memory per turn: dict list against TranscriptStore")
+    parser.add_argument("--transcripts", default="interview_*_transcript.json", help="Glob of recorded transcripts")
+    parser.add_argument("--turns", type=int, default=20000, help="Turns to hold in memory")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    source = source_turns(args.transcripts)
+    text_bytes = measure(lambda src, n: [text for _, text, _, _ in incoming(src, n)], source, args.turns)
+    baseline = measure(build_baseline, source, args.turns)
+    store = measure(build_store, source, args.turns)
+
+    report = {
+        "turns": args.turns,
+        "text_bytes_per_turn": round(text_bytes / args.turns, 1),
+        "baseline_bytes_per_turn": round(baseline / args.turns, 1),
+        "store_bytes_per_turn": round(store / args.turns, 1),
+        "baseline_overhead_per_turn": round((baseline - text_bytes) / args.turns, 1),
+        "store_overhead_per_turn": round((store - text_bytes) / args.turns, 1),
+        "reduction": round(1 - store / baseline, 3) if baseline else 0.0,
+    }
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    print(f"TRANSCRIPT MEMORY ({report['turns']} turns)")
+    print(f"  {'Turn text alone:':<28}{report['text_bytes_per_turn']:>8.1f} bytes/turn")
+    print(f"  {'Baseline (dict per turn):':<28}{report['baseline_bytes_per_turn']:>8.1f} bytes/turn "
+          f"({report['baseline_overhead_per_turn']:.1f} beyond the text)")
+    print(f"  {'TranscriptStore + views:':<28}{report['store_bytes_per_turn']:>8.1f} bytes/turn "
+          f"({report['store_overhead_per_turn']:.1f} beyond the text)")
+    print(f"  Reduction: {report['reduction'] * 100:.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,313 @@
+import argparse
+import json
+import os
+import time
+from datetime import datetime
+
+import numpy as np
+
+from interview_record import INTERVIEW_RECORDS_DIR, LEGACY_ANALYSIS_SUFFIX, find_records, find_unmigrated, read_record
+
+COHORT_CACHE_FILE = os.getenv("COHORT_CACHE_FILE", os.path.join(INTERVIEW_RECORDS_DIR, ".cohort_cache.npz"))
+# Bump when the cache layout changes; an older cache is rebuilt from the records
+CACHE_VERSION = 1
+
+# Known levels first, in order, so tables read naturally; anything else the model returns is appended
+LEVELS = {
+    "experience": ("Junior", "Mid-level", "Senior"),
+    "readiness": ("Not Ready", "Somewhat Ready", "Ready", "Very Ready"),
+    "interest": ("Low", "Medium", "High"),
+}
+LEVEL_FIELDS = {"experience": "experience_level", "readiness": "readiness", "interest": "interest_level"}
+CATEGORICAL = ("job", "experience", "readiness", "interest", "skill")
+DEFAULT_PERCENTILES = (10, 25, 50, 75, 90, 95)
+
+
+class Categories:
+    """Case-insensitive string <-> integer code mapping, in first-seen order. Code -1 means missing."""
+
+    def __init__(self, values=()) -> None:
+        self.values = []
+        self._codes = {}
+        for value in values:
+            self.code(value)
+
+    def code(self, value) -> int:
+        if not value or not str(value).strip():
+            return -1
+        value = " ".join(str(value).split())
+        key = value.casefold()
+        code = self._codes.get(key)
+        if code is None:
+            code = self._codes[key] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def codes_matching(self, text: str):
+        text = text.casefold()
+        return [code for code, value in enumerate(self.values) if text in value.casefold()]
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+def _interview_row(path: str) -> dict:
+    record = read_record(path)
+    analysis = (record.get('analysis') or {}).get('result') or {}
+    start_time = record.get('start_time')
+    try:
+        start_time = datetime.fromisoformat(start_time).timestamp() if start_time else np.nan
+    except ValueError:
+        start_time = np.nan
+    return {
+        "job": record.get('job_description'),
+        "analyzed": bool(analysis),
+        "duration": record.get('duration_minutes') or np.nan,
+        "start_time": start_time,
+        **{name: analysis.get(field) for name, field in LEVEL_FIELDS.items()},
+        "skills": [*analysis.get('technical_skills', []), *analysis.get('soft_skills', [])],
+    }
+
+
+class CohortCache:
+    """Columnar cache of interview records for cohort queries.
+
+    One row per record: categorical codes for the job description and the three level
+    fields, duration and start time as floats, and skills as a flat code array with
+    per-row offsets (CSR). Queries are NumPy reductions over a boolean row mask, so
+    they stay fast at tens of thousands of interviews. `update` re-reads only records
+    that are new or changed since the last run (by mtime and size).
+    """
+
+    ROW_COLUMNS = ("paths", "mtimes", "sizes", "job", "experience", "readiness", "interest", "analyzed",
+                   "duration", "start_time")
+
+    def __init__(self) -> None:
+        self.categories = {name: Categories(LEVELS.get(name, ())) for name in CATEGORICAL}
+        self.paths = np.array([], dtype=str)
+        self.mtimes = np.array([], dtype=np.float64)
+        self.sizes = np.array([], dtype=np.int64)
+        self.job = np.array([], dtype=np.int32)
+        self.experience = np.array([], dtype=np.int16)
+        self.readiness = np.array([], dtype=np.int16)
+        self.interest = np.array([], dtype=np.int16)
+        self.analyzed = np.array([], dtype=bool)
+        self.duration = np.array([], dtype=np.float32)
+        self.start_time = np.array([], dtype=np.float64)
+        self.skill_codes = np.array([], dtype=np.int32)
+        self.skill_offsets = np.zeros(1, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    @classmethod
+    def load(cls, path: str = COHORT_CACHE_FILE) -> "CohortCache":
+        """Load a saved cache, or return an empty one if it is missing, unreadable or outdated"""
+        cache = cls()
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                if int(data["version"]) != CACHE_VERSION:
+                    return cache
+                for name in cls.ROW_COLUMNS + ("skill_codes", "skill_offsets"):
+                    setattr(cache, name, data[name])
+                cache.categories = {name: Categories(data[f"{name}_categories"].tolist()) for name in CATEGORICAL}
+        except (OSError, KeyError, ValueError):
+            return cls()
+        return cache
+
+    def save(self, path: str = COHORT_CACHE_FILE):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        arrays = {name: getattr(self, name) for name in self.ROW_COLUMNS + ("skill_codes", "skill_offsets")}
+        for name, categories in self.categories.items():
+            arrays[f"{name}_categories"] = np.array(categories.values, dtype=str)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, version=CACHE_VERSION, **arrays)
+        os.replace(tmp_path, path)
+
+    def _select(self, keep):
+        """Keep only the rows where `keep` is True"""
+        for name in self.ROW_COLUMNS:
+            setattr(self, name, getattr(self, name)[keep])
+        counts = np.diff(self.skill_offsets)
+        self.skill_codes = self.skill_codes[np.repeat(keep, counts)]
+        self.skill_offsets = np.concatenate([[0], np.cumsum(counts[keep])]).astype(np.int64)
+
+    def _append(self, rows):
+        encode = self.categories
+        skills = []
+        for row in rows:
+            # Count each skill once per interview
+            skills.append(sorted({code for code in map(encode["skill"].code, row["skills"]) if code >= 0}))
+        columns = {
+            "paths": np.array([row["path"] for row in rows], dtype=str),
+            "mtimes": np.array([row["mtime"] for row in rows], dtype=np.float64),
+            "sizes": np.array([row["size"] for row in rows], dtype=np.int64),
+            "job": np.array([encode["job"].code(row["job"]) for row in rows], dtype=np.int32),
+            "analyzed": np.array([row["analyzed"] for row in rows], dtype=bool),
+            "duration": np.array([row["duration"] for row in rows], dtype=np.float32),
+            "start_time": np.array([row["start_time"] for row in rows], dtype=np.float64),
+            **{name: np.array([encode[name].code(row[name]) for row in rows], dtype=np.int16) for name in LEVELS},
+        }
+        for name, values in columns.items():
+            setattr(self, name, np.concatenate([getattr(self, name), values]))
+        counts = np.array([len(codes) for codes in skills], dtype=np.int64)
+        self.skill_codes = np.concatenate([self.skill_codes, np.array([c for codes in skills for c in codes], dtype=np.int32)])
+        self.skill_offsets = np.concatenate([self.skill_offsets, self.skill_offsets[-1] + np.cumsum(counts)])
+
+    def update(self, directory: str = INTERVIEW_RECORDS_DIR) -> dict:
+        """Bring the cache in line with the records in `directory`, re-reading only new or changed files.
+        Legacy `_AI_ANALYSIS.json` files that have not been migrated to a record are read as well."""
+        legacy = [path for path in find_unmigrated(directory) if path.endswith(LEGACY_ANALYSIS_SUFFIX)]
+        current = {}
+        for path in find_records(directory) + legacy:
+            stat = os.stat(path)
+            current[os.path.abspath(path)] = (stat.st_mtime, stat.st_size)
+
+        cached = {path: index for index, path in enumerate(self.paths.tolist())}
+        keep = np.zeros(len(self), dtype=bool)
+        changed = []
+        for path, (mtime, size) in current.items():
+            index = cached.get(path)
+            if index is not None and self.mtimes[index] == mtime and self.sizes[index] == size:
+                keep[index] = True
+            else:
+                changed.append(path)
+
+        rows, failed = [], []
+        for path in changed:
+            try:
+                row = _interview_row(path)
+            except (OSError, ValueError, KeyError) as e:
+                failed.append((path, str(e)))
+                continue
+            row["path"] = path
+            row["mtime"], row["size"] = current[path]
+            rows.append(row)
+
+        counts = {
+            "unchanged": int(keep.sum()),
+            "added": sum(1 for row in rows if row["path"] not in cached),
+            "updated": sum(1 for row in rows if row["path"] in cached),
+            "removed": sum(1 for path in cached if path not in current),
+            "failed": len(failed),
+        }
+        if counts["unchanged"] != len(self):
+            self._select(keep)
+        if rows:
+            self._append(rows)
+        for path, error in failed:
+            print(f"❌ {os.path.basename(path)}: {error}")
+        return counts
+
+    def mask(self, job: str = None, since: float = None, analyzed_only: bool = False):
+        """Boolean row mask for a cohort: job descriptions containing `job`, started at or after `since`"""
+        mask = np.ones(len(self), dtype=bool)
+        if job:
+            mask &= np.isin(self.job, self.categories["job"].codes_matching(job))
+        if since is not None:
+            mask &= self.start_time >= since
+        if analyzed_only:
+            mask &= self.analyzed
+        return mask
+
+    def skill_frequency(self, mask, top: int = 20):
+        """[(skill, interviews mentioning it)] for the rows in `mask`, most frequent first"""
+        selected = self.skill_codes[np.repeat(mask, np.diff(self.skill_offsets))]
+        counts = np.bincount(selected, minlength=len(self.categories["skill"]))
+        order = np.argsort(-counts, kind="stable")[:top]
+        return [(self.categories["skill"].values[code], int(counts[code])) for code in order if counts[code]]
+
+    def crosstab(self, mask, rows: str = "readiness", columns: str = "experience"):
+        """Counts of analyzed interviews by two level fields. Returns (row labels, column labels, matrix);
+        the last label of each axis is "Unknown" for missing values."""
+        mask = mask & self.analyzed
+        row_labels = self.categories[rows].values + ["Unknown"]
+        column_labels = self.categories[columns].values + ["Unknown"]
+        # Missing (-1) goes to the last index
+        row_index = np.where(getattr(self, rows)[mask] < 0, len(row_labels) - 1, getattr(self, rows)[mask])
+        column_index = np.where(getattr(self, columns)[mask] < 0, len(column_labels) - 1, getattr(self, columns)[mask])
+        flat = np.bincount(row_index.astype(np.int64) * len(column_labels) + column_index,
+                           minlength=len(row_labels) * len(column_labels))
+        return row_labels, column_labels, flat.reshape(len(row_labels), len(column_labels))
+
+    def level_counts(self, mask, name: str):
+        mask = mask & self.analyzed
+        counts = np.bincount(getattr(self, name)[mask] + 1, minlength=len(self.categories[name]) + 1)
+        return dict(zip(["Unknown"] + self.categories[name].values, counts.tolist()))
+
+    def duration_percentiles(self, mask, percentiles=DEFAULT_PERCENTILES):
+        durations = self.duration[mask]
+        durations = durations[~np.isnan(durations)]
+        if not len(durations):
+            return {}
+        return {f"p{p:g}": float(value) for p, value in zip(percentiles, np.percentile(durations, percentiles))}
+
+    def report(self, job: str = None, since: float = None, top: int = 20) -> dict:
+        mask = self.mask(job, since)
+        row_labels, column_labels, matrix = self.crosstab(mask)
+        return {
+            "interviews": int(mask.sum()),
+            "analyzed": int((mask & self.analyzed).sum()),
+            "skills": self.skill_frequency(mask & self.analyzed, top),
+            "readiness_by_experience": {
+                "rows": row_labels, "columns": column_labels, "counts": matrix.tolist(),
+            },
+            "interest": self.level_counts(mask, "interest"),
+            "duration_minutes": self.duration_percentiles(mask),
+        }
+
+
+def print_report(report: dict):
+    print(f"Interviews: {report['interviews']} ({report['analyzed']} analyzed)")
+    print("\nTop skills:")
+    for skill, count in report["skills"]:
+        share = count / report["analyzed"] * 100 if report["analyzed"] else 0
+        print(f"  {skill:<32} {count:>6}  {share:5.1f}%")
+
+    table = report["readiness_by_experience"]
+    width = max(len(label) for label in table["rows"])
+    print(f"\nReadiness × experience:")
+    print(f"  {'':<{width}} " + " ".join(f"{label:>10}" for label in table["columns"]))
+    for label, counts in zip(table["rows"], table["counts"]):
+        print(f"  {label:<{width}} " + " ".join(f"{count:>10}" for count in counts))
+
+    print("\nInterest: " + ", ".join(f"{label} {count}" for label, count in report["interest"].items()))
+    durations = report["duration_minutes"]
+    if durations:
+        print("Duration (minutes): " + ", ".join(f"{name} {value:.1f}" for name, value in durations.items()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Skill, level and duration distributions across interview cohorts")
+    parser.add_argument("directory", nargs="?", default=INTERVIEW_RECORDS_DIR, help="Interview records directory")
+    parser.add_argument("--cache", default=COHORT_CACHE_FILE, help="Columnar cache file (.npz)")
+    parser.add_argument("--job", help="Only job descriptions containing this text (case-insensitive)")
+    parser.add_argument("--since", help="Only interviews started on or after this date (YYYY-MM-DD)")
+    parser.add_argument("--top", type=int, default=20, help="Number of skills to list")
+    parser.add_argument("--rebuild", action="store_true", help="Ignore the existing cache")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    started_at = time.perf_counter()
+    cache = CohortCache() if args.rebuild else CohortCache.load(args.cache)
+    counts = cache.update(args.directory)
+    if counts["added"] or counts["updated"] or counts["removed"] or args.rebuild:
+        cache.save(args.cache)
+    updated_at = time.perf_counter()
+
+    since = datetime.fromisoformat(args.since).timestamp() if args.since else None
+    report = cache.report(args.job, since, args.top)
+    finished_at = time.perf_counter()
+
+    timings = {"update_s": updated_at - started_at, "query_ms": (finished_at - updated_at) * 1000}
+    if args.json:
+        print(json.dumps({**report, "cache": {"interviews": len(cache), **counts, **timings}}, indent=2, ensure_ascii=False))
+        return
+    print_report(report)
+    print(f"\nCache: {len(cache)} interview(s), {counts['added']} added, {counts['updated']} updated, "
+          f"{counts['removed']} removed in {timings['update_s']:.2f}s; query {timings['query_ms']:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+import asyncio
+import hashlib
+import logging
+import os
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from contextlib import closing
+
+logger = logging.getLogger("interviewer.context_cache")
+
+# Off by default: the shipped analysis prefix (~600 tokens) is below CONTEXT_CACHE_MIN_TOKENS, so it would
+# never be cached. Turn it on for catalogs whose job descriptions make the prefix large enough.
+CONTEXT_CACHE_ENABLED = os.getenv("CONTEXT_CACHE", "0").lower() in ("1", "true", "yes")
+CONTEXT_CACHE_TTL = int(os.getenv("CONTEXT_CACHE_TTL", "3600"))
+# Renew a cache this many seconds before it expires
+CONTEXT_CACHE_RENEW_MARGIN = int(os.getenv("CONTEXT_CACHE_RENEW_MARGIN", "300"))
+# Gemini rejects explicit caches below a model-specific minimum size, so smaller prefixes are sent inline
+CONTEXT_CACHE_MIN_TOKENS = int(os.getenv("CONTEXT_CACHE_MIN_TOKENS", "1024"))
+# How long to wait before retrying a prefix the API refused to cache
+CONTEXT_CACHE_RETRY_AFTER = 600
+# Cache handles are billed until they expire, and every job runs in its own process, so handles are
+# recorded here and reused by the next interview instead of registering the prefix again
+CONTEXT_CACHE_DB = os.getenv("CONTEXT_CACHE_DB", "context_cache.db")
+
+
+def prefix_key(model: str, prefix: str) -> str:
+    return hashlib.sha256(f"{model}\n{prefix}".encode("utf-8")).hexdigest()
+
+
+class CachedPrefix:
+    def __init__(self, name, expires_at: float) -> None:
+        self.name = name
+        self.expires_at = expires_at
+
+
+class HandleRegistry:
+    """Cache handles and their expiry in SQLite, shared by every job process on the host"""
+
+    def __init__(self, path: str = CONTEXT_CACHE_DB) -> None:
+        self.path = path
+        with closing(self._connect()) as conn, conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS handles "
+                         "(prefix_key TEXT PRIMARY KEY, name TEXT NOT NULL, expires_at REAL NOT NULL)")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def get(self, key: str):
+        """The live handle for `key` as a CachedPrefix, or None"""
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT name, expires_at FROM handles WHERE prefix_key = ? AND expires_at > ?",
+                               (key, time.time())).fetchone()
+        return CachedPrefix(*row) if row is not None else None
+
+    def register(self, key: str, name: str, expires_at: float) -> CachedPrefix:
+        """Record a new handle unless another process recorded a live one first. Returns the handle to use."""
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT INTO handles (prefix_key, name, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (prefix_key) DO UPDATE SET name = excluded.name, expires_at = excluded.expires_at "
+                "WHERE handles.expires_at <= ?",
+                (key, name, expires_at, time.time()),
+            )
+            row = conn.execute("SELECT name, expires_at FROM handles WHERE prefix_key = ?", (key,)).fetchone()
+        return CachedPrefix(*row)
+
+    def renew(self, key: str, name: str, expires_at: float):
+        with closing(self._connect()) as conn, conn:
+            conn.execute("UPDATE handles SET expires_at = ? WHERE prefix_key = ? AND name = ?", (expires_at, key, name))
+
+
+class ContextCacheManager(ABC):
+    """Registers a shared prompt prefix (JD + instructions) once per model and prefix version and
+    hands out the cache handle, renewing its TTL as it nears expiry. Subclasses provide the backend.
+
+    With a `registry`, handles are shared across processes: a job reuses the handle an earlier
+    job registered, and when two jobs register the same prefix at once the loser deletes its copy.
+    """
+
+    def __init__(self, ttl: int = CONTEXT_CACHE_TTL, renew_margin: int = CONTEXT_CACHE_RENEW_MARGIN,
+                 registry: HandleRegistry = None) -> None:
+        self.ttl = ttl
+        self.renew_margin = renew_margin
+        self.registry = registry
+        self._entries = {}
+        self._locks = {}
+        self.created = 0
+        self.renewed = 0
+        self.reused = 0
+        self.uncacheable = 0
+
+    async def get(self, model: str, prefix: str, token_count: int = None):
+        """Return a cache handle for `prefix` on `model`, or None if the prefix should be sent inline"""
+        if token_count is not None and token_count < CONTEXT_CACHE_MIN_TOKENS:
+            return None
+        key = prefix_key(model, prefix)
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            entry = self._entries.get(key)
+            now = time.time()
+            if entry is not None and entry.name is None:
+                if now < entry.expires_at:
+                    return None
+                entry = None
+            if (entry is None or entry.expires_at - now <= self.renew_margin) and self.registry is not None:
+                # Another job may have registered or renewed it since
+                entry = await asyncio.to_thread(self.registry.get, key) or entry
+            if entry is not None and entry.expires_at - now > self.renew_margin:
+                self._entries[key] = entry
+                self.reused += 1
+                return entry.name
+            try:
+                if entry is not None and entry.expires_at > now:
+                    try:
+                        await self._renew(entry.name)
+                        self.renewed += 1
+                        entry.expires_at = now + self.ttl
+                        if self.registry is not None:
+                            await asyncio.to_thread(self.registry.renew, key, entry.name, entry.expires_at)
+                    except Exception:
+                        # The server may have dropped it already; register it again
+                        entry = None
+                if entry is None or entry.expires_at <= now:
+                    entry = CachedPrefix(await self._create(model, prefix), now + self.ttl)
+                    self.created += 1
+                    if self.registry is not None:
+                        winner = await asyncio.to_thread(self.registry.register, key, entry.name, entry.expires_at)
+                        if winner.name != entry.name:
+                            # Another job registered the same prefix first; don't leave a billed duplicate behind
+                            await self._delete_quietly(entry.name)
+                            entry = winner
+            except Exception as e:
+                logger.warning(f"⚠️ Could not cache prompt prefix for {model}, sending it inline: {e}")
+                self.uncacheable += 1
+                entry = CachedPrefix(None, now + CONTEXT_CACHE_RETRY_AFTER)
+            self._entries[key] = entry
+            return entry.name
+
+    def stats(self) -> dict:
+        return {
+            "entries": sum(1 for entry in self._entries.values() if entry.name),
+            "created": self.created,
+            "renewed": self.renewed,
+            "reused": self.reused,
+            "uncacheable": self.uncacheable,
+        }
+
+    async def _delete_quietly(self, name: str):
+        try:
+            await self._delete(name)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not delete duplicate context cache {name}: {e}")
+
+    @abstractmethod
+    async def _create(self, model: str, prefix: str) -> str:
+        """Register `prefix` with the backend for `self.ttl` seconds and return its handle"""
+
+    @abstractmethod
+    async def _renew(self, name: str):
+        """Extend the handle's TTL to `self.ttl` seconds from now"""
+
+    @abstractmethod
+    async def _delete(self, name: str):
+        """Delete the cached content behind the handle"""
+
+
+class GeminiContextCache(ContextCacheManager):
+    """Context cache backed by the Gemini caching API"""
+
+    def __init__(self, client, registry: HandleRegistry = None, **kwargs) -> None:
+        super().__init__(registry=registry if registry is not None else HandleRegistry(), **kwargs)
+        self.client = client
+
+    async def _create(self, model: str, prefix: str) -> str:
+        from google.genai import types
+        cached = await self.client.aio.caches.create(
+            model=model,
+            config=types.CreateCachedContentConfig(
+                display_name=f"interviewer-{prefix_key(model, prefix)[:16]}",
+                system_instruction=prefix,
+                ttl=f"{self.ttl}s",
+            ),
+        )
+        return cached.name
+
+    async def _renew(self, name: str):
+        from google.genai import types
+        await self.client.aio.caches.update(name=name, config=types.UpdateCachedContentConfig(ttl=f"{self.ttl}s"))
+
+    async def _delete(self, name: str):
+        await self.client.aio.caches.delete(name=name)
+
+
+class LocalContextCache(ContextCacheManager):
+    """In-memory stand-in with the same behaviour and no network, for tests and benchmarks"""
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.prefixes = {}
+
+    async def _create(self, model: str, prefix: str) -> str:
+        name = f"cachedContents/local-{prefix_key(model, prefix)[:16]}"
+        self.prefixes[name] = prefix
+        return name
+
+    async def _renew(self, name: str):
+        if name not in self.prefixes:
+            raise KeyError(name)
+
+    async def _delete(self, name: str):
+        self.prefixes.pop(name, None)
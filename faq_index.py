@@ -0,0 +1,144 @@
+import glob
+import hashlib
+import math
+import os
+import re
+from collections import Counter
+
+FAQ_DIR = os.getenv("FAQ_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "faq"))
+FAQ_CONFIDENCE_THRESHOLD = float(os.getenv("FAQ_CONFIDENCE_THRESHOLD", "0.5"))
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "can", "do", "does", "for", "from", "have", "how", "i",
+    "if", "in", "is", "it", "me", "my", "of", "on", "or", "the", "there", "this", "to", "we", "what", "when",
+    "where", "which", "who", "will", "with", "would", "you", "your", "any", "about", "job", "role",
+    "position", "company", "tell", "could", "should", "our", "much", "need", "offer", "provide", "use", "like",
+    "know", "get", "many", "kind", "type", "also", "work",
+}
+# Map candidate phrasing onto the vocabulary used in job descriptions. Keys are looked up before stemming
+# (then on the stem, for plurals); values are JD words and are stemmed like any other token.
+SYNONYMS = {
+    "pay": "salary", "compensation": "salary", "wage": "salary", "money": "salary",
+    "earn": "salary", "remotely": "remote", "home": "remote", "wfh": "remote", "hybrid": "remote",
+    "parttime": "part", "vacation": "paid", "pto": "paid", "holiday": "paid", "insurance": "health",
+    "retirement": "401", "pension": "401", "degree": "bachelor",
+    "learning": "training", "growth": "development",
+}
+
+
+def _stem(token: str) -> str:
+    if len(token) > 4 and token.endswith("ing"):
+        return token[:-3]
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def tokenize(text: str):
+    tokens = []
+    for token in re.findall(r"[a-z0-9$]+", text.lower().replace("part-time", "part time")):
+        token = _stem(SYNONYMS.get(token) or SYNONYMS.get(_stem(token)) or token)
+        if len(token) > 1 and token not in STOPWORDS:
+            tokens.append(token)
+    return tokens
+
+
+def split_passages(text: str, source: str = "jd"):
+    """Split a document into passages: one per bullet or paragraph, prefixed with its section heading"""
+    passages, heading = [], ""
+    for block in re.split(r"\n\s*\n", text):
+        for line in block.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            if line.endswith(":") and not line.startswith(("-", "*")):
+                heading = line.rstrip(":")
+                continue
+            line = line.lstrip("-*• ").strip()
+            if len(line.split()) < 4:
+                continue
+            passages.append({"text": line, "section": heading, "source": source})
+    return passages
+
+
+class FaqIndex:
+    """BM25 index over job-description and FAQ passages, with an IDF-weighted coverage confidence"""
+
+    def __init__(self, passages) -> None:
+        self.passages = passages
+        self._docs = [Counter(tokenize(f"{p['section']} {p['text']}")) for p in passages]
+        self._lengths = [sum(doc.values()) for doc in self._docs]
+        self._avg_length = sum(self._lengths) / len(self._lengths) if self._lengths else 0.0
+        document_frequency = Counter(term for doc in self._docs for term in doc)
+        total = len(self._docs)
+        self._idf = {
+            term: math.log(1 + (total - df + 0.5) / (df + 0.5)) for term, df in document_frequency.items()
+        }
+        self.lookups = 0
+        self.hits = 0
+
+    def search(self, query: str, limit: int = 3):
+        """Return [(passage, bm25_score, confidence)] best first. Confidence is the share of the
+        query's IDF weight covered by the passage, so it is comparable across queries."""
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or not self._docs:
+            return []
+        # Unknown terms count as maximally specific, so off-topic questions get low confidence
+        max_idf = max(self._idf.values())
+        query_weight = sum(self._idf.get(term, max_idf) for term in terms)
+        results = []
+        for passage, doc, length in zip(self.passages, self._docs, self._lengths):
+            score, covered = 0.0, 0.0
+            for term in terms:
+                tf = doc.get(term)
+                if not tf:
+                    continue
+                idf = self._idf[term]
+                covered += idf
+                score += idf * tf * (BM25_K1 + 1) / (tf + BM25_K1 * (1 - BM25_B + BM25_B * length / self._avg_length))
+            if score > 0:
+                results.append((passage, score, covered / query_weight))
+        results.sort(key=lambda result: result[1], reverse=True)
+        return results[:limit]
+
+    def answer(self, query: str, threshold: float = FAQ_CONFIDENCE_THRESHOLD):
+        """Return (answer_text, confidence); answer_text is None below the confidence threshold"""
+        self.lookups += 1
+        results = self.search(query)
+        if not results or results[0][2] < threshold:
+            return None, results[0][2] if results else 0.0
+        self.hits += 1
+        best_confidence = results[0][2]
+        lines = [passage["text"] for passage, _, confidence in results if confidence >= max(threshold, best_confidence * 0.8)]
+        return " ".join(lines[:2]), best_confidence
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.lookups if self.lookups else 0.0
+
+
+def load_faq_documents(directory: str = FAQ_DIR):
+    documents = []
+    for path in sorted(glob.glob(os.path.join(directory, "*.txt")) + glob.glob(os.path.join(directory, "*.md"))):
+        if os.path.basename(path).upper().startswith("README"):
+            continue
+        with open(path, encoding='utf-8') as f:
+            documents.append((os.path.basename(path), f.read()))
+    return documents
+
+
+_indexes = {}
+
+
+def get_faq_index(jd: str) -> FaqIndex:
+    """Return the index for a job description plus the shared FAQ documents, built once per process"""
+    key = hashlib.sha256(jd.encode("utf-8")).hexdigest()
+    index = _indexes.get(key)
+    if index is None:
+        passages = split_passages(jd, "jd")
+        for source, text in load_faq_documents():
+            passages.extend(split_passages(text, source))
+        index = _indexes[key] = FaqIndex(passages)
+    return index
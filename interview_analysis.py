@@ -0,0 +1,247 @@
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime
+
+import dotenv
+
+from analysis_cache import AnalysisCache, analysis_cache_key, fingerprint
+from analysis_calls import ANALYSIS_MODEL, generate_analysis
+from archive_index import get_archive_index
+from context_cache import CONTEXT_CACHE_ENABLED, GeminiContextCache
+from metrics import ANALYSIS_DURATION, ANALYSIS_TOKENS
+from interview_record import attach_analysis, interview_id_for, new_record, record_path, write_record
+from transcript_compaction import ANALYSIS_TOKEN_BUDGET, compact_transcript, count_tokens
+
+logger = logging.getLogger("interviewer.analysis")
+
+# Bump when the analysis prompt or output format changes in a way that should invalidate cached analyses
+ANALYSIS_PROMPT_VERSION = "3"
+
+_genai_client = None
+_analysis_cache = None
+_context_cache = None
+
+
+def build_analysis_prefix(jd: str) -> str:
+    """Instructions and job description shared by every analysis for a JD.
+
+    Kept ahead of the transcript so it can be registered as a context cache (or hit
+    Gemini's implicit prefix caching when sent inline).
+    """
+    return f"""
+            Analyze the job interview transcript that follows and extract key information about the candidate.
+
+            Position being interviewed for: {jd}
+
+            Please analyze the candidate's responses and provide the following information in a structured format:
+
+            1. Candidate's full name (if mentioned)
+            2. Interest level in the position (Scale: Low/Medium/High) - based on enthusiasm, questions asked, and engagement
+            3. Readiness for the role (Scale: Not Ready/Somewhat Ready/Ready/Very Ready) - based on experience and skills mentioned
+            4. Experience level (Junior/Mid-level/Senior) - based on years of experience and complexity of projects mentioned
+            5. Technical skills mentioned (list)
+            6. Soft skills demonstrated (list)
+            7. Key strengths (paragraph summary)
+            8. Areas for improvement (paragraph summary)
+            9. Overall assessment and recommendation (paragraph summary)
+            10. Notable quotes or responses from the candidate
+
+            Please respond in valid JSON format only, using these exact keys:
+            {{
+                "candidate_name": "string",
+                "interest_level": "string",
+                "readiness": "string",
+                "experience_level": "string",
+                "technical_skills": ["array", "of", "strings"],
+                "soft_skills": ["array", "of", "strings"],
+                "key_strengths": "string",
+                "areas_for_improvement": "string",
+                "overall_assessment": "string",
+                "notable_quotes": ["array", "of", "strings"]
+            }}
+            """
+
+
+def build_analysis_request(transcript_text: str) -> str:
+    return f"""
+            Interview Transcript:
+            {transcript_text}
+            """
+
+
+def build_analysis_prompt(jd: str, transcript_text: str) -> str:
+    """Build the full Gemini prompt used to analyze an interview transcript"""
+    return build_analysis_prefix(jd) + build_analysis_request(transcript_text)
+
+
+def get_genai_client():
+    """Return the GenAI client shared by every analysis in this process, or None without an API key"""
+    global _genai_client
+    if _genai_client is None:
+        dotenv.load_dotenv()
+        api_key = os.getenv("GOOGLE_API_KEY")
+        if not api_key:
+            return None
+        from google import genai
+        _genai_client = genai.Client(api_key=api_key)
+    return _genai_client
+
+
+def get_context_cache():
+    """Return the context cache manager for shared analysis prefixes, or None when context caching
+    is disabled or there is no GenAI client"""
+    global _context_cache
+    if _context_cache is None:
+        if not CONTEXT_CACHE_ENABLED:
+            return None
+        client = get_genai_client()
+        if client is None:
+            return None
+        _context_cache = GeminiContextCache(client)
+    return _context_cache
+
+
+def get_analysis_cache() -> AnalysisCache:
+    """Return the on-disk analysis cache, invalidated whenever the prompt template changes"""
+    global _analysis_cache
+    if _analysis_cache is None:
+        template = build_analysis_prompt("{jd}", "{transcript}")
+        _analysis_cache = AnalysisCache(prompt_fingerprint=fingerprint(f"{ANALYSIS_PROMPT_VERSION}\n{template}"))
+    return _analysis_cache
+
+
+async def analyze_transcript(conversation_data, jd: str, candidate_name: str, interview_summary: dict = None,
+                             record_file: str = None, rate_limiter=None, room: str = None, rolling=None):
+    """Analyze an interview transcript with Gemini and store the result on the interview's record.
+
+    Works from plain transcript entries, so it serves both live sessions and archived
+    interviews. When `record_file` is None a new record is written. With `rolling` (the
+    session's RollingAnalyzer) the running assessment is finalized instead of re-reading
+    the whole transcript, when it is close enough to the end. Returns the record path, or
+    None if there is nothing to analyze. Errors are raised to the caller.
+    """
+    room = room or "offline"
+    started_at = time.perf_counter()
+    status = "error"
+    try:
+        result = await _analyze_transcript(
+            conversation_data, jd, candidate_name, interview_summary, record_file, rate_limiter, room, rolling
+        )
+        status = "ok" if result else "skipped"
+        return result
+    finally:
+        ANALYSIS_DURATION.labels(room=room, status=status).observe(time.perf_counter() - started_at)
+
+
+async def _analyze_transcript(conversation_data, jd, candidate_name, interview_summary, record_file,
+                              rate_limiter, room, rolling):
+    interview_summary = interview_summary or {}
+    if not conversation_data:
+        logger.warning("⚠️ No conversation data found. Skipping AI analysis.")
+        return None
+
+    if rolling is not None:
+        finalized = await rolling.finalize()
+        if finalized is not None:
+            analysis_result, call_info, token_counts = finalized
+            ANALYSIS_TOKENS.labels(room=room, stage="after").inc(token_counts["prompt_tokens_after"])
+            logger.info(f"  ✅ Analysis from {rolling.updates} rolling update(s), {call_info['merge']} merge")
+            return await _store_analysis(analysis_result, call_info, token_counts, conversation_data, jd,
+                                         candidate_name, interview_summary, record_file)
+
+    # Compact the transcript so the prompt fits the token budget
+    prompt_overhead = count_tokens(build_analysis_prompt(jd, ""))
+    compacted = await asyncio.to_thread(
+        compact_transcript, conversation_data, max(ANALYSIS_TOKEN_BUDGET - prompt_overhead, 256)
+    )
+    transcript_text = compacted["text"]
+
+    if not transcript_text.strip():
+        logger.warning("⚠️ Empty transcript. Skipping AI analysis.")
+        return None
+
+    logger.info(f"🤖 Analyzing interview with AI ({candidate_name})...")
+
+    # Create analysis prompt
+    analysis_prompt = build_analysis_prompt(jd, transcript_text)
+    token_counts = {
+        "budget": ANALYSIS_TOKEN_BUDGET,
+        "prompt_tokens_before": prompt_overhead + compacted["tokens_before"],
+        "prompt_tokens_after": count_tokens(analysis_prompt),
+        "transcript_tokens_before": compacted["tokens_before"],
+        "transcript_tokens_after": compacted["tokens_after"],
+        "turns_before": compacted["turns_before"],
+        "turns_after": compacted["turns_after"],
+        "summarized_turns": compacted["summarized_turns"],
+        "summary_levels": compacted["summary_levels"],
+    }
+    ANALYSIS_TOKENS.labels(room=room, stage="before").inc(token_counts["prompt_tokens_before"])
+    ANALYSIS_TOKENS.labels(room=room, stage="after").inc(token_counts["prompt_tokens_after"])
+    logger.info(f"  🧮 Prompt tokens: {token_counts['prompt_tokens_before']} → {token_counts['prompt_tokens_after']}")
+
+    # Reuse a cached analysis of identical content without touching the network
+    cache = get_analysis_cache()
+    cache_key = analysis_cache_key(transcript_text, jd, ANALYSIS_MODEL, ANALYSIS_PROMPT_VERSION)
+    cached = await asyncio.to_thread(cache.get, cache_key)
+    if cached is not None:
+        # The entry records which model answered: a hedged fallback may have won the original call
+        analysis_result = cached["analysis"]
+        logger.info(f"  ♻️ Using cached AI analysis from {cached['model']} ({cache_key[:12]})")
+        call_info = {"model": cached["model"], "attempts": 0, "hedged": False, "cached": True}
+    else:
+        client = get_genai_client()
+        if client is None:
+            logger.warning("⚠️ GOOGLE_API_KEY not found. Skipping AI analysis.")
+            return None
+
+        # Generate analysis, reusing the cached JD + instruction prefix when one is registered
+        prefix = build_analysis_prefix(jd)
+        context_cache = get_context_cache()
+        cached_content = None
+        if context_cache is not None:
+            cached_content = await context_cache.get(ANALYSIS_MODEL, prefix, token_count=count_tokens(prefix))
+        call = await generate_analysis(
+            client, analysis_prompt, cached_request=build_analysis_request(transcript_text), cached_content=cached_content,
+            rate_limiter=rate_limiter,
+        )
+        token_counts["cached_prefix"] = bool(cached_content)
+        analysis_result = call.analysis
+        call_info = {"model": call.model, "attempts": call.attempts, "hedged": call.hedged, "call_seconds": call.elapsed}
+        logger.info(f"  ✅ Analysis from {call.model} after {call.attempts} attempt(s){' (hedged)' if call.hedged else ''}")
+        await asyncio.to_thread(cache.put, cache_key, {"analysis": analysis_result, "model": call.model})
+
+    return await _store_analysis(analysis_result, call_info, token_counts, conversation_data, jd,
+                                 candidate_name, interview_summary, record_file)
+
+
+async def _store_analysis(analysis_result, call_info, token_counts, conversation_data, jd, candidate_name,
+                          interview_summary, record_file):
+    analysis = {
+        "result": analysis_result,
+        **call_info,
+        "prompt_version": ANALYSIS_PROMPT_VERSION,
+        "token_counts": token_counts,
+    }
+    if record_file is None:
+        # No saved record (e.g. the save failed): keep the transcript with the analysis
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        interview_id = interview_summary.get('interview_id') or \
+            interview_id_for(analysis_result.get('candidate_name') or candidate_name, timestamp)
+        record = new_record({
+            "candidate_name": candidate_name,
+            "job_description": jd,
+            **interview_summary,
+            "transcript": list(conversation_data),
+            "analysis": analysis,
+        }, interview_id)
+        record_file = await asyncio.to_thread(write_record, record, record_path(interview_id))
+    else:
+        await asyncio.to_thread(attach_analysis, record_file, analysis)
+
+    try:
+        await asyncio.to_thread(get_archive_index().ingest_record, record_file)
+    except Exception as e:
+        logger.warning(f"⚠️ Could not index analysis in the archive: {e}")
+    return record_file
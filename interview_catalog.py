@@ -0,0 +1,214 @@
+import argparse
+import glob
+import json
+import logging
+import os
+import threading
+
+logger = logging.getLogger("interviewer.catalog")
+
+CATALOG_DIR = os.getenv("CATALOG_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "catalog"))
+# Role used when neither the job nor the room metadata names one
+DEFAULT_ROLE = os.getenv("DEFAULT_ROLE", "data_scientist")
+# Reload plans when catalog files change, without restarting the worker
+CATALOG_HOT_RELOAD = os.getenv("CATALOG_HOT_RELOAD", "1").lower() in ("1", "true", "yes")
+MAX_QUESTIONS = 20
+
+REQUIRED_FIELDS = ("title", "job_description", "greeting", "questions")
+OPTIONAL_FIELDS = ("follow_up",)
+DEFAULT_FOLLOW_UP = "Ask follow-up questions based on their responses and the job requirements."
+# Metadata keys that can name a role, in order of preference
+ROLE_KEYS = ("role", "job", "jd")
+
+
+class CatalogError(ValueError):
+    """A catalog entry is missing fields or has values of the wrong type"""
+
+
+class InterviewPlan:
+    """A compiled catalog entry: the job description plus the instructions every session for the role uses"""
+
+    def __init__(self, role: str, title: str, jd: str, greeting: str, questions, follow_up: str, path: str) -> None:
+        self.role = role
+        self.title = title
+        self.jd = jd
+        self.greeting = greeting
+        self.questions = tuple(questions)
+        self.follow_up = follow_up
+        self.path = path
+        self.realtime_instructions = (
+            f"You are a professional interviewer conducting an Interview with the job description: {jd}. "
+            f"Ask relevant interview questions ONE AT A TIME, listen carefully to complete answers, and wait for "
+            f"the candidate to finish speaking before asking the next question. Be patient and give candidates "
+            f"time to think and respond fully."
+        )
+        self.opening_instructions = (
+            f"{greeting} Then conduct a professional interview for the {title} position.\n"
+            f"Ask the {len(self.questions)} planned questions ONE AT A TIME, waiting for each complete response "
+            f"before moving to the next. Call next_interview_question to get each planned question.\n"
+            f"After these questions: {follow_up}\n"
+            f"When you have sufficient information, or the user want to end the interview you MUST call the "
+            f"end_interview function."
+        )
+
+
+def _text(entry: dict, field: str, path: str) -> str:
+    value = entry.get(field)
+    # Long text may be given as a list of lines so catalog files stay readable
+    if isinstance(value, list) and all(isinstance(line, str) for line in value):
+        value = "\n".join(value)
+    if not isinstance(value, str) or not value.strip():
+        raise CatalogError(f"{path}: '{field}' must be a non-empty string")
+    return value.strip()
+
+
+def compile_plan(role: str, entry: dict, path: str = "<catalog>") -> InterviewPlan:
+    """Validate a catalog entry and compile it into an InterviewPlan"""
+    if not isinstance(entry, dict):
+        raise CatalogError(f"{path}: expected a JSON object")
+    missing = [field for field in REQUIRED_FIELDS if field not in entry]
+    if missing:
+        raise CatalogError(f"{path}: missing {', '.join(missing)}")
+    unknown = sorted(set(entry) - set(REQUIRED_FIELDS) - set(OPTIONAL_FIELDS))
+    if unknown:
+        raise CatalogError(f"{path}: unknown field(s) {', '.join(unknown)}")
+    questions = entry["questions"]
+    if not isinstance(questions, list) or not 1 <= len(questions) <= MAX_QUESTIONS:
+        raise CatalogError(f"{path}: 'questions' must be a list of 1-{MAX_QUESTIONS} questions")
+    if not all(isinstance(question, str) and question.strip() for question in questions):
+        raise CatalogError(f"{path}: every question must be a non-empty string")
+    return InterviewPlan(
+        role=role,
+        title=_text(entry, "title", path),
+        jd=_text(entry, "job_description", path),
+        greeting=_text(entry, "greeting", path),
+        questions=[question.strip() for question in questions],
+        follow_up=_text(entry, "follow_up", path) if "follow_up" in entry else DEFAULT_FOLLOW_UP,
+        path=path,
+    )
+
+
+def load_plan(path: str) -> InterviewPlan:
+    with open(path, encoding='utf-8') as f:
+        try:
+            entry = json.load(f)
+        except json.JSONDecodeError as e:
+            raise CatalogError(f"{path}: invalid JSON ({e})") from e
+    return compile_plan(os.path.splitext(os.path.basename(path))[0], entry, path)
+
+
+class Catalog:
+    """Interview plans for every role in `catalog/<role>.json`, compiled once and swapped whole on reload.
+
+    An entry that fails validation is reported and skipped; on reload the previous plan for
+    that role stays in use, so a bad edit never takes a role offline.
+    """
+
+    def __init__(self, directory: str = CATALOG_DIR) -> None:
+        self.directory = directory
+        self.plans = {}
+        self.errors = {}
+        self._watcher = None
+        self._stop = threading.Event()
+
+    def load(self):
+        plans, errors = {}, {}
+        for path in sorted(glob.glob(os.path.join(self.directory, "*.json"))):
+            role = os.path.splitext(os.path.basename(path))[0]
+            try:
+                plans[role] = load_plan(path)
+            except (OSError, CatalogError) as e:
+                errors[role] = str(e)
+                logger.error("❌ Catalog entry %s rejected: %s", role, e)
+                if role in self.plans:
+                    plans[role] = self.plans[role]
+        self.errors = errors
+        if not plans:
+            raise CatalogError(f"No valid interview plans in {self.directory}")
+        self.plans = plans
+        return self
+
+    def plan(self, role: str = None) -> InterviewPlan:
+        plans = self.plans
+        return plans.get(role) or plans.get(DEFAULT_ROLE) or next(iter(plans.values()))
+
+    def plan_for(self, *metadata) -> InterviewPlan:
+        """Pick the plan named by the first metadata string that names a known role. Metadata may be
+        JSON (`{"role": "data_scientist"}`) or a bare role name; falls back to DEFAULT_ROLE."""
+        for value in metadata:
+            role = role_from_metadata(value)
+            if role in self.plans:
+                return self.plans[role]
+            if role:
+                logger.warning("⚠️ Unknown role %r in metadata, using the default plan", role)
+        return self.plan()
+
+    def start_watching(self):
+        """Reload the catalog from a background thread whenever its files change"""
+        if self._watcher is not None:
+            return
+        self._watcher = threading.Thread(target=self._watch, name="catalog-watcher", daemon=True)
+        self._watcher.start()
+
+    def _watch(self):
+        from watchfiles import watch
+        for changes in watch(self.directory, stop_event=self._stop,
+                             watch_filter=lambda change, path: path.endswith(".json")):
+            try:
+                self.load()
+            except CatalogError as e:
+                logger.error("❌ Catalog reload failed, keeping the current plans: %s", e)
+                continue
+            logger.info("🔄 Catalog reloaded after %d change(s): %s", len(changes), ", ".join(sorted(self.plans)))
+
+    def stop_watching(self):
+        self._stop.set()
+
+
+def role_from_metadata(metadata) -> str:
+    if not metadata or not str(metadata).strip():
+        return None
+    try:
+        data = json.loads(metadata)
+    except (TypeError, ValueError):
+        return str(metadata).strip()
+    if isinstance(data, dict):
+        for key in ROLE_KEYS:
+            if isinstance(data.get(key), str) and data[key].strip():
+                return data[key].strip()
+        return None
+    return data.strip() if isinstance(data, str) else None
+
+
+_catalog = None
+
+
+def get_catalog() -> Catalog:
+    """Return the process-wide catalog, loading it (and starting hot reload) on first use"""
+    global _catalog
+    if _catalog is None:
+        _catalog = Catalog().load()
+        if CATALOG_HOT_RELOAD:
+            _catalog.start_watching()
+    return _catalog
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate the interview catalog")
+    parser.add_argument("directory", nargs="?", default=CATALOG_DIR)
+    args = parser.parse_args()
+
+    catalog = Catalog(args.directory)
+    try:
+        catalog.load()
+    except CatalogError as e:
+        print(f"❌ {e}")
+    for role, plan in catalog.plans.items():
+        print(f"✅ {role}: {plan.title} ({len(plan.questions)} questions)")
+    for role, error in catalog.errors.items():
+        print(f"❌ {error}")
+    raise SystemExit(1 if catalog.errors or not catalog.plans else 0)
+
+
+if __name__ == "__main__":
+    main()
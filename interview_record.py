@@ -0,0 +1,200 @@
+import argparse
+import glob
+import gzip
+import json
+import logging
+import os
+from datetime import datetime, timezone
+
+from transcript_store import to_json
+
+INTERVIEW_RECORDS_DIR = os.getenv("INTERVIEW_RECORDS_DIR", "interviews")
+# "gzip" or "none"
+INTERVIEW_RECORD_COMPRESSION = os.getenv("INTERVIEW_RECORD_COMPRESSION", "none")
+RECORD_VERSION = 1
+LEGACY_TRANSCRIPT_SUFFIX = "_transcript.json"
+LEGACY_ANALYSIS_SUFFIX = "_AI_ANALYSIS.json"
+
+logger = logging.getLogger("interviewer.records")
+
+
+def is_legacy_file(path: str) -> bool:
+    """Legacy per-format output (`_transcript.json`/`_AI_ANALYSIS.json`); readable, but never rewritten in place"""
+    return path.endswith((LEGACY_TRANSCRIPT_SUFFIX, LEGACY_ANALYSIS_SUFFIX))
+
+
+def interview_id_for(candidate_name: str, timestamp: str) -> str:
+    return f"interview_{(candidate_name or 'Candidate').replace(' ', '_')}_{timestamp}"
+
+
+def record_path(interview_id: str, directory: str = INTERVIEW_RECORDS_DIR,
+                compression: str = INTERVIEW_RECORD_COMPRESSION) -> str:
+    suffix = ".json.gz" if compression == "gzip" else ".json"
+    return os.path.join(directory, f"{interview_id}{suffix}")
+
+
+def new_record(interview_summary: dict, interview_id: str) -> dict:
+    """Canonical record for an interview: metadata, the transcript (stored once) and, later, its analysis"""
+    return {
+        "record_version": RECORD_VERSION,
+        "interview_id": interview_id,
+        "candidate_name": interview_summary.get('candidate_name', 'Candidate'),
+        "job_description": interview_summary.get('job_description', 'Undefined Position'),
+        "start_time": interview_summary.get('start_time'),
+        "duration_minutes": interview_summary.get('duration_minutes', 0),
+        "interview_status": interview_summary.get('interview_status', 'completed'),
+        "summary_notes": interview_summary.get('summary_notes'),
+        "transcript": list(interview_summary.get('transcript') or []),
+        "audio_manifest": interview_summary.get('audio_manifest'),
+        "analysis": interview_summary.get('analysis'),
+    }
+
+
+def write_record(record: dict, path: str) -> str:
+    """Write a record atomically as compact JSON, gzipped when the path ends in .gz"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    data = json.dumps(record, ensure_ascii=False, separators=(",", ":"), default=to_json).encode("utf-8")
+    if path.endswith(".gz"):
+        data = gzip.compress(data)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return path
+
+
+def read_record(path: str) -> dict:
+    """Read a canonical record, or convert a legacy transcript/analysis JSON file into one"""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, 'rt', encoding='utf-8') as f:
+        data = json.load(f)
+    if "record_version" in data:
+        return data
+    return record_from_legacy(data, path)
+
+
+def record_from_legacy(data: dict, path: str) -> dict:
+    name = os.path.basename(path)
+    if "ai_analysis" in data:
+        metadata = data.get('interview_metadata', {})
+        summary = dict(data.get('agent_summary') or {})
+        summary.setdefault('candidate_name', metadata.get('candidate'))
+        summary.setdefault('job_description', metadata.get('position'))
+        summary.setdefault('duration_minutes', metadata.get('duration_minutes', 0))
+        summary['transcript'] = summary.get('transcript') or data.get('transcript')
+        summary['analysis'] = {
+            "result": data['ai_analysis'],
+            "token_counts": data.get('token_counts'),
+        }
+        transcript_file = metadata.get('transcript_file')
+        interview_id = os.path.basename(transcript_file)[:-len(LEGACY_TRANSCRIPT_SUFFIX)] if transcript_file \
+            else name[:-len(LEGACY_ANALYSIS_SUFFIX)]
+        return new_record(summary, interview_id)
+    interview_id = name[:-len(LEGACY_TRANSCRIPT_SUFFIX)] if name.endswith(LEGACY_TRANSCRIPT_SUFFIX) \
+        else os.path.splitext(name)[0]
+    return new_record(data, interview_id)
+
+
+def save_record(interview_summary: dict, interview_id: str, directory: str = INTERVIEW_RECORDS_DIR) -> str:
+    """Write the canonical record for a finished interview. Returns its path."""
+    return write_record(new_record(interview_summary, interview_id), record_path(interview_id, directory))
+
+
+def attach_analysis(path: str, analysis: dict) -> dict:
+    """Store an AI analysis on an existing record. Returns the updated record."""
+    if is_legacy_file(path):
+        raise ValueError(f"{path} is a legacy file; migrate it to a canonical record first")
+    record = read_record(path)
+    record["analysis"] = {"analyzed_at": datetime.now(timezone.utc).isoformat(), **analysis}
+    write_record(record, path)
+    return record
+
+
+def find_records(directory: str = INTERVIEW_RECORDS_DIR):
+    """Canonical record files in `directory`; legacy files are left to `migrate_legacy`"""
+    paths = glob.glob(os.path.join(directory, "interview_*.json")) + \
+        glob.glob(os.path.join(directory, "interview_*.json.gz"))
+    return sorted(path for path in paths if not is_legacy_file(path))
+
+
+def read_legacy(directory: str = "."):
+    """Read the legacy files in `directory` as records, each analysis merged into its transcript's record.
+
+    An analysis belongs to the transcript with the same interview ID or, failing that, the same start
+    time: older versions named the analysis after the candidate name the model heard and the time the
+    analysis ran, so the two files of one interview can differ in both. Returns (records by interview
+    ID, legacy paths by interview ID, analysis paths that matched no transcript).
+    """
+    records, sources, unmatched = {}, {}, []
+
+    def read(path):
+        try:
+            return read_record(path)
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ Skipping unreadable legacy file {os.path.basename(path)}: {e}")
+            return None
+
+    for path in sorted(glob.glob(os.path.join(directory, f"interview_*{LEGACY_TRANSCRIPT_SUFFIX}"))):
+        record = read(path)
+        if record is not None:
+            records[record["interview_id"]] = record
+            sources[record["interview_id"]] = [path]
+    by_start_time = {record["start_time"]: interview_id for interview_id, record in records.items()
+                     if record.get("start_time")}
+    for path in sorted(glob.glob(os.path.join(directory, f"interview_*{LEGACY_ANALYSIS_SUFFIX}"))):
+        record = read(path)
+        if record is None:
+            continue
+        interview_id = record["interview_id"]
+        if interview_id not in records and record.get("start_time"):
+            interview_id = by_start_time.get(record["start_time"], interview_id)
+        existing = records.get(interview_id)
+        if existing is None:
+            unmatched.append(path)
+            records[interview_id] = record
+            sources[interview_id] = [path]
+            continue
+        if record["analysis"]:
+            existing["analysis"] = record["analysis"]
+        sources[interview_id].append(path)
+    return records, sources, unmatched
+
+
+def find_unmigrated(directory: str = INTERVIEW_RECORDS_DIR):
+    """Legacy files in `directory` with no canonical record of their interview beside them"""
+    migrated = {os.path.basename(path).split(".json")[0] for path in find_records(directory)}
+    _, sources, _ = read_legacy(directory)
+    return sorted(path for interview_id, paths in sources.items() if interview_id not in migrated for path in paths)
+
+
+def migrate_legacy(directory: str = ".", output_dir: str = INTERVIEW_RECORDS_DIR) -> dict:
+    """Convert legacy per-format output files into canonical records, merging analyses into their
+    transcript's record (see `read_legacy`); the legacy files are left in place. Returns the number of
+    records written and the analysis files that matched no transcript, which get a record of their own."""
+    records, _, unmatched = read_legacy(directory)
+    for interview_id, record in records.items():
+        write_record(record, record_path(interview_id, output_dir))
+    return {"records": len(records), "unmatched": [os.path.basename(path) for path in unmatched]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Canonical interview records")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    migrate = subparsers.add_parser("migrate", help="Convert legacy _transcript.json/_AI_ANALYSIS.json files")
+    migrate.add_argument("directory", nargs="?", default=".")
+    migrate.add_argument("--output-dir", default=INTERVIEW_RECORDS_DIR)
+    show = subparsers.add_parser("show", help="Print a record as indented JSON")
+    show.add_argument("path")
+    args = parser.parse_args()
+
+    if args.command == "migrate":
+        result = migrate_legacy(args.directory, args.output_dir)
+        print(f"Wrote {result['records']} record(s) to {args.output_dir}")
+        for name in result["unmatched"]:
+            print(f"⚠️ {name} matched no transcript (by interview ID or start time); migrated on its own")
+    else:
+        print(json.dumps(read_record(args.path), indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
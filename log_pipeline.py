@@ -0,0 +1,258 @@
+import atexit
+import contextvars
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import re
+import sys
+import time
+from collections import OrderedDict
+
+# "development" prints readable lines; "production" is quiet: JSON lines, warnings from libraries,
+# and no per-turn transcript lines on the console
+LOG_MODE = os.getenv("LOG_MODE", "development")
+LOG_LEVEL = os.getenv("LOG_LEVEL", "WARNING" if LOG_MODE == "production" else "INFO")
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json" if LOG_MODE == "production" else "console")
+# Per-room JSON log files; empty disables them
+LOG_DIR = os.getenv("LOG_DIR", "logs")
+# Comma-separated overrides, e.g. "livekit=DEBUG,interviewer.turns=WARNING"
+LOG_LEVELS = os.getenv("LOG_LEVELS", "")
+# Comma-separated records-per-second limits for noisy loggers, e.g. "livekit=50,grpc=2"
+LOG_RATE_LIMITS = os.getenv("LOG_RATE_LIMITS", "")
+
+DEFAULT_LEVELS = {
+    "interviewer": "INFO",
+    "livekit": "INFO",
+    "grpc": "WARNING",
+    "httpx": "WARNING",
+    "httpcore": "WARNING",
+    "websockets": "WARNING",
+    "google_genai": "WARNING",
+    "watchfiles": "WARNING",
+    "asyncio": "WARNING",
+}
+PRODUCTION_LEVELS = {"livekit": "WARNING", "interviewer.turns": "WARNING"}
+DEFAULT_RATE_LIMITS = {"livekit": 20.0, "grpc": 5.0, "httpx": 5.0, "google_genai": 5.0}
+
+# Attributes every LogRecord has; anything else was passed through `extra` and goes into the JSON
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "taskName"}
+
+_current_room = contextvars.ContextVar("log_room", default=None)
+_listener = None
+_queue_handler = None
+_room_handler = None
+
+
+def parse_settings(value: str) -> dict:
+    settings = {}
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        name, _, setting = item.partition("=")
+        settings[name.strip()] = setting.strip()
+    return settings
+
+
+def set_log_room(room_name: str):
+    """Tag records logged from the current task (and tasks it creates) with `room_name`"""
+    _current_room.set(room_name)
+
+
+class RoomContextFilter(logging.Filter):
+    def filter(self, record):
+        if getattr(record, "room", None) is None:
+            record.room = _current_room.get()
+        return True
+
+
+class RateLimitFilter(logging.Filter):
+    """Token bucket per logger prefix. Dropped records are counted and reported on the next one let through."""
+
+    def __init__(self, limits: dict) -> None:
+        super().__init__()
+        # Longest prefix first so "livekit.agents" can override "livekit"
+        self.limits = sorted(((name, float(rate)) for name, rate in limits.items()), key=lambda x: -len(x[0]))
+        self._buckets = {}
+        self.dropped = 0
+
+    def _limit_for(self, name: str):
+        for prefix, rate in self.limits:
+            if name == prefix or name.startswith(prefix + "."):
+                return prefix, rate
+        return None, None
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        prefix, rate = self._limit_for(record.name)
+        if prefix is None:
+            return True
+        now = time.monotonic()
+        tokens, updated_at, suppressed = self._buckets.get(prefix, (rate * 2, now, 0))
+        tokens = min(rate * 2, tokens + (now - updated_at) * rate)
+        if tokens < 1:
+            self._buckets[prefix] = (tokens, now, suppressed + 1)
+            self.dropped += 1
+            return False
+        if suppressed:
+            record.suppressed = suppressed
+        self._buckets[prefix] = (tokens - 1, now, 0)
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        data = {
+            "ts": record.created,
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and value is not None:
+                data[key] = value
+        if record.exc_info:
+            data["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class ConsoleFormatter(logging.Formatter):
+    def format(self, record):
+        message = super().format(record)
+        if getattr(record, "suppressed", None):
+            message += f" ({record.suppressed} similar records suppressed)"
+        return message
+
+
+class RoomFileHandler(logging.Handler):
+    """Writes records tagged with a room to `<directory>/<room>.jsonl`. Runs on the listener thread.
+    At most `max_open` files stay open; the least recently used is closed (and reopened on demand)."""
+
+    def __init__(self, directory: str, max_open: int = 64) -> None:
+        super().__init__()
+        self.directory = directory
+        self.max_open = max_open
+        self._files = OrderedDict()
+        self.setFormatter(JsonFormatter())
+        os.makedirs(directory, exist_ok=True)
+
+    def emit(self, record):
+        room = getattr(record, "room", None)
+        if not room:
+            return
+        try:
+            f = self._files.get(room)
+            if f is None:
+                if len(self._files) >= self.max_open:
+                    self._files.popitem(last=False)[1].close()
+                safe_name = re.sub(r"[^\w.-]", "_", room)
+                f = self._files[room] = open(os.path.join(self.directory, f"{safe_name}.jsonl"), 'a', encoding='utf-8')
+            else:
+                self._files.move_to_end(room)
+            f.write(self.format(record) + "\n")
+            f.flush()
+        except Exception:
+            self.handleError(record)
+
+    def close_room(self, room: str):
+        f = self._files.pop(room, None)
+        if f is not None:
+            f.close()
+
+    def close(self):
+        for room in list(self._files):
+            self.close_room(room)
+        super().close()
+
+
+class _CloseRoomRecord(logging.LogRecord):
+    """Queued after a room's last record so its file is closed on the listener thread, in order"""
+
+
+class _RoomDispatchHandler(logging.Handler):
+    def __init__(self, room_handler: RoomFileHandler) -> None:
+        super().__init__()
+        self.room_handler = room_handler
+
+    def handle(self, record):
+        if isinstance(record, _CloseRoomRecord):
+            self.room_handler.close_room(record.room)
+            return True
+        return self.room_handler.handle(record)
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """Queues records as they are, so message formatting happens on the listener thread instead of the
+    caller's. Log arguments are formatted later: pass values, not objects the caller goes on mutating."""
+
+    def prepare(self, record):
+        return record
+
+
+def _is_log_record(record):
+    return not isinstance(record, _CloseRoomRecord)
+
+
+def setup_logging(mode: str = LOG_MODE, level: str = LOG_LEVEL, fmt: str = LOG_FORMAT, log_dir: str = LOG_DIR):
+    """Route all logging through a queue so handlers (console, per-room files) run on a background
+    thread instead of the event loop. Safe to call more than once.
+
+    Root handlers installed before this call (e.g. the one LiveKit uses to forward a job process's
+    records to the worker) keep receiving every record, from behind the queue. When there are any,
+    they own the console and no console handler of our own is added, so lines are not printed twice.
+    """
+    global _listener, _queue_handler, _room_handler
+    if _listener is not None:
+        return
+
+    levels = dict(DEFAULT_LEVELS)
+    if mode == "production":
+        levels.update(PRODUCTION_LEVELS)
+    levels.update(parse_settings(LOG_LEVELS))
+    rate_limits = {**DEFAULT_RATE_LIMITS, **parse_settings(LOG_RATE_LIMITS)}
+
+    root = logging.getLogger()
+    handlers = list(root.handlers)
+    for handler in handlers:
+        root.removeHandler(handler)
+        handler.addFilter(_is_log_record)
+    if not handlers:
+        console = logging.StreamHandler(sys.stdout)
+        console.setFormatter(JsonFormatter() if fmt == "json" else ConsoleFormatter("%(message)s"))
+        console.addFilter(_is_log_record)
+        handlers.append(console)
+    if log_dir:
+        _room_handler = RoomFileHandler(log_dir)
+        handlers.append(_RoomDispatchHandler(_room_handler))
+
+    log_queue = queue.SimpleQueue()
+    _queue_handler = _DeferredQueueHandler(log_queue)
+    _queue_handler.addFilter(RoomContextFilter())
+    _queue_handler.addFilter(RateLimitFilter(rate_limits))
+
+    root.addHandler(_queue_handler)
+    root.setLevel(level)
+    for name, logger_level in levels.items():
+        logging.getLogger(name).setLevel(logger_level)
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+
+
+def close_room_log(room_name: str):
+    """Close a room's log file once the records queued before this call are written"""
+    if _queue_handler is not None and _room_handler is not None:
+        record = _CloseRoomRecord("interviewer", logging.INFO, "", 0, "", None, None)
+        record.room = room_name
+        _queue_handler.queue.put_nowait(record)
+
+
+def stop_logging():
+    """Flush queued records and close the log files"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+        if _room_handler is not None:
+            _room_handler.close()
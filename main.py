@@ -1,65 +1,131 @@
+import startup_timing
 import logging
 import os
 import uuid
 import asyncio
+import shutil
+import tempfile
+import time
 import dotenv
-import json
-from datetime import datetime
-from livekit import agents, rtc
+from datetime import datetime, timezone
+from livekit import agents
 from livekit import api as livekit_api
-from livekit.agents import Agent, AgentSession, function_tool
+from livekit.agents import AgentSession, JobProcess, cli, WorkerOptions, RoomOutputOptions
+from livekit.agents import ConversationItemAddedEvent, UserInputTranscribedEvent, AgentStateChangedEvent
 from livekit.api.room_service import CreateRoomRequest
 from livekit.plugins import google
-from tavily import TavilyClient
-from InterviewerAgent import InterviewAgent as Interviewer
-from livekit.agents import cli, WorkerOptions,RoomOutputOptions
-from livekit.plugins import google
-from livekit.agents import ConversationItemAddedEvent
-from livekit.agents.llm import ImageContent, AudioContent 
-from livekit.agents import UserInputTranscribedEvent
-from google import genai
+startup_timing.mark("import livekit")
 
+# Load .env before importing our modules, which read their configuration at import time
 dotenv.load_dotenv()
-logging.basicConfig(level=logging.DEBUG)
+if __name__ == "__main__" and int(os.getenv("METRICS_PORT", "9464")):
+    # Job processes inherit this directory and record their metrics there for the worker's endpoint, so it has
+    # to be set before they start. Each worker has its own, so workers on one host never aggregate or delete
+    # each other's files; a directory left by a dead worker with this pid is cleared.
+    metrics_dir = os.path.join(os.getenv("METRICS_DIR") or os.path.join(tempfile.gettempdir(), "lunartech_metrics"),
+                               f"worker_{os.getpid()}")
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+    os.makedirs(metrics_dir)
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = metrics_dir
+from InterviewerAgent import InterviewAgent as Interviewer
+from analysis_queue import get_analysis_queue
+from faq_index import get_faq_index
+from interview_catalog import get_catalog
+from interview_analysis import get_context_cache, get_genai_client
+from search_backend import get_search_backend
+from transcript_compaction import count_tokens
+from transcript_journal import TranscriptJournal
+from transcript_store import TranscriptStore
+from session_shutdown import SessionShutdown
+from rolling_analysis import ROLLING_ANALYSIS_EVERY, RollingAnalyzer
+from audio_recorder import AUDIO_RECORDING, AudioRecorder
+from log_pipeline import close_room_log, set_log_room, setup_logging
+from worker_load import WORKER_LOAD_THRESHOLD, compute_worker_load
+from metrics import ACTIVE_SESSIONS, TURN_LATENCY, TURNS, METRICS_PORT, start_metrics_server
+startup_timing.mark("import interviewer modules")
+
+logger = logging.getLogger("interviewer.worker")
+turn_logger = logging.getLogger("interviewer.turns")
+
 TAVILY_API_KEY = os.getenv("TAVILY_API_KEY")
 
 LIVEKIT_WS_URL = os.getenv("LIVEKIT_WS_URL", "ws://localhost:7880")
 LIVEKIT_API_KEY = os.getenv("LIVEKIT_API_KEY", "devkey")
 LIVEKIT_API_SECRET = os.getenv("LIVEKIT_API_SECRET", "secret")
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
+ANALYSIS_DRAIN_TIMEOUT = float(os.getenv("ANALYSIS_DRAIN_TIMEOUT", "120"))
+
+_first_job = True
+
+
+def prewarm(proc: JobProcess):
+    """Build shared clients and compile the interview catalog once per worker process, before any job arrives"""
+    setup_logging()
+    with startup_timing.timed("compile interview catalog"):
+        proc.userdata["catalog"] = get_catalog()
+    with startup_timing.timed("FAQ indexes"):
+        for plan in proc.userdata["catalog"].plans.values():
+            get_faq_index(plan.jd)
+    with startup_timing.timed("GenAI client"):
+        get_genai_client()
+    if os.getenv("TAVILY_API_KEY"):
+        with startup_timing.timed("search HTTP pool"):
+            get_search_backend().client
+    with startup_timing.timed("tiktoken encoding"):
+        count_tokens("prewarm")
+    startup_timing.report("Worker prewarm")
+
 
 
+def register_transcript_handlers(session, room_name: str):
+    """Capture transcript turns and turn latency from the session's events"""
+    # Time of the last final candidate transcript still waiting for an assistant reply
+    pending_reply = {'since': None}
+
+    # Set up transcript capture events
+    @session.on("user_input_transcribed")
+    def on_user_input_transcribed(event: UserInputTranscribedEvent):
+        if event.is_final:  # Only capture final transcriptions
+            timestamp = datetime.now().strftime("%H:%M:%S")
+            entry = session._conversation_transcript.add('user', event.transcript, timestamp, event.speaker_id)
+            session._transcript_journal.append(entry)
+            rolling = getattr(session, '_rolling_analysis', None)
+            if rolling is not None:
+                rolling.observe_turn(entry)
+            recorder = getattr(session, '_audio_recorder', None)
+            if recorder is not None:
+                recorder.mark_turn(entry)
+            TURNS.labels(room=room_name, role='user').inc()
+            pending_reply['since'] = time.perf_counter()
+            turn_logger.info("👤 [%s] Candidate: %s", timestamp, event.transcript, extra={"room": room_name, "role": "user"})
+
+    @session.on("conversation_item_added")
+    def on_conversation_item_added(event: ConversationItemAddedEvent):
+        if event.item.role == "assistant" and event.item.text_content:
+            timestamp = datetime.now().strftime("%H:%M:%S")
+            entry = session._conversation_transcript.add('assistant', event.item.text_content, timestamp)
+            session._transcript_journal.append(entry)
+            rolling = getattr(session, '_rolling_analysis', None)
+            if rolling is not None:
+                rolling.observe_turn(entry)
+            recorder = getattr(session, '_audio_recorder', None)
+            if recorder is not None:
+                recorder.mark_turn(entry)
+            TURNS.labels(room=room_name, role='assistant').inc()
+            turn_logger.info("🤖 [%s] Interviewer: %s", timestamp, event.item.text_content,
+                             extra={"room": room_name, "role": "assistant", "interrupted": event.item.interrupted})
+
+    @session.on("agent_state_changed")
+    def on_agent_state_changed(event: AgentStateChangedEvent):
+        if event.new_state == "speaking" and pending_reply['since'] is not None:
+            TURN_LATENCY.labels(room=room_name).observe(time.perf_counter() - pending_reply['since'])
+            pending_reply['since'] = None
+
 
 async def entrypoint(ctx: agents.JobContext):
-    print("\\n🎤 Welcome to your AI Interviewer for Data Science positions!\\n")
-    
-    jd = """
-Data Scientist Position
-
-We are seeking a skilled Data Scientist to join our team. The ideal candidate will have experience in:
-
-- Statistical analysis and machine learning techniques
-- Programming in Python and/or R
-- Data visualization and storytelling
-- Working with large datasets and databases (SQL)
-- Experience with ML frameworks like scikit-learn, TensorFlow, or PyTorch
-- Strong analytical and problem-solving skills
-- Ability to communicate complex findings to non-technical stakeholders
-
-Requirements:
-- Bachelor's/Master's degree in Data Science, Statistics, Computer Science, or related field
-- 2+ years of experience in data science or analytics
-- Experience with cloud platforms (AWS, GCP, Azure) preferred
-- Strong business acumen and understanding of how data drives business decisions
-
-Additional Details & FAQ:
-- The position is full-time, but flexible and remote options are available.
-- The salary range is $95,000–$130,000 per year, depending on experience and location.
-- Candidates do not need a formal technical background, but familiarity with programming and statistics is required.
-- Part-time arrangements may be considered for exceptional candidates.
-- The company provides ongoing training and support for professional development.
-- Benefits include health insurance, paid time off, and a 401(k) plan.
-"""
+    setup_logging()
+    set_log_room(ctx.room.name)
+    catalog = ctx.proc.userdata.get("catalog") or get_catalog()
     
     room_name = os.getenv("LIVEKIT_ROOM_NAME") or f"interview-room-{uuid.uuid4().hex}"
     
@@ -76,10 +142,17 @@ Additional Details & FAQ:
             max_participants=2,# interviewer + candidate
         )
         room = await lkapi.room.create_room(req)
-        print(f"\\nRoom created! Join this link in your browser to start the interview: {os.getenv('LIVEKIT_URL')}/join/{room.name}\\n")
+        logger.info(f"Room created! Join this link in your browser to start the interview: {os.getenv('LIVEKIT_URL')}/join/{room.name}")
+        
+        # Pick the role's interview plan from the job's dispatch metadata or the room's metadata
+        await ctx.connect()
+        plan = catalog.plan_for(ctx.job.metadata, ctx.room.metadata)
+        jd = plan.jd
+        logger.info(f"🎤 Welcome to your AI Interviewer for {plan.title} positions! (plan: {plan.role})")
         
         # Create the interviewer agent
-        interviewer_agent = Interviewer(jd=jd)
+        interviewer_agent = Interviewer(jd=jd, plan=plan)
+        interviewer_agent.room_name = ctx.room.name
         
         # Create session
         session = AgentSession(
@@ -88,77 +161,111 @@ Additional Details & FAQ:
                 voice="Puck",
                 api_key=GOOGLE_API_KEY, 
                 temperature=0.7, 
-                instructions=f"You are a professional interviewer conducting an Interview with the job description: {jd}. Ask relevant interview questions ONE AT A TIME, listen carefully to complete answers, and wait for the candidate to finish speaking before asking the next question. Be patient and give candidates time to think and respond fully."
+                instructions=plan.realtime_instructions
             ),
             stt=google.STT(
                 model="latest_long",
                 spoken_punctuation=False,
             )
         )
-        await ctx.connect()
+
+        # Optional compliance recording; started before the session so the agent's track is captured too
+        if AUDIO_RECORDING:
+            recorder = AudioRecorder(ctx.room.name)
+            recorder.start(ctx.room)
+            session._audio_recorder = recorder
+            ctx.add_shutdown_callback(recorder.aclose)
         
-        # Add shutdown callback to save transcript when interview ends
+        # Shut down when the closing message has played out, flushing pending work first (in order)
+        shutdown = SessionShutdown(session, ctx.room.name, lambda: ctx.shutdown(reason="interview ended"))
+        session._shutdown = shutdown
+
+        # Make sure every journaled turn reaches disk before the job exits
+        async def flush_transcript_journal():
+            journal = getattr(session, '_transcript_journal', None)
+            if journal is not None:
+                await journal.flush()
+
+        shutdown.add_flush_step("transcript journal", flush_transcript_journal)
+
+        ctx.add_shutdown_callback(shutdown.on_job_shutdown)
+
+        # Keep the job process alive until queued AI analyses have finished. Job shutdown callbacks
+        # run after the room is disconnected, so this never holds the room or the session open.
+        async def wait_for_analysis():
+            await get_analysis_queue().wait_idle(timeout=ANALYSIS_DRAIN_TIMEOUT)
+            logger.info(f"📊 Analysis queue stats: {get_analysis_queue().stats()}")
+
+        ctx.add_shutdown_callback(wait_for_analysis)
+        ctx.room.on("disconnected", shutdown.on_room_disconnected)
+
+        async def report_search_cache():
+            logger.info(f"🔎 Web search cache stats: {get_search_backend().stats()}")
+            context_cache = get_context_cache()
+            if context_cache is not None:
+                logger.info(f"🗂️ Context cache stats: {context_cache.stats()}")
+
+        ctx.add_shutdown_callback(report_search_cache)
+
+        # The session's only in-memory transcript; save and analysis read it through views
+        session._conversation_transcript = TranscriptStore()
+        session._transcript_journal = TranscriptJournal(ctx.room.name, {
+            "candidate_name": interviewer_agent.name,
+            "job_description": jd,
+            "start_time": datetime.now(timezone.utc).isoformat(),
+        }, journal_id=ctx.job.id)
 
-        # Initialize conversation transcript storage on the session
-        session._conversation_transcript = []
+        # Keep a running assessment in the background so the final analysis is a small merge
+        if ROLLING_ANALYSIS_EVERY > 0:
+            rolling = RollingAnalyzer(jd, interviewer_agent.name, ctx.room.name)
+            session._rolling_analysis = rolling
+
+            async def stop_rolling_analysis():
+                rolling.close()
+
+            ctx.add_shutdown_callback(stop_rolling_analysis)
 
         
 
         await session.start(room=ctx.room, agent=interviewer_agent, room_output_options=RoomOutputOptions(sync_transcription=False))
+        ACTIVE_SESSIONS.labels(room=ctx.room.name).inc()
+
+        global _first_job
+        if _first_job:
+            _first_job = False
+            startup_timing.mark("first job ready")
+            startup_timing.report("First job")
+
+        async def end_session_metrics():
+            ACTIVE_SESSIONS.labels(room=ctx.room.name).dec()
+            close_room_log(ctx.room.name)
+
+        ctx.add_shutdown_callback(end_session_metrics)
 
         # Set up transcript capture events
-        @session.on("user_input_transcribed")
-        def on_user_input_transcribed(event: UserInputTranscribedEvent):
-            if event.is_final:  # Only capture final transcriptions
-                timestamp = datetime.now().strftime("%H:%M:%S")
-                entry = {
-                    'timestamp': timestamp,
-                    'role': 'user',
-                    'text': event.transcript,
-                    'speaker_id': event.speaker_id
-                }
-                session._conversation_transcript.append(entry)
-                print(f"👤 [{timestamp}] Candidate: {event.transcript}")
-        
-        @session.on("conversation_item_added")
-        def on_conversation_item_added(event: ConversationItemAddedEvent):
-            if event.item.role == "assistant" and event.item.text_content:
-                timestamp = datetime.now().strftime("%H:%M:%S")
-                entry = {
-                    'timestamp': timestamp,
-                    'role': 'assistant',
-                    'text': event.item.text_content,
-                    'speaker_id': None
-                }
-                session._conversation_transcript.append(entry)
-                print(f"🤖 [{timestamp}] Interviewer: {event.item.text_content[:100]}{'...' if len(event.item.text_content) > 100 else ''}")
-                
-                if event.item.interrupted:
-                    print(f"   ⚠️ Message was interrupted")
+        register_transcript_handlers(session, ctx.room.name)
 
         # Give the agent a moment to initialize, then start the interview
         await asyncio.sleep(1)
-        await session.generate_reply(
-            instructions=f"""Greet the candidate warmly and conduct a professional interview for the Data Science position. 
-            Ask these questions ONE AT A TIME, waiting for each complete response before moving to the next:
-            1. What is your full name and background?
-            2. Why are you interested in this Data Science position?
-            3. What's your experience with data science, machine learning, or AI?
-            4. What are your short-term and long-term career goals?
-            5. Are you ready to start immediately? If not, when would you be available?
-            
-            After these questions, ask follow-up questions based on their responses and the job requirements.
-            When you have sufficient information, or the user want to end the interview you MUST call the end_interview function."""
-        )
+        await session.generate_reply(instructions=plan.opening_instructions)
         
     except Exception as e:
-        print(f"Error during interview: {e}")
+        logger.exception(f"Error during interview: {e}")
     finally:
         # Clean up the LiveKit API client to prevent unclosed session warnings
         try:
             await lkapi.aclose()
         except Exception as e:
-            print(f"Error closing LiveKit API client: {e}")
-            
+            logger.warning(f"Error closing LiveKit API client: {e}")
+
 if __name__ == "__main__":
-    cli.run_app( WorkerOptions(entrypoint_fnc=entrypoint) )
\ No newline at end of file
+    if METRICS_PORT:
+        start_metrics_server(METRICS_PORT)
+    cli.run_app( WorkerOptions(
+        entrypoint_fnc=entrypoint,
+        prewarm_fnc=prewarm,
+        load_fnc=compute_worker_load,
+        load_threshold=WORKER_LOAD_THRESHOLD,
+        # Leave room for the analysis drain in the job's shutdown callbacks
+        shutdown_process_timeout=ANALYSIS_DRAIN_TIMEOUT + 30,
+    ) )
\ No newline at end of file
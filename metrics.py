@@ -0,0 +1,86 @@
+import atexit
+import os
+import shutil
+import time
+from contextlib import contextmanager
+
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, multiprocess, start_http_server
+
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9464"))
+# Set by the worker entry point (main.py) to a directory of its own. Job processes inherit it and record
+# there; the worker's metrics endpoint aggregates it.
+METRICS_MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 5.0, 10.0)
+SLOW_BUCKETS = (0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0)
+
+TURN_LATENCY = Histogram(
+    "interview_turn_latency_seconds",
+    "Time from the candidate's final STT transcript to the first assistant audio",
+    ["room"], buckets=LATENCY_BUCKETS,
+)
+TURNS = Counter("interview_turns_total", "Transcript turns captured", ["room", "role"])
+WEB_SEARCH_DURATION = Histogram(
+    "interview_web_search_duration_seconds", "web_search tool duration", ["room"], buckets=LATENCY_BUCKETS,
+)
+SAVE_DURATION = Histogram(
+    "interview_save_duration_seconds", "_save_interview_data write time", ["room"], buckets=LATENCY_BUCKETS,
+)
+ANALYSIS_DURATION = Histogram(
+    "interview_analysis_duration_seconds", "AI analysis duration", ["room", "status"], buckets=SLOW_BUCKETS,
+)
+ANALYSIS_TOKENS = Counter(
+    "interview_analysis_prompt_tokens_total", "Analysis prompt tokens before and after compaction", ["room", "stage"],
+)
+SHUTDOWN_DURATION = Histogram(
+    "interview_shutdown_seconds", "Time from end_interview to closing-message playout, flush, session close and room close",
+    ["room", "stage"], buckets=SLOW_BUCKETS,
+)
+ANALYSIS_CALLS = Counter(
+    "interview_analysis_calls_total", "Gemini analysis requests by model and outcome", ["model", "outcome"],
+)
+ANALYSIS_JOBS_DROPPED = Counter(
+    "interview_analysis_jobs_dropped_total", "Analyses dropped because the analysis queue was full",
+)
+ROLLING_ANALYSIS_UPDATES = Counter(
+    "interview_rolling_analysis_updates_total", "Incremental analysis updates during interviews", ["outcome"],
+)
+AUDIO_FRAMES = Counter(
+    "interview_audio_frames_total", "Audio frames queued for recording or dropped", ["room", "outcome"],
+)
+ACTIVE_SESSIONS = Gauge(
+    "interview_active_sessions", "Interview sessions currently running", ["room"], multiprocess_mode="livesum",
+)
+
+_server_pid = None
+
+
+@contextmanager
+def observe(histogram, **labels):
+    """Time the enclosed block into `histogram`"""
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram.labels(**labels).observe(time.perf_counter() - started_at)
+
+
+def start_metrics_server(port: int = METRICS_PORT):
+    """Serve metrics aggregated across the worker's job processes. Call once from the worker process;
+    its metrics directory is removed when it exits."""
+    global _server_pid
+    if not METRICS_MULTIPROC_DIR:
+        start_http_server(port)
+        return
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry, path=METRICS_MULTIPROC_DIR)
+    start_http_server(port, registry=registry)
+    _server_pid = os.getpid()
+    atexit.register(shutil.rmtree, METRICS_MULTIPROC_DIR, ignore_errors=True)
+    print(f"📈 Metrics available at http://localhost:{port}/metrics")
+
+
+@atexit.register
+def _mark_process_dead():
+    if METRICS_MULTIPROC_DIR and os.getpid() != _server_pid:
+        multiprocess.mark_process_dead(os.getpid(), METRICS_MULTIPROC_DIR)
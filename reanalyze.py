@@ -0,0 +1,98 @@
+import argparse
+import asyncio
+import os
+import time
+
+from analysis_calls import RateLimiter
+from interview_analysis import analyze_transcript, get_genai_client
+from interview_record import INTERVIEW_RECORDS_DIR, find_records, find_unmigrated, read_record
+from log_pipeline import setup_logging
+
+
+def find_pending(directory: str, force: bool = False):
+    """Return (pending, skipped) record paths; a record is done once it carries an analysis"""
+    pending, skipped = [], []
+    for path in find_records(directory):
+        if not force and read_record(path).get('analysis'):
+            skipped.append(path)
+        else:
+            pending.append(path)
+    return pending, skipped
+
+
+async def reanalyze_file(path: str, rate_limiter: RateLimiter):
+    record = await asyncio.to_thread(read_record, path)
+    return await analyze_transcript(
+        record.get('transcript', []),
+        jd=record.get('job_description', 'Undefined Position'),
+        candidate_name=record.get('candidate_name', 'Candidate'),
+        interview_summary=record,
+        record_file=path,
+        rate_limiter=rate_limiter,
+    )
+
+
+async def run_batch(directory: str, concurrency: int, requests_per_minute: float, force: bool = False) -> dict:
+    pending, skipped = find_pending(directory, force)
+    legacy = find_unmigrated(directory)
+    print(f"🔁 Re-analyzing {len(pending)} interview(s) in {directory} ({len(skipped)} already analyzed)")
+    if legacy:
+        print(f"⚠️ {len(legacy)} legacy _transcript.json/_AI_ANALYSIS.json file(s) in {directory} are not re-analyzed. "
+              f"Convert them first: python interview_record.py migrate {directory} --output-dir {directory}")
+
+    rate_limiter = RateLimiter(requests_per_minute)
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    summary = {"pending": len(pending), "skipped": len(skipped), "analyzed": 0, "empty": 0, "failed": 0, "errors": {},
+               "legacy": len(legacy)}
+
+    async def worker(path):
+        async with semaphore:
+            try:
+                result = await reanalyze_file(path, rate_limiter)
+            except Exception as e:
+                summary["failed"] += 1
+                summary["errors"][os.path.basename(path)] = str(e)
+                print(f"❌ {os.path.basename(path)}: {e}")
+                return
+            if result:
+                summary["analyzed"] += 1
+                print(f"✅ {os.path.basename(path)}")
+            else:
+                summary["empty"] += 1
+
+    started_at = time.monotonic()
+    await asyncio.gather(*(worker(path) for path in pending))
+    summary["elapsed_s"] = time.monotonic() - started_at
+    summary["throughput_per_min"] = summary["analyzed"] / summary["elapsed_s"] * 60 if summary["elapsed_s"] else 0.0
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-run AI analysis over archived interview records")
+    parser.add_argument("directory", nargs="?", default=INTERVIEW_RECORDS_DIR, help="Directory containing interview records")
+    parser.add_argument("--concurrency", type=int, default=4, help="Maximum analyses in flight")
+    parser.add_argument("--rpm", type=float, default=30, help="Maximum Gemini requests per minute, retries and hedged requests included (0 = unlimited)")
+    parser.add_argument("--force", action="store_true", help="Re-analyze interviews that already have an analysis")
+    args = parser.parse_args()
+    setup_logging(log_dir="")
+
+    if get_genai_client() is None:
+        print("⚠️ GOOGLE_API_KEY not found. Only cached analyses can be produced.")
+
+    summary = asyncio.run(run_batch(args.directory, args.concurrency, args.rpm, args.force))
+
+    print(f"\nRE-ANALYSIS SUMMARY")
+    print(f"===================")
+    print(f"  Analyzed: {summary['analyzed']}")
+    print(f"  Skipped (already analyzed): {summary['skipped']}")
+    print(f"  Skipped (empty transcript or no API key): {summary['empty']}")
+    print(f"  Failed: {summary['failed']}")
+    if summary["legacy"]:
+        print(f"  Not migrated (legacy files): {summary['legacy']}")
+    print(f"  Elapsed: {summary['elapsed_s']:.1f}s ({summary['throughput_per_min']:.1f} analyses/min)")
+    for name, error in summary["errors"].items():
+        print(f"    • {name}: {error}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+import argparse
+import html
+import os
+from datetime import datetime
+from string import Template
+
+from interview_record import read_record
+
+FORMATS = {"txt": ".txt", "md": ".md", "html": ".html"}
+
+# Each format is a handful of templates; render_report fills them from a canonical interview record
+TEMPLATES = {
+    "txt": {
+        "document": Template("$title\n$rule\n\n$body"),
+        "field": Template("$label: $value\n"),
+        "section": Template("$heading\n$rule\n\n$content\n"),
+        "bullet": Template("  • $item\n"),
+        "turn": Template("[$timestamp] $speaker: $text\n\n"),
+    },
+    "md": {
+        "document": Template("# $title\n\n$body"),
+        "field": Template("- **$label:** $value\n"),
+        "section": Template("## $heading\n\n$content\n"),
+        "bullet": Template("- $item\n"),
+        "turn": Template("**[$timestamp] $speaker:** $text\n\n"),
+    },
+    "html": {
+        "document": Template(
+            "<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\"><title>$title</title></head>\n"
+            "<body>\n<h1>$title</h1>\n$body</body></html>\n"
+        ),
+        "field": Template("<p><strong>$label:</strong> $value</p>\n"),
+        "section": Template("<h2>$heading</h2>\n$content\n"),
+        "bullet": Template("<li>$item</li>\n"),
+        "turn": Template("<p><strong>[$timestamp] $speaker:</strong> $text</p>\n"),
+    },
+}
+
+
+def _rule(text: str) -> str:
+    return "=" * len(text)
+
+
+def render_report(record: dict, fmt: str = "txt") -> str:
+    """Render an interview record as a txt, md or html report. Includes the AI analysis when present."""
+    templates = TEMPLATES[fmt]
+    escape = html.escape if fmt == "html" else str
+
+    def field(label, value):
+        return templates["field"].substitute(label=label, value=escape(str(value)))
+
+    def section(heading, content):
+        return templates["section"].substitute(heading=heading, rule=_rule(heading), content=content)
+
+    def bullets(items):
+        content = "".join(templates["bullet"].substitute(item=escape(str(item))) for item in items)
+        return f"<ul>\n{content}</ul>\n" if fmt == "html" else content
+
+    def paragraph(text):
+        return f"<p>{escape(text)}</p>\n" if fmt == "html" else f"{text}\n"
+
+    start_time = record.get('start_time')
+    start_time = datetime.fromisoformat(start_time) if start_time else None
+    analysis = (record.get('analysis') or {}).get('result')
+
+    parts = [
+        field("Candidate", (analysis or {}).get('candidate_name') or record.get('candidate_name', 'Candidate')),
+        field("Date", start_time.strftime('%Y-%m-%d %H:%M:%S UTC') if start_time else 'Unknown'),
+        field("Duration", f"{record.get('duration_minutes') or 0:.1f} minutes"),
+        "\n",
+    ]
+
+    if analysis:
+        parts.append(section("CANDIDATE ASSESSMENT", "".join([
+            field("Interest Level", analysis.get('interest_level', 'Unknown')),
+            field("Readiness", analysis.get('readiness', 'Unknown')),
+            field("Experience Level", analysis.get('experience_level', 'Unknown')),
+        ])))
+        parts.append(section("TECHNICAL SKILLS", bullets(analysis.get('technical_skills', []))))
+        parts.append(section("SOFT SKILLS", bullets(analysis.get('soft_skills', []))))
+        for key, heading in (("key_strengths", "KEY STRENGTHS"), ("areas_for_improvement", "AREAS FOR IMPROVEMENT"),
+                             ("overall_assessment", "OVERALL ASSESSMENT")):
+            if analysis.get(key):
+                parts.append(section(heading, paragraph(analysis[key])))
+        if analysis.get('notable_quotes'):
+            parts.append(section("NOTABLE QUOTES", bullets(f'"{quote}"' for quote in analysis['notable_quotes'])))
+
+    turns = "".join(
+        templates["turn"].substitute(
+            timestamp=escape(str(entry.get('timestamp', 'Unknown'))),
+            speaker="Interviewer" if entry.get('role') == "assistant" else "Candidate",
+            text=escape(entry.get('text', '')),
+        )
+        for entry in record.get('transcript') or []
+    )
+    parts.append(section("TRANSCRIPT", turns))
+
+    if record.get('summary_notes'):
+        parts.append(section("INTERVIEWER NOTES", paragraph(record['summary_notes'])))
+
+    title = "AI-ENHANCED INTERVIEW ANALYSIS" if analysis else "INTERVIEW SUMMARY"
+    return templates["document"].substitute(title=title, rule=_rule(title), body="".join(parts))
+
+
+def render_file(record_file: str, fmt: str = "txt", output_dir: str = None) -> str:
+    """Render a record file to a report next to it (or in `output_dir`). Returns the report path."""
+    record = read_record(record_file)
+    report_file = os.path.join(output_dir or os.path.dirname(record_file), record["interview_id"] + FORMATS[fmt])
+    with open(report_file, 'w', encoding='utf-8') as f:
+        f.write(render_report(record, fmt))
+    return report_file
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render interview reports from canonical records")
+    parser.add_argument("records", nargs="+", help="Interview record files (.json or .json.gz)")
+    parser.add_argument("--format", choices=sorted(FORMATS), default="txt")
+    parser.add_argument("--output-dir", help="Where to write reports (default: next to each record)")
+    parser.add_argument("--stdout", action="store_true", help="Print the report instead of writing a file")
+    args = parser.parse_args()
+
+    for record_file in args.records:
+        if args.stdout:
+            print(render_report(read_record(record_file), args.format))
+        else:
+            print(f"📄 {render_file(record_file, args.format, args.output_dir)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+import asyncio
+import json
+import logging
+import os
+import re
+import time
+
+from analysis_calls import ANALYSIS_MAX_ATTEMPTS, ANALYSIS_MODEL, HostRateLimiter, generate_analysis
+from interview_analysis import build_analysis_prefix, get_context_cache, get_genai_client
+from metrics import ROLLING_ANALYSIS_UPDATES
+from transcript_compaction import count_tokens, format_transcript, merge_turns
+
+logger = logging.getLogger("interviewer.rolling")
+
+# Update the running assessment every N candidate turns; 0 disables rolling analysis
+ROLLING_ANALYSIS_EVERY = int(os.getenv("ROLLING_ANALYSIS_EVERY", "4"))
+# Minimum seconds between updates of one interview, and the update rate across every job process on the host
+ROLLING_ANALYSIS_MIN_INTERVAL = float(os.getenv("ROLLING_ANALYSIS_MIN_INTERVAL", "30"))
+ROLLING_ANALYSIS_RPM = float(os.getenv("ROLLING_ANALYSIS_RPM", "30"))
+# Each job runs in its own process; they share the ROLLING_ANALYSIS_RPM schedule through this file
+ROLLING_ANALYSIS_RATE_FILE = os.getenv("ROLLING_ANALYSIS_RATE_FILE", ".rolling_analysis_rate")
+# At end_interview, fold at most this many unanalyzed turns with one small call; more falls back to a full analysis
+ROLLING_ANALYSIS_FINAL_TURNS = int(os.getenv("ROLLING_ANALYSIS_FINAL_TURNS", "12"))
+# How long end_interview's analysis waits for an update that is still running
+ROLLING_ANALYSIS_FINALIZE_TIMEOUT = float(os.getenv("ROLLING_ANALYSIS_FINALIZE_TIMEOUT", "30"))
+# Live progress files for recruiters (<dir>/<room>.json); empty disables them
+LIVE_ANALYSIS_DIR = os.getenv("LIVE_ANALYSIS_DIR", "live_analysis")
+MAX_NOTABLE_QUOTES = 10
+
+LIST_FIELDS = ("technical_skills", "soft_skills", "notable_quotes")
+
+_rate_limiter = None
+
+
+def get_rate_limiter() -> HostRateLimiter:
+    """Return the rate limiter for rolling updates; its schedule is shared by every job process on the host"""
+    global _rate_limiter
+    if _rate_limiter is None:
+        _rate_limiter = HostRateLimiter(ROLLING_ANALYSIS_RPM, ROLLING_ANALYSIS_RATE_FILE)
+    return _rate_limiter
+
+
+def build_rolling_request(state: dict, transcript_text: str) -> str:
+    """The part after the shared analysis prefix: the running assessment plus the turns it hasn't seen"""
+    return f"""
+            Running assessment of the earlier part of the interview:
+            {json.dumps(state, ensure_ascii=False)}
+
+            New transcript turns since that assessment:
+            {transcript_text}
+
+            Update the running assessment with the new turns and return the complete assessment.
+            Keep skills and quotes from the running assessment unless the new turns contradict them.
+            """
+
+
+def _union(existing, new, limit: int = None):
+    """Ordered, case-insensitive union; with `limit`, keep the most recent items"""
+    merged = list(existing)
+    seen = {item.casefold() for item in merged}
+    for item in new:
+        if item and item.casefold() not in seen:
+            seen.add(item.casefold())
+            merged.append(item)
+    return merged[-limit:] if limit else merged
+
+
+def merge_state(state: dict, update: dict) -> dict:
+    """Merge an updated assessment into the running state locally: lists are unioned so an update can't
+    drop skills or quotes seen earlier, and the latest non-empty value wins for everything else"""
+    if not state:
+        return dict(update)
+    merged = dict(state)
+    for key, value in update.items():
+        if key in LIST_FIELDS:
+            merged[key] = _union(state.get(key) or [], value or [],
+                                 MAX_NOTABLE_QUOTES if key == "notable_quotes" else None)
+        elif value:
+            merged[key] = value
+    return merged
+
+
+class RollingAnalyzer:
+    """Keeps a running structured assessment of one interview while it happens.
+
+    The transcript handlers call `observe_turn` for every captured turn. Every
+    `every` candidate turns (and at most once per `min_interval`) a background
+    task sends the turns seen since the last update, together with the current
+    state, to Gemini and merges the answer into the state. Updates never run on
+    the audio path, at most one runs per interview, and all interviews on the
+    host share one rate limit (`ROLLING_ANALYSIS_RPM`), through a file that
+    every job process reads.
+
+    At `end_interview`, `finalize()` folds whatever is left into the state,
+    locally or with one small call, so the final analysis doesn't have to
+    re-read the whole transcript.
+    """
+
+    def __init__(self, jd: str, candidate_name: str, room_name: str, every: int = ROLLING_ANALYSIS_EVERY,
+                 min_interval: float = ROLLING_ANALYSIS_MIN_INTERVAL, live_dir: str = LIVE_ANALYSIS_DIR) -> None:
+        self.jd = jd
+        self.candidate_name = candidate_name
+        self.room_name = room_name or "unknown"
+        self.every = every
+        self.min_interval = min_interval
+        self.live_dir = live_dir
+        self.state = {}
+        self.updates = 0
+        self.attempts = 0
+        self.hedged = False
+        self.turns_analyzed = 0
+        self.prompt_tokens = 0
+        self.model = ANALYSIS_MODEL
+        self._pending = []
+        self._candidate_turns = 0
+        self._last_update_at = float("-inf")
+        self._task = None
+        self._closed = False
+
+    def observe_turn(self, entry: dict):
+        """Record a transcript turn and start an update when one is due. Cheap and non-blocking."""
+        if self._closed:
+            return
+        self._pending.append(entry)
+        if entry.get('role') == 'user':
+            self._candidate_turns += 1
+        if (self._task is None and self._candidate_turns >= self.every
+                and time.monotonic() - self._last_update_at >= self.min_interval):
+            self._task = asyncio.create_task(self._run_update())
+
+    async def _run_update(self):
+        try:
+            await self._update()
+        except Exception as e:
+            ROLLING_ANALYSIS_UPDATES.labels(outcome="error").inc()
+            logger.warning("⚠️ Rolling analysis update failed, retrying with more turns later: %s", e,
+                           extra={"room": self.room_name})
+        finally:
+            self._task = None
+
+    async def _update(self, final: bool = False):
+        client = get_genai_client()
+        if client is None:
+            self._closed = True
+            return
+        await get_rate_limiter().acquire()
+
+        # Take the batch after waiting for the rate limiter, so turns that arrived meanwhile are included
+        batch, self._pending = self._pending, []
+        candidate_turns, self._candidate_turns = self._candidate_turns, 0
+        self._last_update_at = time.monotonic()
+        done = False
+        try:
+            transcript_text = format_transcript(merge_turns(batch))
+            if not transcript_text.strip():
+                done = True
+                return
+            prefix = build_analysis_prefix(self.jd)
+            request = build_rolling_request(self.state, transcript_text)
+            context_cache = get_context_cache()
+            cached_content = None
+            if context_cache is not None:
+                cached_content = await context_cache.get(ANALYSIS_MODEL, prefix, token_count=count_tokens(prefix))
+            # Intermediate updates are best effort: a failed one is retried with more turns at the next trigger
+            call = await generate_analysis(client, prefix + request, cached_request=request,
+                                           cached_content=cached_content, max_attempts=ANALYSIS_MAX_ATTEMPTS if final else 1)
+            done = True
+        finally:
+            if not done:
+                self._pending[:0] = batch
+                self._candidate_turns += candidate_turns
+
+        self.state = merge_state(self.state, call.analysis)
+        self.updates += 1
+        self.attempts += call.attempts
+        self.hedged = call.hedged
+        self.turns_analyzed += len(batch)
+        self.prompt_tokens += count_tokens(request if cached_content else prefix + request)
+        self.model = call.model
+        ROLLING_ANALYSIS_UPDATES.labels(outcome="final" if final else "ok").inc()
+        await self.publish("final" if final else "in_progress")
+
+    async def publish(self, status: str):
+        """Log the running assessment and write it to the room's live progress file"""
+        state = self.state
+        logger.info(
+            "📈 Rolling analysis #%d (%d turns): interest %s, readiness %s, experience %s, %d skill(s)",
+            self.updates, self.turns_analyzed, state.get('interest_level', '-'), state.get('readiness', '-'),
+            state.get('experience_level', '-'), len(state.get('technical_skills', [])) + len(state.get('soft_skills', [])),
+            extra={"room": self.room_name, "rolling_status": status},
+        )
+        if self.live_dir:
+            progress = {
+                "room": self.room_name,
+                "candidate_name": self.candidate_name,
+                "status": status,
+                "updated_at": time.time(),
+                "updates": self.updates,
+                "turns_analyzed": self.turns_analyzed,
+                "assessment": state,
+            }
+            try:
+                await asyncio.to_thread(self._write_progress, progress)
+            except OSError as e:
+                logger.warning("⚠️ Could not write live analysis progress: %s", e, extra={"room": self.room_name})
+
+    def _write_progress(self, progress: dict):
+        os.makedirs(self.live_dir, exist_ok=True)
+        path = os.path.join(self.live_dir, re.sub(r"[^\w.-]", "_", self.room_name) + ".json")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(progress, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    async def _wait_for_update(self):
+        if self._task is None:
+            return
+        try:
+            await asyncio.wait_for(asyncio.shield(self._task), ROLLING_ANALYSIS_FINALIZE_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning("⚠️ Rolling analysis update still running at end of interview, cancelling it",
+                           extra={"room": self.room_name})
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    async def finalize(self):
+        """Fold the remaining turns into the state and return `(analysis, call_info, token_counts)`, or None
+        when a full analysis is needed (no updates yet, too many turns left, or the merge call failed)"""
+        self._closed = True
+        await self._wait_for_update()
+        if not self.updates:
+            return None
+
+        remaining = len(self._pending)
+        if not any(entry.get('role') == 'user' for entry in self._pending):
+            # Only interviewer lines (e.g. the closing message) are left: nothing new to assess
+            merge = "local"
+            started_at = time.perf_counter()
+        elif remaining <= ROLLING_ANALYSIS_FINAL_TURNS:
+            merge = "call"
+            started_at = time.perf_counter()
+            try:
+                await self._update(final=True)
+            except Exception as e:
+                logger.warning("⚠️ Rolling analysis merge call failed, falling back to a full analysis: %s", e,
+                               extra={"room": self.room_name})
+                return None
+        else:
+            logger.info("Rolling analysis is %d turns behind, running a full analysis instead", remaining,
+                        extra={"room": self.room_name})
+            return None
+
+        if merge == "local":
+            await self.publish("final")
+        call_info = {
+            "model": self.model,
+            "attempts": self.attempts,
+            "updates": self.updates,
+            "hedged": self.hedged,
+            "mode": "rolling",
+            "merge": merge,
+            "call_seconds": time.perf_counter() - started_at,
+        }
+        token_counts = {"rolling_updates": self.updates, "turns_analyzed": self.turns_analyzed,
+                        "prompt_tokens_after": self.prompt_tokens}
+        return dict(self.state), call_info, token_counts
+
+    def close(self):
+        """Stop updating, e.g. when the session ends without end_interview"""
+        if self._closed:
+            # Already finalizing (or finished); finalize() owns any running update
+            return
+        self._closed = True
+        if self._task is not None:
+            self._task.cancel()
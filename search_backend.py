@@ -0,0 +1,213 @@
+import asyncio
+import os
+import re
+import sqlite3
+import time
+from contextlib import closing
+
+import httpx
+
+TAVILY_API_URL = os.getenv("TAVILY_API_URL", "https://api.tavily.com")
+# Each job runs in its own process, so cached results are shared through this SQLite file
+SEARCH_CACHE_DB = os.getenv("SEARCH_CACHE_DB", "search_cache.db")
+SEARCH_CACHE_SIZE = int(os.getenv("SEARCH_CACHE_SIZE", "512"))
+SEARCH_CACHE_TTL = float(os.getenv("SEARCH_CACHE_TTL", "3600"))
+SEARCH_TIMEOUT = float(os.getenv("SEARCH_TIMEOUT", "10"))
+SEARCH_MAX_CONNECTIONS = int(os.getenv("SEARCH_MAX_CONNECTIONS", "20"))
+# How often a process waiting on another process's fetch of the same query checks for the answer
+SEARCH_COALESCE_POLL = 0.05
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    query TEXT PRIMARY KEY,
+    answer TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    used_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_used_at ON results (used_at);
+CREATE TABLE IF NOT EXISTS claims (
+    query TEXT PRIMARY KEY,
+    expires_at REAL NOT NULL
+);
+"""
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a query so trivially different phrasings share a cache entry"""
+    query = query.lower().strip()
+    query = re.sub(r"[^\w\s$%.-]", " ", query)
+    return " ".join(query.split()).strip(" .")
+
+
+class TavilyHTTPClient:
+    """Minimal async Tavily client that keeps one pooled HTTP connection set"""
+
+    def __init__(self, api_key: str, base_url: str = TAVILY_API_URL) -> None:
+        self._http = httpx.AsyncClient(
+            base_url=base_url,
+            headers={"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"},
+            timeout=SEARCH_TIMEOUT,
+            limits=httpx.Limits(max_connections=SEARCH_MAX_CONNECTIONS, max_keepalive_connections=SEARCH_MAX_CONNECTIONS),
+        )
+
+    async def search(self, query: str, search_depth: str = "basic") -> dict:
+        response = await self._http.post("/search", json={"query": query, "search_depth": search_depth})
+        response.raise_for_status()
+        return response.json()
+
+    async def aclose(self):
+        await self._http.aclose()
+
+
+class SearchCache:
+    """LRU+TTL cache of search answers in SQLite, shared by every job process on the host.
+
+    Entries expire `ttl` seconds after they were stored; past `maxsize` entries the least recently
+    used are evicted. A process about to fetch a query claims it first, so other processes wait for
+    its answer instead of sending the same request. A claim lapses after `claim_timeout` seconds in
+    case its process died.
+    """
+
+    def __init__(self, path: str = SEARCH_CACHE_DB, maxsize: int = SEARCH_CACHE_SIZE, ttl: float = SEARCH_CACHE_TTL,
+                 claim_timeout: float = SEARCH_TIMEOUT + 5) -> None:
+        self.path = path
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.claim_timeout = claim_timeout
+        with closing(self._connect()) as conn, conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def get(self, query: str):
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            row = conn.execute("SELECT answer FROM results WHERE query = ? AND expires_at > ?", (query, now)).fetchone()
+            if row is not None:
+                conn.execute("UPDATE results SET used_at = ? WHERE query = ?", (now, query))
+        return row[0] if row is not None else None
+
+    def put(self, query: str, answer: str):
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            conn.execute("INSERT OR REPLACE INTO results (query, answer, expires_at, used_at) VALUES (?, ?, ?, ?)",
+                         (query, answer, now + self.ttl, now))
+            conn.execute("DELETE FROM results WHERE expires_at <= ?", (now,))
+            conn.execute("DELETE FROM results WHERE query IN "
+                         "(SELECT query FROM results ORDER BY used_at DESC LIMIT -1 OFFSET ?)", (self.maxsize,))
+
+    def claim(self, query: str) -> bool:
+        """Claim the right to fetch `query`. False while another process holds an unexpired claim."""
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            cursor = conn.execute(
+                "INSERT INTO claims (query, expires_at) VALUES (?, ?) "
+                "ON CONFLICT (query) DO UPDATE SET expires_at = excluded.expires_at WHERE claims.expires_at <= ?",
+                (query, now + self.claim_timeout, now),
+            )
+            return cursor.rowcount == 1
+
+    def release(self, query: str):
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM claims WHERE query = ?", (query,))
+
+    def __len__(self) -> int:
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT count(*) FROM results WHERE expires_at > ?", (time.time(),)).fetchone()[0]
+
+
+class SearchBackend:
+    """Web search backend with a result cache shared across job processes and coalescing of identical
+    queries, both within a process and between processes"""
+
+    def __init__(self, client=None, cache: SearchCache = None) -> None:
+        self._client = client
+        self._cache = cache if cache is not None else SearchCache()
+        self._in_flight = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = TavilyHTTPClient(api_key=os.getenv("TAVILY_API_KEY"))
+        return self._client
+
+    async def search(self, query: str) -> str:
+        """Return the search answer for `query`, served from cache when possible"""
+        key = normalize_query(query)
+        pending = self._in_flight.get(key)
+        if pending is not None:
+            self.coalesced += 1
+            return await asyncio.shield(pending)
+
+        pending = asyncio.ensure_future(self._resolve(key, query))
+        self._in_flight[key] = pending
+        try:
+            return await asyncio.shield(pending)
+        finally:
+            self._in_flight.pop(key, None)
+
+    async def _resolve(self, key: str, query: str) -> str:
+        cached = await asyncio.to_thread(self._cache.get, key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        # Another process may be fetching the same query; wait for its answer rather than repeat it
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._cache.claim_timeout
+        claimed = await asyncio.to_thread(self._cache.claim, key)
+        while not claimed and loop.time() < deadline:
+            await asyncio.sleep(SEARCH_COALESCE_POLL)
+            cached = await asyncio.to_thread(self._cache.get, key)
+            if cached is not None:
+                self.coalesced += 1
+                return cached
+            claimed = await asyncio.to_thread(self._cache.claim, key)
+
+        self.misses += 1
+        try:
+            result = await self._fetch(query)
+            await asyncio.to_thread(self._cache.put, key, result)
+        finally:
+            if claimed:
+                await asyncio.to_thread(self._cache.release, key)
+        return result
+
+    async def _fetch(self, query: str) -> str:
+        response = await self.client.search(query=query, search_depth="basic")
+        if response.get('answer'):
+            return response['answer']
+        return str(response.get('results', 'No results found.'))
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_rate": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+            "cached_entries": len(self._cache),
+            "in_flight": len(self._in_flight),
+        }
+
+    async def aclose(self):
+        if self._client is not None and hasattr(self._client, 'aclose'):
+            await self._client.aclose()
+        self._client = None
+
+
+_search_backend = None
+
+
+def get_search_backend() -> SearchBackend:
+    """Return this process's search backend; its result cache is shared with the other job processes"""
+    global _search_backend
+    if _search_backend is None:
+        _search_backend = SearchBackend()
+    return _search_backend
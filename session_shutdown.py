@@ -0,0 +1,102 @@
+import asyncio
+import logging
+import os
+import time
+
+from metrics import SHUTDOWN_DURATION
+
+logger = logging.getLogger("interviewer.shutdown")
+
+# How long to wait for the closing message to start, and then to finish playing out
+CLOSING_SPEECH_START_TIMEOUT = float(os.getenv("CLOSING_SPEECH_START_TIMEOUT", "5"))
+CLOSING_SPEECH_PLAYOUT_TIMEOUT = float(os.getenv("CLOSING_SPEECH_PLAYOUT_TIMEOUT", "20"))
+SESSION_CLOSE_TIMEOUT = float(os.getenv("SESSION_CLOSE_TIMEOUT", "10"))
+
+
+class SessionShutdown:
+    """Ends a session once the closing message has actually played out.
+
+    `end_interview` calls `request()` just before returning the closing message. The next
+    `speech_created` event is that message; once its playout finishes (or a timeout passes)
+    the flush steps run in order, the AgentSession is closed so the agent can't speak again,
+    and `shutdown_fnc` closes the job (which disconnects the room). The flush steps also run
+    from the job's shutdown callback, so work is flushed however the session ends, and only
+    once. Keep them short: anything slow belongs in a job shutdown callback, which runs after
+    the room has been disconnected.
+    """
+
+    def __init__(self, session, room_name: str, shutdown_fnc) -> None:
+        self.session = session
+        self.room_name = room_name or "unknown"
+        self.shutdown_fnc = shutdown_fnc
+        self.requested_at = None
+        self._steps = []
+        self._closing_speech = None
+        self._flush_task = None
+        self._task = None
+
+    def add_flush_step(self, label: str, step):
+        """Run `step` (an async callable) before the session closes, after the steps added before it"""
+        self._steps.append((label, step))
+
+    def request(self):
+        """Shut down after the next speech (the closing message) has played out"""
+        if self.requested_at is not None:
+            return
+        self.requested_at = time.perf_counter()
+        self._closing_speech = asyncio.get_running_loop().create_future()
+        self.session.on("speech_created", self._on_speech_created)
+        self._task = asyncio.create_task(self._shutdown_after_closing_speech())
+
+    def _on_speech_created(self, ev):
+        if self._closing_speech is not None and not self._closing_speech.done():
+            self._closing_speech.set_result(ev.speech_handle)
+        off = getattr(self.session, "off", None)
+        if off is not None:
+            off("speech_created", self._on_speech_created)
+
+    def _observe(self, stage: str):
+        if self.requested_at is not None:
+            elapsed = time.perf_counter() - self.requested_at
+            SHUTDOWN_DURATION.labels(room=self.room_name, stage=stage).observe(elapsed)
+            logger.info(f"⏹️ Shutdown {stage} {elapsed:.2f}s after end_interview")
+
+    async def _shutdown_after_closing_speech(self):
+        try:
+            speech_handle = await asyncio.wait_for(self._closing_speech, CLOSING_SPEECH_START_TIMEOUT)
+            await asyncio.wait_for(speech_handle.wait_for_playout(), CLOSING_SPEECH_PLAYOUT_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning("⚠️ Closing message playout not confirmed in time, shutting down anyway")
+        self._observe("playout")
+        await self.flush()
+        await self.close_session()
+        self.shutdown_fnc()
+
+    async def close_session(self):
+        """Close the AgentSession right away, so nothing is said or heard after the closing message"""
+        try:
+            await asyncio.wait_for(self.session.aclose(), SESSION_CLOSE_TIMEOUT)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not close the agent session cleanly: {e}")
+        self._observe("session_closed")
+
+    async def flush(self):
+        """Run the flush steps once; concurrent and later callers wait for the same run"""
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._run_steps())
+        await asyncio.shield(self._flush_task)
+
+    async def _run_steps(self):
+        for label, step in self._steps:
+            try:
+                await step()
+            except Exception as e:
+                logger.error(f"❌ Shutdown step '{label}' failed: {e}")
+        self._observe("flushed")
+
+    async def on_job_shutdown(self):
+        """Job shutdown callback: make sure the flush steps have run before the room is closed"""
+        await self.flush()
+
+    def on_room_disconnected(self, *args):
+        self._observe("room_closed")
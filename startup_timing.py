@@ -0,0 +1,51 @@
+import json
+import os
+import time
+from contextlib import contextmanager
+
+STARTUP_REPORT_FILE = os.getenv("STARTUP_REPORT_FILE")
+
+_process_started_at = time.perf_counter()
+_last_mark = _process_started_at
+_marks = []
+
+
+def mark(label: str) -> float:
+    """Record the time spent since the previous mark under `label`"""
+    global _last_mark
+    now = time.perf_counter()
+    elapsed = now - _last_mark
+    _marks.append((label, elapsed))
+    _last_mark = now
+    return elapsed
+
+
+@contextmanager
+def timed(label: str):
+    """Record the time spent in the enclosed block under `label`"""
+    global _last_mark
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        _marks.append((label, time.perf_counter() - started_at))
+        _last_mark = time.perf_counter()
+
+
+def report(title: str = "Startup timing") -> dict:
+    """Print the recorded marks and append them to STARTUP_REPORT_FILE (JSONL) when set"""
+    total = time.perf_counter() - _process_started_at
+    print(f"⏱️ {title} ({total * 1000:.0f} ms since process start):")
+    for label, elapsed in _marks:
+        print(f"  - {label}: {elapsed * 1000:.1f} ms")
+    data = {
+        "title": title,
+        "pid": os.getpid(),
+        "recorded_at": time.time(),
+        "total_ms": total * 1000,
+        "marks_ms": {label: elapsed * 1000 for label, elapsed in _marks},
+    }
+    if STARTUP_REPORT_FILE:
+        with open(STARTUP_REPORT_FILE, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(data) + "\n")
+    return data
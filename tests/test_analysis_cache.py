@@ -0,0 +1,65 @@
+import os
+
+from analysis_cache import FINGERPRINT_FILE, AnalysisCache, analysis_cache_key
+
+
+def set_mtime(cache, key, mtime):
+    os.utime(cache._path(key), (mtime, mtime))
+
+
+def test_key_covers_transcript_jd_model_and_prompt_version():
+    key = analysis_cache_key("Candidate: hi", "Data Scientist", "gemini-2.0-flash", "2")
+    assert key == analysis_cache_key("Candidate: hi", "Data Scientist", "gemini-2.0-flash", "2")
+    assert len(key) == 64
+    variants = {
+        analysis_cache_key("Candidate: hello", "Data Scientist", "gemini-2.0-flash", "2"),
+        analysis_cache_key("Candidate: hi", "ML Engineer", "gemini-2.0-flash", "2"),
+        analysis_cache_key("Candidate: hi", "Data Scientist", "gemini-2.0-flash-lite", "2"),
+        analysis_cache_key("Candidate: hi", "Data Scientist", "gemini-2.0-flash", "3"),
+    }
+    assert key not in variants and len(variants) == 4
+
+
+def test_get_put_round_trip_counts_hits_and_misses(tmp_path):
+    cache = AnalysisCache(str(tmp_path))
+    assert cache.get("missing") is None
+    cache.put("k", {"readiness": "Ready", "technical_skills": ["SQL"]})
+    assert cache.get("k") == {"readiness": "Ready", "technical_skills": ["SQL"]}
+    stats = cache.stats()
+    assert (stats["entries"], stats["hits"], stats["misses"]) == (1, 1, 1)
+
+
+def test_eviction_drops_least_recently_used_entries(tmp_path):
+    cache = AnalysisCache(str(tmp_path), max_entries=3)
+    for index, key in enumerate("abc"):
+        cache.put(key, {"key": key})
+        set_mtime(cache, key, 1000 + index)
+    # Reading "a" makes it the most recently used, so "b" is now the oldest
+    assert cache.get("a") == {"key": "a"}
+    cache.put("d", {"key": "d"})
+    assert cache.get("b") is None
+    assert [cache.get(key) is not None for key in "acd"] == [True, True, True]
+
+
+def test_eviction_respects_the_byte_limit(tmp_path):
+    cache = AnalysisCache(str(tmp_path), max_bytes=250)
+    for index in range(5):
+        cache.put(f"k{index}", {"text": "x" * 80})
+        set_mtime(cache, f"k{index}", 1000 + index)
+    cache.evict()
+    stats = cache.stats()
+    assert stats["bytes"] <= 250
+    assert cache.get("k4") is not None and cache.get("k0") is None
+
+
+def test_prompt_change_invalidates_every_entry(tmp_path, caplog):
+    cache = AnalysisCache(str(tmp_path), prompt_fingerprint="v1")
+    cache.put("k", {"readiness": "Ready"})
+    assert AnalysisCache(str(tmp_path), prompt_fingerprint="v1").get("k") is not None
+
+    with caplog.at_level("INFO", logger="interviewer.analysis_cache"):
+        reopened = AnalysisCache(str(tmp_path), prompt_fingerprint="v2")
+    assert "invalidated 1 cached analyses" in caplog.text
+    assert reopened.get("k") is None
+    with open(tmp_path / FINGERPRINT_FILE, encoding="utf-8") as f:
+        assert f.read() == "v2"
@@ -0,0 +1,86 @@
+import asyncio
+import json
+import time
+import types
+
+import pytest
+
+import analysis_calls
+from analysis_calls import AnalysisFormatError, HostRateLimiter, RateLimiter, generate_analysis, parse_analysis
+
+ANALYSIS = {
+    "candidate_name": "Joe", "interest_level": "High", "readiness": "Ready", "experience_level": "Mid-level",
+    "technical_skills": ["Python"], "soft_skills": ["Communication"], "key_strengths": "Clear",
+    "areas_for_improvement": "Depth", "overall_assessment": "Hire", "notable_quotes": ["I like data"],
+}
+
+
+class CountingLimiter:
+    def __init__(self):
+        self.acquired = 0
+
+    async def acquire(self):
+        self.acquired += 1
+
+
+class FlakyModels:
+    """Stands in for `client.aio.models`: fails the first `failures` requests with a retryable error"""
+
+    def __init__(self, failures: int):
+        self.failures = failures
+        self.requests = 0
+
+    async def generate_content(self, model, contents, config):
+        self.requests += 1
+        if self.requests <= self.failures:
+            raise ConnectionError("transient")
+        return types.SimpleNamespace(text=json.dumps(ANALYSIS))
+
+
+def test_parse_analysis_tolerates_fences_and_rejects_bad_output():
+    assert parse_analysis(f"```json\n{json.dumps(ANALYSIS)}\n```")["readiness"] == "Ready"
+    with pytest.raises(AnalysisFormatError):
+        parse_analysis('{"readiness": "Ready"}')
+    with pytest.raises(AnalysisFormatError):
+        parse_analysis("no json here")
+
+
+def test_rate_limiter_is_acquired_for_every_outgoing_request(monkeypatch):
+    pytest.importorskip("google.genai")
+    monkeypatch.setattr(analysis_calls, "wait_random_exponential", lambda **kwargs: lambda state: 0)
+    models = FlakyModels(failures=2)
+    client = types.SimpleNamespace(aio=types.SimpleNamespace(models=models))
+    limiter = CountingLimiter()
+
+    result = asyncio.run(generate_analysis(client, "prompt", fallback=None, max_attempts=3, rate_limiter=limiter))
+
+    assert result.attempts == 3
+    assert models.requests == 3
+    assert limiter.acquired == 3
+
+
+def test_rate_limiter_spaces_requests():
+    async def run():
+        limiter = RateLimiter(60 * 50)  # one slot every 20ms
+        loop = asyncio.get_running_loop()
+        started_at = loop.time()
+        for _ in range(4):
+            await limiter.acquire()
+        return loop.time() - started_at
+
+    assert asyncio.run(run()) >= 0.055
+    assert RateLimiter(0).interval == 0.0
+
+
+def test_host_rate_limiter_shares_one_schedule_across_processes(tmp_path):
+    # Two limiters over one schedule file stand in for two job processes
+    path = str(tmp_path / "rate")
+    limiters = [HostRateLimiter(60 * 20, path) for _ in range(2)]  # one slot every 50ms
+
+    async def run():
+        started_at = time.monotonic()
+        await asyncio.gather(*(limiter.acquire() for limiter in limiters for _ in range(2)))
+        return time.monotonic() - started_at
+
+    # Four requests drawing on one budget: the last one starts three intervals after the first
+    assert asyncio.run(run()) >= 0.14
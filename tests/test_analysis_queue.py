@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("prometheus_client")
+
+from analysis_queue import AnalysisQueue
+
+
+def test_concurrency_cap_holds_across_queues_sharing_slots(tmp_path):
+    # Two queues over one slots directory stand in for two job processes
+    slots_dir = str(tmp_path / "slots")
+    queues = [AnalysisQueue(concurrency=1, slots_dir=slots_dir) for _ in range(2)]
+    running, peak = [0], [0]
+
+    async def job():
+        running[0] += 1
+        peak[0] = max(peak[0], running[0])
+        await asyncio.sleep(0.05)
+        running[0] -= 1
+
+    async def run():
+        for queue in queues:
+            assert queue.submit("candidate", job)
+            assert queue.submit("candidate", job)
+        return await asyncio.gather(*(queue.wait_idle(timeout=5) for queue in queues))
+
+    assert asyncio.run(run()) == [True, True]
+    assert peak[0] == 1
+    assert sum(queue.completed for queue in queues) == 4
+
+
+def test_full_queue_drops_the_job_without_waiting(tmp_path):
+    queue = AnalysisQueue(concurrency=1, maxsize=1, slots_dir=str(tmp_path / "slots"))
+
+    async def run():
+        release = asyncio.Event()
+
+        async def job():
+            await release.wait()
+
+        assert queue.submit("first", job)
+        await asyncio.sleep(0.01)  # the first job is now running, not queued
+        assert queue.submit("second", job)
+        accepted = queue.submit("third", job)
+        release.set()
+        await queue.wait_idle(timeout=5)
+        return accepted
+
+    assert asyncio.run(run()) is False
+    assert (queue.completed, queue.dropped) == (2, 1)
+    assert queue.stats()["dropped"] == 1
+
+
+def test_failed_job_frees_its_slot(tmp_path):
+    queue = AnalysisQueue(concurrency=1, slots_dir=str(tmp_path / "slots"))
+
+    async def failing():
+        raise RuntimeError("boom")
+
+    async def ok():
+        pass
+
+    async def run():
+        queue.submit("failing", failing)
+        queue.submit("ok", ok)
+        return await queue.wait_idle(timeout=5)
+
+    assert asyncio.run(run()) is True
+    assert (queue.failed, queue.completed) == (1, 1)
@@ -0,0 +1,85 @@
+import pytest
+
+from archive_index import ArchiveIndex, ArchiveQueryError, literal_query
+from interview_record import save_record
+
+TRANSCRIPTS = {
+    "Ada": [
+        {"timestamp": "11:00:01", "role": "assistant", "text": "Tell me about a model you shipped."},
+        {"timestamp": "11:00:09", "role": "user", "text": "I trained a PyTorch model for fraud detection."},
+    ],
+    "Joe": [
+        {"timestamp": "12:00:01", "role": "assistant", "text": "Which tools do you use?"},
+        {"timestamp": "12:00:07", "role": "user", "text": "Mostly SQL and TensorFlow dashboards."},
+    ],
+}
+ANALYSES = {
+    "Ada": {"experience_level": "Senior", "readiness": "Ready", "interest_level": "High",
+            "technical_skills": ["PyTorch", "Python"], "soft_skills": ["Leadership"]},
+    "Joe": {"experience_level": "Junior", "readiness": "Not Ready", "interest_level": "Medium",
+            "technical_skills": ["SQL"], "soft_skills": []},
+}
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = ArchiveIndex(str(tmp_path / "archive.db"))
+    for name, transcript in TRANSCRIPTS.items():
+        path = save_record({"candidate_name": name, "transcript": transcript, "start_time": f"2025-08-16T{name}",
+                            "analysis": {"result": ANALYSES[name]}}, f"interview_{name}_1", str(tmp_path))
+        index.ingest_record(path)
+    return index
+
+
+def names(results):
+    return sorted(result["candidate_name"] for result in results)
+
+
+def test_search_by_analysis_fields_and_skills(index):
+    assert names(index.search(experience_level="senior")) == ["Ada"]
+    assert names(index.search(readiness="Not Ready")) == ["Joe"]
+    assert names(index.search(skill="sql")) == ["Joe"]
+    assert names(index.search()) == ["Ada", "Joe"]
+
+
+def test_full_text_search_returns_snippets(index):
+    results = index.search("pytorch OR tensorflow")
+    assert names(results) == ["Ada", "Joe"]
+    ada = next(result for result in results if result["candidate_name"] == "Ada")
+    assert ada["matches"][0]["role"] == "user"
+    assert "[PyTorch]" in ada["matches"][0]["snippet"]
+    assert names(index.search("dashboards", role="assistant")) == []
+
+
+def test_reingesting_replaces_the_interview(index, tmp_path):
+    path = save_record({"candidate_name": "Ada", "transcript": TRANSCRIPTS["Joe"]}, "interview_Ada_1", str(tmp_path))
+    index.ingest_record(path)
+    assert index.stats()["interviews"] == 2
+    assert names(index.search("pytorch")) == []
+    # Fields that are gone from the record are cleared, not left over from the previous version
+    ada = next(result for result in index.search() if result["candidate_name"] == "Ada")
+    assert ada["analyzed"] == 0
+    assert ada["experience_level"] is None and ada["start_time"] is None
+    assert names(index.search(experience_level="Senior")) == []
+    assert index.skills_for(ada["id"]) == []
+
+
+def test_backfill_logs_unreadable_records(tmp_path, caplog):
+    records = tmp_path / "records"
+    save_record({"candidate_name": "Ada", "transcript": TRANSCRIPTS["Ada"]}, "interview_Ada_1", str(records))
+    (records / "interview_broken_1.json").write_text("{not json", encoding="utf-8")
+    index = ArchiveIndex(str(tmp_path / "archive.db"))
+    with caplog.at_level("ERROR", logger="interviewer.archive"):
+        assert index.backfill(str(records)) == {"records": 1, "failed": 1}
+    assert "interview_broken_1.json" in caplog.text
+
+
+@pytest.mark.parametrize("query, expected", [('"pytorch', ["Ada"]), ("AND", ["Joe"]), ("sql AND", ["Joe"]), ("(fraud", ["Ada"])])
+def test_malformed_fts_queries_fall_back_to_plain_words(index, query, expected):
+    assert names(index.search(query)) == expected
+
+
+def test_queries_without_words_are_rejected(index):
+    with pytest.raises(ArchiveQueryError):
+        index.search('"')
+    assert literal_query('say "hi') == '"say" "hi"'
@@ -0,0 +1,92 @@
+import asyncio
+import json
+import os
+
+import pytest
+
+pytest.importorskip("prometheus_client")
+av = pytest.importorskip("av")
+np = pytest.importorskip("numpy")
+
+from audio_recorder import SAMPLE_RATE, AudioRecorder
+
+FRAME = SAMPLE_RATE // 100
+T0 = 1_750_000_000.0
+
+
+def tone(frame_index):
+    t = (np.arange(FRAME) + frame_index * FRAME) / SAMPLE_RATE
+    return (np.sin(2 * np.pi * 440 * t) * 8000).astype(np.int16).tobytes()
+
+
+def offer_frames(recorder, track, first, count, start_at):
+    # captured_at is when the frame ended, as for frames read off a live track
+    for i in range(count):
+        recorder.offer(track, tone(first + i), start_at + (i + 1) * FRAME / SAMPLE_RATE)
+
+
+def start_without_room(recorder):
+    os.makedirs(recorder.directory, exist_ok=True)
+    recorder.started_at = T0
+    recorder._thread.start()
+
+
+def decoded_seconds(path):
+    with av.open(path) as container:
+        return sum(frame.samples for frame in container.decode(audio=0)) / SAMPLE_RATE
+
+
+def test_synthetic_stream_rolls_over_pads_gaps_and_links_turns(tmp_path):
+    recorder = AudioRecorder("room 1", str(tmp_path), queue_frames=1000, segment_seconds=0.5)
+    start_without_room(recorder)
+    # 0.6s of agent audio: one full 0.5s segment, then a new one
+    offer_frames(recorder, "agent", 0, 60, T0)
+    # Candidate: 0.1s, a 0.2s gap padded with silence, 0.1s more; then a gap too long to pad
+    offer_frames(recorder, "candidate-ada", 0, 10, T0)
+    offer_frames(recorder, "candidate-ada", 10, 10, T0 + 0.3)
+    offer_frames(recorder, "candidate-ada", 20, 10, T0 + 20.0)
+    recorder.turns = [{"timestamp": "10:00:00", "role": "assistant", "at": T0 + 0.25},
+                      {"timestamp": "10:00:01", "role": "user", "at": T0 + 0.55}]
+
+    asyncio.run(recorder.aclose())
+
+    with open(recorder.manifest_path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    segments = {segment["file"]: segment for segment in manifest["segments"]}
+    assert sorted(segments) == ["agent_000.ogg", "agent_001.ogg", "candidate-ada_000.ogg", "candidate-ada_001.ogg"]
+    assert segments["agent_000.ogg"]["duration_s"] == pytest.approx(0.5)
+    assert segments["agent_001.ogg"]["started_at"] == pytest.approx(T0 + 0.5)
+    assert segments["agent_001.ogg"]["duration_s"] == pytest.approx(0.1)
+    assert segments["candidate-ada_000.ogg"]["duration_s"] == pytest.approx(0.4, abs=1e-3)
+    assert segments["candidate-ada_001.ogg"]["started_at"] == pytest.approx(T0 + 20.0)
+    assert manifest["frames"] == {"agent": 60, "candidate-ada": 30}
+    assert manifest["dropped_frames"] == {}
+
+    first, second = manifest["turns"]
+    assert {link["file"]: link["offset_s"] for link in first["audio"]} == {
+        "agent_000.ogg": 0.25, "candidate-ada_000.ogg": 0.25}
+    assert {link["file"]: link["offset_s"] for link in second["audio"]} == {"agent_001.ogg": 0.05}
+
+    # The files hold what the manifest says, silence padding included
+    for name, segment in segments.items():
+        assert decoded_seconds(os.path.join(recorder.directory, name)) == pytest.approx(segment["duration_s"], abs=0.025)
+
+
+def test_manifest_is_written_when_the_encoder_already_stopped(tmp_path):
+    recorder = AudioRecorder("room-2", str(tmp_path), segment_seconds=5)
+    start_without_room(recorder)
+    offer_frames(recorder, "agent", 0, 5, T0)
+    recorder._queue.put(None)
+    recorder._thread.join(5)
+    assert not recorder._thread.is_alive()
+
+    asyncio.run(recorder.aclose())
+
+    with open(recorder.manifest_path, encoding="utf-8") as f:
+        assert [segment["file"] for segment in json.load(f)["segments"]] == ["agent_000.ogg"]
+
+
+def test_close_without_start_writes_nothing(tmp_path):
+    recorder = AudioRecorder("room-3", str(tmp_path))
+    asyncio.run(recorder.aclose())
+    assert not os.path.exists(recorder.manifest_path)
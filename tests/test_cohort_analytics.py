@@ -0,0 +1,111 @@
+import json
+
+import numpy as np
+import pytest
+
+from cohort_analytics import CohortCache
+from interview_record import save_record
+
+
+def analysis(readiness=None, experience=None, interest=None, technical=(), soft=()):
+    return {"result": {"readiness": readiness, "experience_level": experience, "interest_level": interest,
+                       "technical_skills": list(technical), "soft_skills": list(soft)}}
+
+
+def save(directory, name, job="Data Scientist", duration=10.0, start_time="2025-08-01T10:00:00+00:00", result=None):
+    return save_record({"candidate_name": name, "job_description": job, "duration_minutes": duration,
+                        "start_time": start_time, "transcript": [], "analysis": result}, f"interview_{name}", str(directory))
+
+
+@pytest.fixture
+def cohort(tmp_path):
+    save(tmp_path, "Ada", duration=10, result=analysis("Ready", "Senior", "High", ["Python", "SQL"], ["Teamwork"]))
+    save(tmp_path, "Bo", duration=20, result=analysis("Not Ready", "Junior", "Low", ["python", "Spark"]))
+    save(tmp_path, "Cy", job="Data Analyst", duration=30, start_time="2025-09-01T10:00:00+00:00",
+         result=analysis("Ready", None, "High", ["SQL"]))
+    save(tmp_path, "Di", duration=40)
+    cache = CohortCache()
+    cache.update(str(tmp_path))
+    return cache
+
+
+def skills_by_path(cache):
+    skills = cache.categories["skill"].values
+    return {path.rsplit("/", 1)[-1]: sorted(skills[code] for code in cache.skill_codes[start:end])
+            for path, start, end in zip(cache.paths, cache.skill_offsets[:-1], cache.skill_offsets[1:])}
+
+
+def test_append_encodes_levels_and_skills(cohort):
+    assert len(cohort) == 4
+    assert skills_by_path(cohort) == {
+        "interview_Ada.json": ["Python", "SQL", "Teamwork"],
+        "interview_Bo.json": ["Python", "Spark"],
+        "interview_Cy.json": ["SQL"],
+        "interview_Di.json": [],
+    }
+    assert cohort.analyzed.tolist() == [True, True, True, False]
+    assert cohort.experience.tolist() == [2, 0, -1, -1]
+
+
+def test_select_keeps_skill_offsets_aligned(cohort):
+    cohort._select(np.array([True, False, True, True]))
+    assert skills_by_path(cohort) == {
+        "interview_Ada.json": ["Python", "SQL", "Teamwork"],
+        "interview_Cy.json": ["SQL"],
+        "interview_Di.json": [],
+    }
+    assert cohort.skill_offsets.tolist() == [0, 3, 4, 4]
+
+
+def test_aggregates(cohort):
+    mask = cohort.mask(job="data scientist")
+    assert mask.tolist() == [True, True, False, True]
+    assert cohort.skill_frequency(cohort.mask(), top=2) == [("Python", 2), ("SQL", 2)]
+
+    rows, columns, matrix = cohort.crosstab(cohort.mask())
+    assert matrix[rows.index("Ready"), columns.index("Senior")] == 1
+    assert matrix[rows.index("Ready"), columns.index("Unknown")] == 1
+    assert matrix[rows.index("Not Ready"), columns.index("Junior")] == 1
+    assert matrix.sum() == 3
+
+    assert cohort.level_counts(cohort.mask(), "interest") == {"Unknown": 0, "Low": 1, "Medium": 0, "High": 2}
+    assert cohort.duration_percentiles(mask, percentiles=(50,)) == {"p50": 20.0}
+    since = cohort.mask(since=cohort.start_time.max())
+    assert since.tolist() == [False, False, True, False]
+
+
+def test_update_rereads_only_changed_records(tmp_path, cohort):
+    save(tmp_path, "Bo", duration=25, result=analysis("Ready", "Mid-level", "Medium", ["Go"]))
+    (tmp_path / "interview_Di.json").unlink()
+    save(tmp_path, "Eve", duration=5)
+
+    counts = cohort.update(str(tmp_path))
+    assert counts == {"unchanged": 2, "added": 1, "updated": 1, "removed": 1, "failed": 0}
+    assert skills_by_path(cohort)["interview_Bo.json"] == ["Go"]
+    assert sorted(skills_by_path(cohort)) == ["interview_Ada.json", "interview_Bo.json", "interview_Cy.json",
+                                              "interview_Eve.json"]
+
+    cache_file = tmp_path / "cache.npz"
+    cohort.save(str(cache_file))
+    loaded = CohortCache.load(str(cache_file))
+    assert loaded.update(str(tmp_path))["unchanged"] == 4
+    assert loaded.report() == cohort.report()
+
+
+def test_reads_unmigrated_legacy_analyses(tmp_path):
+    (tmp_path / "interview_Joe_20250816_115643_AI_ANALYSIS.json").write_text(json.dumps({
+        "interview_metadata": {"candidate": "Joe", "position": "Data Scientist", "duration_minutes": 4.0},
+        "ai_analysis": {"readiness": "Ready", "experience_level": "Junior", "technical_skills": ["Python"]},
+    }), encoding="utf-8")
+    cache = CohortCache()
+    cache.update(str(tmp_path))
+    report = cache.report()
+    assert report["analyzed"] == 1
+    assert report["skills"] == [("Python", 1)]
+    assert report["duration_minutes"]["p50"] == 4.0
+
+    # Once migrated next to it, only the record is counted
+    save(tmp_path, "Joe_20250816_115643", result=analysis("Ready", "Junior", None, ["Python"]))
+    counts = cache.update(str(tmp_path))
+    assert counts["removed"] == 1 and counts["added"] == 1
+    assert cache.report()["analyzed"] == 1
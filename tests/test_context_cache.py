@@ -0,0 +1,75 @@
+import asyncio
+
+import pytest
+
+from context_cache import CONTEXT_CACHE_MIN_TOKENS, ContextCacheManager, HandleRegistry, LocalContextCache
+
+
+def test_small_prefixes_are_sent_inline():
+    cache = LocalContextCache()
+    assert asyncio.run(cache.get("gemini-2.0-flash", "short prefix", token_count=CONTEXT_CACHE_MIN_TOKENS - 1)) is None
+    assert cache.stats()["created"] == 0
+
+
+def test_prefix_is_registered_once_then_reused_and_renewed():
+    async def run():
+        cache = LocalContextCache(ttl=100, renew_margin=10)
+        first = await cache.get("gemini-2.0-flash", "prefix", token_count=CONTEXT_CACHE_MIN_TOKENS)
+        again = await cache.get("gemini-2.0-flash", "prefix", token_count=CONTEXT_CACHE_MIN_TOKENS)
+        other_model = await cache.get("gemini-2.0-flash-lite", "prefix", token_count=CONTEXT_CACHE_MIN_TOKENS)
+        # Close to expiry: the same handle is renewed rather than registered again
+        for entry in cache._entries.values():
+            entry.expires_at -= 95
+        renewed = await cache.get("gemini-2.0-flash", "prefix", token_count=CONTEXT_CACHE_MIN_TOKENS)
+        return cache, first, again, other_model, renewed
+
+    cache, first, again, other_model, renewed = asyncio.run(run())
+    assert first == again == renewed
+    assert other_model != first
+    assert cache.stats() == {"entries": 2, "created": 2, "renewed": 1, "reused": 1, "uncacheable": 0}
+
+
+def test_abstract_backend_methods_must_be_implemented():
+    with pytest.raises(TypeError):
+        ContextCacheManager()
+
+
+def test_handles_are_shared_across_processes(tmp_path):
+    # Two managers over one registry file stand in for two job processes
+    registry = HandleRegistry(str(tmp_path / "context.db"))
+
+    async def run():
+        first, second = LocalContextCache(registry=registry), LocalContextCache(registry=registry)
+        name = await first.get("gemini-2.0-flash", "prefix", token_count=CONTEXT_CACHE_MIN_TOKENS)
+        return first, second, name, await second.get("gemini-2.0-flash", "prefix", token_count=CONTEXT_CACHE_MIN_TOKENS)
+
+    first, second, name, reused = asyncio.run(run())
+    assert reused == name
+    assert (first.created, second.created, second.reused) == (1, 0, 1)
+
+
+def test_concurrent_registration_deletes_the_duplicate(tmp_path):
+    registry = HandleRegistry(str(tmp_path / "context.db"))
+
+    class SlowCache(LocalContextCache):
+        def __init__(self, suffix, **kwargs):
+            super().__init__(**kwargs)
+            self.suffix = suffix
+
+        async def _create(self, model, prefix):
+            await asyncio.sleep(0.05)
+            name = f"cachedContents/{self.suffix}"
+            self.prefixes[name] = prefix
+            return name
+
+    async def run():
+        caches = [SlowCache("a", registry=registry), SlowCache("b", registry=registry)]
+        names = await asyncio.gather(
+            *(cache.get("gemini-2.0-flash", "prefix", token_count=CONTEXT_CACHE_MIN_TOKENS) for cache in caches)
+        )
+        return caches, names
+
+    caches, names = asyncio.run(run())
+    assert names[0] == names[1]
+    # Only the winning copy is left
+    assert sorted(name for cache in caches for name in cache.prefixes) == [names[0]]
@@ -0,0 +1,71 @@
+import os
+
+import pytest
+
+from faq_index import FaqIndex, split_passages, tokenize
+from interview_catalog import CATALOG_DIR, load_plan
+
+
+@pytest.fixture(scope="module")
+def index():
+    jd = load_plan(os.path.join(CATALOG_DIR, "data_scientist.json")).jd
+    return FaqIndex(split_passages(jd))
+
+
+def test_passages_keep_their_section_heading():
+    passages = split_passages("Requirements:\n- 2+ years of experience in data science\n\nShort line")
+    assert passages == [{"text": "2+ years of experience in data science", "section": "Requirements", "source": "jd"}]
+
+
+def test_tokenize_maps_candidate_phrasing_onto_jd_vocabulary():
+    assert "salary" in tokenize("What's the pay like?")
+    assert "remote" in tokenize("Can I work from home?")
+    assert tokenize("Is there a part-time option?") == ["part", "time", "option"]
+
+
+def test_synonyms_apply_before_stemming():
+    assert tokenize("learning") == tokenize("training") == ["train"]
+    assert tokenize("wages") == ["salary"]
+    # Related but different words are not folded together
+    assert tokenize("office master cloud") == ["office", "master", "cloud"]
+    assert "time" not in tokenize("vacation holiday")
+
+
+@pytest.mark.parametrize("question, expected", [
+    ("What is the salary range?", "$95,000"),
+    ("Can I work remotely?", "remote options"),
+    ("Is remote work possible?", "remote options"),
+    ("What benefits do you offer, like health insurance?", "401(k)"),
+    ("Would you consider part-time?", "Part-time"),
+    ("Do I need experience with SQL?", "SQL"),
+    ("Is there learning support?", "ongoing training"),
+    ("Do I need a master's degree?", "Master's degree"),
+    ("Which cloud platforms do you use?", "AWS, GCP, Azure"),
+    ("How much vacation do I get?", "paid time off"),
+])
+def test_role_questions_are_answered_locally(index, question, expected):
+    answer, confidence = index.answer(question)
+    assert answer is not None and expected in answer
+    assert confidence >= 0.5
+
+
+@pytest.mark.parametrize("question", [
+    "Who won the football world cup in 2018?",
+    "Do you sponsor visas?",
+    "Is the salary negotiable for senior people?",
+    "Do I have to come into the office?",
+])
+def test_questions_the_jd_does_not_cover_fall_below_the_threshold(index, question):
+    answer, confidence = index.answer(question)
+    assert answer is None
+    assert confidence < 0.5
+
+
+def test_threshold_controls_hits_and_hit_rate(index):
+    fresh = FaqIndex(index.passages)
+    question = "Would you consider part-time?"
+    _, confidence = fresh.answer(question)
+    assert 0.5 < confidence < 1.0
+    assert fresh.answer(question, threshold=confidence + 0.01)[0] is None
+    assert fresh.answer(question, threshold=confidence)[0] is not None
+    assert (fresh.lookups, fresh.hits, fresh.hit_rate) == (3, 2, 2 / 3)
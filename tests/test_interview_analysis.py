@@ -0,0 +1,54 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("prometheus_client")
+
+import interview_analysis
+from analysis_cache import AnalysisCache
+from analysis_calls import ANALYSIS_FALLBACK_MODEL, AnalysisCallResult
+from interview_record import read_record, save_record
+
+TRANSCRIPT = [
+    {"timestamp": "11:00:01", "role": "assistant", "text": "Tell me about your last project."},
+    {"timestamp": "11:00:09", "role": "user", "text": "I built a demand forecasting model in Python."},
+]
+ANALYSIS = {"candidate_name": "Ada", "readiness": "Ready", "technical_skills": ["Python"]}
+
+
+@pytest.fixture
+def calls(monkeypatch, tmp_path):
+    calls = []
+
+    async def generate_analysis(client, prompt, **kwargs):
+        calls.append(prompt)
+        # The primary was slow and the hedged fallback model answered
+        return AnalysisCallResult(dict(ANALYSIS), ANALYSIS_FALLBACK_MODEL, attempts=1, hedged=True, elapsed=0.1)
+
+    monkeypatch.setattr(interview_analysis, "generate_analysis", generate_analysis)
+    monkeypatch.setattr(interview_analysis, "get_genai_client", lambda: object())
+    monkeypatch.setattr(interview_analysis, "_context_cache", None)
+    monkeypatch.setattr(interview_analysis, "_analysis_cache", AnalysisCache(str(tmp_path / "cache")))
+    monkeypatch.setattr(interview_analysis, "get_archive_index", lambda: SimpleNamespace(ingest_record=lambda path: None))
+    return calls
+
+
+def analyze(record_file):
+    return asyncio.run(interview_analysis.analyze_transcript(
+        TRANSCRIPT, jd="Data Scientist", candidate_name="Ada", record_file=record_file,
+    ))
+
+
+def test_cached_analysis_keeps_the_model_that_answered(calls, tmp_path):
+    first = save_record({"candidate_name": "Ada", "transcript": TRANSCRIPT}, "interview_Ada_1", str(tmp_path))
+    second = save_record({"candidate_name": "Ada", "transcript": TRANSCRIPT}, "interview_Ada_2", str(tmp_path))
+
+    analyze(first)
+    analyze(second)
+
+    assert len(calls) == 1
+    fresh, cached = read_record(first)["analysis"], read_record(second)["analysis"]
+    assert fresh["model"] == ANALYSIS_FALLBACK_MODEL and fresh["hedged"] is True
+    assert cached["model"] == ANALYSIS_FALLBACK_MODEL and cached["cached"] is True
+    assert cached["result"] == fresh["result"] == ANALYSIS
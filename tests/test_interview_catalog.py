@@ -0,0 +1,103 @@
+import json
+import re
+
+import pytest
+
+import interview_catalog
+from interview_catalog import CATALOG_DIR, Catalog, CatalogError, compile_plan, role_from_metadata
+
+ENTRY = {
+    "title": "Data Engineer",
+    "job_description": ["Builds pipelines.", "Owns the warehouse."],
+    "greeting": "Welcome!",
+    "questions": [" Tell me about a pipeline you built. ", "How do you test SQL?"],
+}
+
+
+def write_entry(directory, role, entry):
+    path = directory / f"{role}.json"
+    path.write_text(entry if isinstance(entry, str) else json.dumps(entry), encoding="utf-8")
+    return path
+
+
+def test_compile_plan_joins_lines_and_strips_questions():
+    plan = compile_plan("data_engineer", ENTRY)
+    assert plan.jd == "Builds pipelines.\nOwns the warehouse."
+    assert plan.questions == ("Tell me about a pipeline you built.", "How do you test SQL?")
+    assert plan.follow_up == interview_catalog.DEFAULT_FOLLOW_UP
+    assert "2 planned questions" in plan.opening_instructions
+
+
+@pytest.mark.parametrize("change, error", [
+    ({"questions": None}, "'questions' must be a list"),
+    ({"questions": []}, "'questions' must be a list"),
+    ({"questions": ["ok", "  "]}, "every question must be a non-empty string"),
+    ({"questions": ["?"] * (interview_catalog.MAX_QUESTIONS + 1)}, "'questions' must be a list"),
+    ({"greeting": ""}, "'greeting' must be a non-empty string"),
+    ({"title": 3}, "'title' must be a non-empty string"),
+    ({"follow_up": ["fine", 2]}, "'follow_up' must be a non-empty string"),
+    ({"salary": "100k"}, "unknown field(s) salary"),
+])
+def test_compile_plan_rejects_invalid_entries(change, error):
+    with pytest.raises(CatalogError, match=re.escape(error)):
+        compile_plan("data_engineer", {**ENTRY, **change})
+
+
+def test_compile_plan_reports_missing_fields():
+    entry = {key: value for key, value in ENTRY.items() if key not in ("title", "greeting")}
+    with pytest.raises(CatalogError, match="missing title, greeting"):
+        compile_plan("data_engineer", entry)
+    with pytest.raises(CatalogError, match="expected a JSON object"):
+        compile_plan("data_engineer", [ENTRY])
+
+
+def test_shipped_catalog_is_valid():
+    catalog = Catalog(CATALOG_DIR).load()
+    assert not catalog.errors
+    assert interview_catalog.DEFAULT_ROLE in catalog.plans
+
+
+def test_bad_edit_keeps_the_previous_plan(tmp_path):
+    write_entry(tmp_path, "data_engineer", ENTRY)
+    catalog = Catalog(str(tmp_path)).load()
+    previous = catalog.plans["data_engineer"]
+
+    write_entry(tmp_path, "data_engineer", "{not json")
+    write_entry(tmp_path, "analyst", {**ENTRY, "questions": []})
+    catalog.load()
+
+    assert catalog.plans == {"data_engineer": previous}
+    assert "invalid JSON" in catalog.errors["data_engineer"]
+    assert "'questions'" in catalog.errors["analyst"]
+
+
+def test_catalog_without_valid_plans_fails(tmp_path):
+    write_entry(tmp_path, "analyst", {**ENTRY, "questions": []})
+    with pytest.raises(CatalogError, match="No valid interview plans"):
+        Catalog(str(tmp_path)).load()
+
+
+@pytest.mark.parametrize("metadata, role", [
+    ('{"role": "analyst"}', "analyst"),
+    ('{"job": " analyst "}', "analyst"),
+    ('{"role": "", "jd": "analyst"}', "analyst"),
+    ('"analyst"', "analyst"),
+    ("analyst", "analyst"),
+    ('{"candidate": "Ada"}', None),
+    ("42", None),
+    ("  ", None),
+    (None, None),
+])
+def test_role_from_metadata(metadata, role):
+    assert role_from_metadata(metadata) == role
+
+
+def test_plan_for_uses_the_first_known_role_then_the_default(tmp_path, monkeypatch):
+    monkeypatch.setattr(interview_catalog, "DEFAULT_ROLE", "data_engineer")
+    write_entry(tmp_path, "data_engineer", ENTRY)
+    write_entry(tmp_path, "analyst", {**ENTRY, "title": "Analyst"})
+    catalog = Catalog(str(tmp_path)).load()
+
+    assert catalog.plan_for('{"role": "unknown"}', "analyst").title == "Analyst"
+    assert catalog.plan_for("", '{"role": "unknown"}').role == "data_engineer"
+    assert catalog.plan_for().role == "data_engineer"
@@ -0,0 +1,106 @@
+import json
+import os
+import shutil
+
+import pytest
+
+from interview_record import (attach_analysis, find_records, find_unmigrated, migrate_legacy, new_record, read_record,
+                              record_path, save_record, write_record)
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE_TRANSCRIPT = "interview_Candidate_20250816_115640_transcript.json"
+SAMPLE_ANALYSIS = "interview_Joe_20250816_115643_AI_ANALYSIS.json"
+
+
+def write_json(path, data):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+
+
+def test_find_records_skips_legacy_files(tmp_path):
+    canonical = save_record({"candidate_name": "Joe", "transcript": []}, "interview_Joe_20250816_115643", str(tmp_path))
+    write_json(tmp_path / "interview_Joe_20250816_115643_transcript.json", {"candidate_name": "Joe"})
+    write_json(tmp_path / "interview_Joe_20250816_115643_AI_ANALYSIS.json", {"ai_analysis": {}})
+    assert find_records(str(tmp_path)) == [canonical]
+
+
+def test_attach_analysis_refuses_to_rewrite_legacy_files(tmp_path):
+    legacy = tmp_path / "interview_Joe_20250816_115643_transcript.json"
+    original = {"candidate_name": "Joe", "transcript": [{"role": "user", "text": "hi"}]}
+    write_json(legacy, original)
+    with pytest.raises(ValueError):
+        attach_analysis(str(legacy), {"result": {}})
+    with open(legacy, encoding='utf-8') as f:
+        assert json.load(f) == original
+
+
+def test_attach_analysis_updates_canonical_record(tmp_path):
+    path = save_record({"candidate_name": "Joe", "transcript": []}, "interview_Joe_1", str(tmp_path))
+    attach_analysis(path, {"result": {"readiness": "Ready"}, "model": "gemini-2.0-flash"})
+    analysis = read_record(path)["analysis"]
+    assert analysis["result"] == {"readiness": "Ready"}
+    assert "analyzed_at" in analysis
+
+
+def test_migrate_merges_legacy_transcript_and_analysis(tmp_path):
+    transcript = [{"timestamp": "11:56:43", "role": "user", "text": "I work with Python."}]
+    write_json(tmp_path / "interview_Joe_20250816_115643_transcript.json", {
+        "candidate_name": "Joe", "job_description": "Data Scientist", "duration_minutes": 3.5,
+        "interview_status": "completed", "transcript": transcript,
+    })
+    write_json(tmp_path / "interview_Joe_20250816_115643_AI_ANALYSIS.json", {
+        "interview_metadata": {"candidate": "Joe", "position": "Data Scientist",
+                               "transcript_file": "interview_Joe_20250816_115643_transcript.json"},
+        "ai_analysis": {"readiness": "Ready"},
+        "token_counts": {"prompt_tokens_after": 900},
+    })
+    write_json(tmp_path / "interview_Ann_20250816_120000_transcript.json", {"candidate_name": "Ann", "transcript": []})
+
+    output_dir = tmp_path / "records"
+    assert migrate_legacy(str(tmp_path), str(output_dir)) == {"records": 2, "unmatched": []}
+
+    records = {read_record(path)["interview_id"]: read_record(path) for path in find_records(str(output_dir))}
+    assert sorted(records) == ["interview_Ann_20250816_120000", "interview_Joe_20250816_115643"]
+    joe = records["interview_Joe_20250816_115643"]
+    assert joe["record_version"] == 1
+    assert joe["transcript"] == transcript
+    assert joe["duration_minutes"] == 3.5
+    assert joe["analysis"] == {"result": {"readiness": "Ready"}, "token_counts": {"prompt_tokens_after": 900}}
+    assert records["interview_Ann_20250816_120000"]["analysis"] is None
+    # The legacy files are left in place
+    assert len(list(tmp_path.glob("*_transcript.json"))) == 2
+
+
+def test_gzip_records_round_trip(tmp_path):
+    path = record_path("interview_Joe_1", str(tmp_path), compression="gzip")
+    write_record(new_record({"candidate_name": "Joe", "transcript": [{"role": "user", "text": "hi"}]}, "interview_Joe_1"), path)
+    assert path.endswith(".json.gz")
+    assert read_record(path)["transcript"] == [{"role": "user", "text": "hi"}]
+    assert find_records(str(tmp_path)) == [path]
+
+
+def test_migrate_pairs_the_shipped_samples_by_start_time(tmp_path):
+    # The sample transcript and analysis were named after different candidates and timestamps
+    for name in (SAMPLE_TRANSCRIPT, SAMPLE_ANALYSIS):
+        shutil.copy(os.path.join(REPO_DIR, name), tmp_path / name)
+    assert find_unmigrated(str(tmp_path)) == [str(tmp_path / SAMPLE_TRANSCRIPT), str(tmp_path / SAMPLE_ANALYSIS)]
+
+    assert migrate_legacy(str(tmp_path), str(tmp_path)) == {"records": 1, "unmatched": []}
+    [path] = find_records(str(tmp_path))
+    record = read_record(path)
+    assert record["interview_id"] == "interview_Candidate_20250816_115640"
+    assert len(record["transcript"]) == 20
+    assert record["analysis"]["result"]["candidate_name"] == "Joe"
+    assert find_unmigrated(str(tmp_path)) == []
+
+
+def test_migrate_reports_analyses_without_a_transcript(tmp_path):
+    write_json(tmp_path / "interview_Joe_20250816_115643_AI_ANALYSIS.json", {
+        "interview_metadata": {"candidate": "Joe"}, "ai_analysis": {"readiness": "Ready"},
+        "agent_summary": {"start_time": "2025-08-16T10:52:38+00:00"},
+    })
+    write_json(tmp_path / "interview_Ann_20250816_120000_transcript.json",
+               {"candidate_name": "Ann", "start_time": "2025-08-16T11:00:00+00:00", "transcript": []})
+
+    result = migrate_legacy(str(tmp_path), str(tmp_path / "records"))
+    assert result == {"records": 2, "unmatched": ["interview_Joe_20250816_115643_AI_ANALYSIS.json"]}
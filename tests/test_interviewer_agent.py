@@ -0,0 +1,97 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("livekit.agents")
+
+import InterviewerAgent
+from benchmarks.fakes import FakeSession
+
+
+class SessionAgent(InterviewerAgent.InterviewAgent):
+    """InterviewAgent bound to a FakeSession instead of a running AgentSession"""
+
+    def __init__(self, fake_session, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self._fake_session = fake_session
+
+    @property
+    def session(self):
+        return self._fake_session
+
+
+class CountingQueue:
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, name, job_factory):
+        self.submitted.append(name)
+        return True
+
+
+@pytest.fixture
+def saved(monkeypatch):
+    saved = []
+
+    def save_record(summary, interview_id):
+        saved.append(interview_id)
+        return f"interviews/{interview_id}.json"
+
+    monkeypatch.setattr(InterviewerAgent, "save_record", save_record)
+    monkeypatch.setattr(InterviewerAgent, "get_archive_index", lambda: SimpleNamespace(ingest_record=lambda path: None))
+    return saved
+
+
+def test_end_interview_saves_and_queues_analysis_once(monkeypatch, saved):
+    queue = CountingQueue()
+    monkeypatch.setattr(InterviewerAgent, "get_analysis_queue", lambda: queue)
+    session = FakeSession()
+    session._conversation_transcript.add("user", "I build models.", "11:00:00")
+    agent = SessionAgent(session, name="Ada Lovelace", jd="Data Scientist")
+
+    async def run():
+        await agent.on_enter()
+        return await agent.end_interview(), await agent.end_interview()
+
+    first, second = asyncio.run(run())
+    assert first == second
+    assert saved == [agent.interview_id]
+    assert agent.interview_id.startswith("interview_Ada_Lovelace_")
+    assert queue.submitted == ["Ada Lovelace"]
+
+
+def test_every_save_in_a_session_targets_the_same_record(saved):
+    agent = SessionAgent(FakeSession(), name="Joe", jd="Data Scientist")
+
+    async def run():
+        await agent.on_enter()
+        await agent._write_interview_data()
+        await agent._write_interview_data()
+
+    asyncio.run(run())
+    assert len(saved) == 2 and saved[0] == saved[1] == agent.interview_id
+    assert agent.interview_summary["interview_id"] == agent.interview_id
+
+
+def test_queued_analysis_reads_the_transcript_frozen_at_save(monkeypatch, saved):
+    analyzed = []
+
+    async def analyze_transcript(conversation_data, **kwargs):
+        analyzed.append([turn['text'] for turn in conversation_data])
+
+    monkeypatch.setattr(InterviewerAgent, "analyze_transcript", analyze_transcript)
+    session = FakeSession()
+    store = session._conversation_transcript
+    store.add("user", "I build models.", "11:00:00")
+    agent = SessionAgent(session, name="Ada", jd="Data Scientist")
+
+    async def run():
+        await agent._write_interview_data()
+        # The closing message lands in the store after the record was saved
+        store.add("assistant", "Thank you for your time.", "11:05:00")
+        await agent.analyze_interview_with_ai(session)
+
+    asyncio.run(run())
+    assert analyzed == [["I build models."]]
+    assert len(agent.interview_summary["transcript"]) == 1
@@ -0,0 +1,67 @@
+import logging
+
+import pytest
+
+import log_pipeline
+
+
+class Collect(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+@pytest.fixture
+def root(monkeypatch):
+    root = logging.getLogger()
+    saved_handlers, saved_level = list(root.handlers), root.level
+    monkeypatch.setattr(log_pipeline, "_listener", None)
+    monkeypatch.setattr(log_pipeline, "_queue_handler", None)
+    monkeypatch.setattr(log_pipeline, "_room_handler", None)
+    yield root
+    log_pipeline.stop_logging()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    for handler in saved_handlers:
+        root.addHandler(handler)
+    root.setLevel(saved_level)
+
+
+def clear(root):
+    # pytest attaches its capture handlers just before the test body runs
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+
+
+def test_existing_root_handler_keeps_receiving_records(root, tmp_path):
+    clear(root)
+    forwarder = Collect()
+    root.addHandler(forwarder)
+
+    log_pipeline.setup_logging(mode="development", level="INFO", fmt="console", log_dir=str(tmp_path))
+    log_pipeline.set_log_room("room-1")
+    logging.getLogger("interviewer.test").info("hello %s", "there")
+    log_pipeline.close_room_log("room-1")
+    log_pipeline.stop_logging()
+
+    assert root.handlers == [log_pipeline._queue_handler]
+    assert [record.getMessage() for record in forwarder.records] == ["hello there"]
+    assert forwarder.records[0].room == "room-1"
+    assert (tmp_path / "room-1.jsonl").read_text().count("hello there") == 1
+
+
+def test_console_handler_added_only_without_existing_handlers(root):
+    clear(root)
+    log_pipeline.setup_logging(log_dir="")
+    handlers = log_pipeline._listener.handlers
+    assert len(handlers) == 1 and isinstance(handlers[0], logging.StreamHandler)
+
+
+def test_records_are_formatted_on_the_listener_thread(root):
+    log_pipeline.setup_logging(log_dir="")
+    record = logging.LogRecord("interviewer.test", logging.INFO, "", 0, "%s turns", (3,), None)
+    assert log_pipeline._queue_handler.prepare(record) is record
+    assert record.args == (3,)
@@ -0,0 +1,39 @@
+import asyncio
+import json
+
+import reanalyze
+from interview_record import migrate_legacy
+
+
+def write_legacy_transcript(directory):
+    path = directory / "interview_Joe_20250816_115643_transcript.json"
+    path.write_text(json.dumps({
+        "candidate_name": "Joe", "job_description": "Data Scientist",
+        "transcript": [{"role": "user", "text": "I work with Python."}],
+    }), encoding="utf-8")
+    return path
+
+
+def test_legacy_transcripts_are_reported_until_migrated(tmp_path, monkeypatch, capsys):
+    analyzed = []
+
+    async def analyze_transcript(transcript, **kwargs):
+        analyzed.append(kwargs["record_file"])
+        return {"readiness": "Ready"}
+
+    monkeypatch.setattr(reanalyze, "analyze_transcript", analyze_transcript)
+    legacy = write_legacy_transcript(tmp_path)
+
+    summary = asyncio.run(reanalyze.run_batch(str(tmp_path), concurrency=1, requests_per_minute=0))
+    assert summary["pending"] == 0
+    assert summary["legacy"] == 1
+    assert "interview_record.py migrate" in capsys.readouterr().out
+    assert analyzed == []
+
+    migrate_legacy(str(tmp_path), str(tmp_path))
+    summary = asyncio.run(reanalyze.run_batch(str(tmp_path), concurrency=1, requests_per_minute=0))
+    assert summary["legacy"] == 0
+    assert summary["analyzed"] == 1
+    assert analyzed == [str(tmp_path / "interview_Joe_20250816_115643.json")]
+    # The legacy transcript itself is never rewritten
+    assert "analysis" not in json.loads(legacy.read_text(encoding="utf-8"))
@@ -0,0 +1,55 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("prometheus_client")
+
+import rolling_analysis
+from analysis_calls import ANALYSIS_MODEL, AnalysisCallResult, RateLimiter
+from rolling_analysis import RollingAnalyzer
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    calls = []
+
+    async def generate_analysis(client, prompt, **kwargs):
+        calls.append(prompt)
+        # Every update needed a retry; the last one was answered by the hedged fallback
+        return AnalysisCallResult({"technical_skills": [f"skill {len(calls)}"]}, ANALYSIS_MODEL, attempts=2,
+                                  hedged=len(calls) == 3, elapsed=0.1)
+
+    monkeypatch.setattr(rolling_analysis, "generate_analysis", generate_analysis)
+    monkeypatch.setattr(rolling_analysis, "get_genai_client", lambda: object())
+    monkeypatch.setattr(rolling_analysis, "get_context_cache", lambda: None)
+    monkeypatch.setattr(rolling_analysis, "_rate_limiter", RateLimiter(0))
+    return calls
+
+
+def test_rate_limiter_is_built_on_first_use(monkeypatch):
+    monkeypatch.setattr(rolling_analysis, "_rate_limiter", None)
+    limiter = rolling_analysis.get_rate_limiter()
+    assert limiter is rolling_analysis.get_rate_limiter()
+    assert limiter.interval == 60.0 / rolling_analysis.ROLLING_ANALYSIS_RPM
+
+
+def test_finalize_reports_updates_and_attempts_separately(calls):
+    async def run():
+        analyzer = RollingAnalyzer("Data Scientist", "Ada", "room-1", every=1, min_interval=0, live_dir="")
+        analyzer.observe_turn({"role": "user", "text": "I use Python every day."})
+        await analyzer._task
+        analyzer.observe_turn({"role": "user", "text": "And SQL for reporting."})
+        await analyzer._task
+        # Left for the merge call at finalize
+        analyzer.every = 10
+        analyzer.observe_turn({"role": "user", "text": "I also know Spark."})
+        return await analyzer.finalize()
+
+    state, call_info, token_counts = asyncio.run(run())
+
+    assert len(calls) == 3
+    assert call_info["merge"] == "call"
+    assert call_info["updates"] == token_counts["rolling_updates"] == 3
+    assert call_info["attempts"] == 6
+    assert call_info["hedged"] is True
+    assert state["technical_skills"] == ["skill 1", "skill 2", "skill 3"]
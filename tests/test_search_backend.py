@@ -0,0 +1,98 @@
+import asyncio
+import time
+
+import pytest
+
+pytest.importorskip("httpx")
+
+from search_backend import SearchBackend, SearchCache, normalize_query
+
+
+class FakeClient:
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.queries = []
+
+    async def search(self, query, search_depth="basic"):
+        self.queries.append(query)
+        await asyncio.sleep(self.latency)
+        return {"answer": f"answer to {query}"}
+
+
+def test_normalize_query():
+    assert normalize_query("  Is the role REMOTE?? ") == normalize_query("is the role remote") == "is the role remote"
+
+
+def test_entries_expire_after_ttl(tmp_path):
+    cache = SearchCache(str(tmp_path / "search.db"), ttl=0.2)
+    cache.put("salary", "100k")
+    assert cache.get("salary") == "100k"
+    time.sleep(0.3)
+    assert cache.get("salary") is None
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = SearchCache(str(tmp_path / "search.db"), maxsize=2)
+    cache.put("a", "1")
+    cache.put("b", "2")
+    cache.get("a")
+    cache.put("c", "3")
+    assert (cache.get("a"), cache.get("b"), cache.get("c")) == ("1", None, "3")
+
+
+def test_claims_are_exclusive_until_released_or_expired(tmp_path):
+    cache = SearchCache(str(tmp_path / "search.db"), claim_timeout=0.2)
+    assert cache.claim("salary")
+    assert not cache.claim("salary")
+    cache.release("salary")
+    assert cache.claim("salary")
+    time.sleep(0.3)
+    assert cache.claim("salary")
+
+
+def test_expired_answer_is_fetched_again(tmp_path):
+    client = FakeClient()
+    backend = SearchBackend(client=client, cache=SearchCache(str(tmp_path / "search.db"), ttl=0.2))
+
+    async def run():
+        await backend.search("salary range")
+        await backend.search("Salary range?")
+        await asyncio.sleep(0.3)
+        await backend.search("salary range")
+
+    asyncio.run(run())
+    assert len(client.queries) == 2
+    assert (backend.hits, backend.misses) == (1, 2)
+
+
+def test_concurrent_identical_queries_share_one_request(tmp_path):
+    client = FakeClient(latency=0.1)
+    backend = SearchBackend(client=client, cache=SearchCache(str(tmp_path / "search.db")))
+
+    async def run():
+        return await asyncio.gather(*(backend.search("Is the role remote?") for _ in range(5)))
+
+    results = asyncio.run(run())
+    assert len(client.queries) == 1
+    assert set(results) == {"answer to Is the role remote?"}
+    assert (backend.misses, backend.coalesced) == (1, 4)
+
+
+def test_processes_share_cached_answers_and_in_flight_fetches(tmp_path):
+    # Two backends over one database file stand in for two job processes
+    path = str(tmp_path / "search.db")
+    first_client, second_client = FakeClient(latency=0.2), FakeClient()
+    first = SearchBackend(client=first_client, cache=SearchCache(path))
+    second = SearchBackend(client=second_client, cache=SearchCache(path))
+
+    async def run():
+        fetching = asyncio.create_task(first.search("salary range"))
+        await asyncio.sleep(0.05)
+        waited = await second.search("salary range")
+        return await fetching, waited, await second.search("salary range")
+
+    fetched, waited, cached = asyncio.run(run())
+    assert fetched == waited == cached == "answer to salary range"
+    assert len(first_client.queries) == 1 and second_client.queries == []
+    assert (second.coalesced, second.hits) == (1, 1)
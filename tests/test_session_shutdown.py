@@ -0,0 +1,76 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("prometheus_client")
+
+import session_shutdown
+from session_shutdown import SessionShutdown
+
+
+class Session:
+    def __init__(self, events):
+        self.events = events
+        self.handlers = {}
+
+    def on(self, event, callback):
+        self.handlers.setdefault(event, []).append(callback)
+
+    def off(self, event, callback):
+        self.handlers[event].remove(callback)
+
+    def emit(self, event, payload):
+        for handler in list(self.handlers.get(event, [])):
+            handler(payload)
+
+    async def aclose(self):
+        self.events.append("session closed")
+
+
+class SpeechHandle:
+    def __init__(self, events):
+        self.events = events
+        self.played = asyncio.Event()
+
+    async def wait_for_playout(self):
+        await self.played.wait()
+        self.events.append("playout")
+
+
+def test_session_closes_after_playout_and_flush_before_job_shutdown():
+    events = []
+
+    async def run():
+        session = Session(events)
+        shutdown = SessionShutdown(session, "room", lambda: events.append("job shutdown"))
+
+        async def flush_journal():
+            events.append("journal flushed")
+
+        shutdown.add_flush_step("transcript journal", flush_journal)
+        shutdown.request()
+        handle = SpeechHandle(events)
+        session.emit("speech_created", SimpleNamespace(speech_handle=handle))
+        await asyncio.sleep(0.01)
+        assert events == []
+        handle.played.set()
+        await shutdown._task
+        # The job shutdown callback doesn't run the steps a second time
+        await shutdown.on_job_shutdown()
+
+    asyncio.run(run())
+    assert events == ["playout", "journal flushed", "session closed", "job shutdown"]
+
+
+def test_shutdown_goes_ahead_when_the_closing_message_never_starts(monkeypatch):
+    monkeypatch.setattr(session_shutdown, "CLOSING_SPEECH_START_TIMEOUT", 0.01)
+    events = []
+
+    async def run():
+        shutdown = SessionShutdown(Session(events), "room", lambda: events.append("job shutdown"))
+        shutdown.request()
+        await shutdown._task
+
+    asyncio.run(run())
+    assert events == ["session closed", "job shutdown"]
@@ -0,0 +1,61 @@
+from transcript_compaction import compact_transcript, count_tokens, merge_turns, truncate_to_tokens
+
+
+def conversation(turns: int):
+    entries = []
+    for index in range(turns):
+        if index % 2:
+            text = (f"Answer {index}. I built a churn model with gradient boosting and validated it on holdout data "
+                    f"from the last quarter, then we shipped it behind a feature flag and monitored drift weekly.")
+            entries.append({"role": "user", "text": text})
+        else:
+            entries.append({"role": "assistant", "text": f"Question {index}. Tell me about a project you led?"})
+    return entries
+
+
+def test_fragments_are_merged_and_filler_dropped():
+    turns = merge_turns([
+        {"role": "assistant", "text": "Hello there."},
+        {"role": "user", "text": "Um, I I worked on"},
+        {"role": "user", "text": "you know, fraud models."},
+    ])
+    assert turns == [("Interviewer", "Hello there."), ("Candidate", "I worked on fraud models.")]
+
+
+def test_under_budget_transcript_is_only_merged():
+    result = compact_transcript(conversation(6), budget=10_000)
+    assert result["summary_levels"] == 0
+    assert result["summarized_turns"] == 0
+    assert result["turns_after"] == 6
+    assert "Answer 5." in result["text"]
+
+
+def test_long_transcript_fits_budget_and_keeps_recent_turns_verbatim():
+    data = conversation(200)
+    result = compact_transcript(data, budget=2000)
+    assert result["tokens_before"] > 2000
+    assert result["tokens_after"] <= 2000
+    assert result["summarized_turns"] + result["turns_after"] == 200
+    assert data[-1]["text"] in result["text"]
+    assert result["text"].startswith("[Summary of earlier conversation]")
+
+
+def test_merged_levels_produce_one_summary_per_merged_chunk():
+    loose = compact_transcript(conversation(400), budget=12_000)
+    tight = compact_transcript(conversation(400), budget=3000)
+    summary_lines = lambda result: [line for line in result["text"].split("\n") if line.startswith("- ")]
+    assert tight["summary_levels"] > loose["summary_levels"] >= 1
+    # Each level merges pairs of chunks into a single summary line
+    assert len(summary_lines(tight)) < len(summary_lines(loose))
+    assert len(summary_lines(tight)) <= -(-tight["summarized_turns"] // (8 * 2 ** (tight["summary_levels"] - 1)))
+    assert tight["tokens_after"] <= 3000
+
+
+def test_truncate_to_tokens_keeps_the_tail():
+    text = " ".join(f"word{i}" for i in range(200))
+    tail = truncate_to_tokens(text, 10)
+    assert text.endswith(tail)
+    assert 0 < count_tokens(tail) <= 12
+    assert truncate_to_tokens(text, 0) == ""
+    assert truncate_to_tokens(text, -5) == ""
+    assert truncate_to_tokens("short", 100) == "short"
@@ -0,0 +1,106 @@
+import asyncio
+import json
+import os
+import time
+
+from interview_record import read_record
+from transcript_journal import TranscriptJournal, read_journal, recover_journal
+
+HEADER = {"candidate_name": "Ada Lovelace", "job_description": "Data Scientist",
+          "start_time": "2025-08-16T11:00:00+00:00"}
+
+
+def write_journal(path, *records):
+    with open(path, 'w', encoding='utf-8') as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+
+
+def age(path, seconds):
+    then = time.time() - seconds
+    os.utime(path, (then, then))
+
+
+def test_writer_batches_turns_and_close_writes_end_marker(tmp_path):
+    async def run():
+        journal = TranscriptJournal("room/1", HEADER, directory=str(tmp_path), flush_interval=0.01, journal_id="AJ_1")
+        journal.append({"timestamp": "11:00:01", "role": "assistant", "text": "Hello", "speaker_id": None})
+        journal.append({"timestamp": "11:00:05", "role": "user", "text": "Hi", "speaker_id": "cand"})
+        await journal.flush()
+        assert read_journal(journal.path)[2] is None
+        await journal.close(record_file="interviews/x.json")
+        journal.append({"timestamp": "11:00:09", "role": "user", "text": "too late"})
+        return journal.path
+
+    path = asyncio.run(run())
+    assert os.path.basename(path) == "room_1_AJ_1.jsonl"
+    header, turns, end = read_journal(path)
+    assert header["candidate_name"] == "Ada Lovelace"
+    assert [turn["text"] for turn in turns] == ["Hello", "Hi"]
+    assert "ts" not in turns[0]
+    assert end["record_file"] == "interviews/x.json"
+
+
+def test_reused_room_name_starts_a_fresh_journal(tmp_path):
+    async def session(journal_id, text):
+        journal = TranscriptJournal("room-1", HEADER, directory=str(tmp_path), flush_interval=0.01,
+                                    journal_id=journal_id)
+        journal.append({"timestamp": "11:00:01", "role": "user", "text": text})
+        if journal_id == "first":
+            await journal.close(record_file="interviews/first.json")
+        else:
+            await journal.flush()
+        return journal.path
+
+    first = asyncio.run(session("first", "earlier interview"))
+    second = asyncio.run(session(None, "current interview"))
+    assert first != second
+    header, turns, end = read_journal(second)
+    assert header["journal_id"] == os.path.basename(second)[len("room-1_"):-len(".jsonl")]
+    assert [turn["text"] for turn in turns] == ["current interview"]
+    assert end is None
+
+
+def test_read_journal_ignores_torn_last_line(tmp_path):
+    path = tmp_path / "room.jsonl"
+    write_journal(path, {"type": "start", **HEADER}, {"type": "turn", "role": "user", "text": "kept"})
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('{"type": "turn", "role": "user", "te')
+    _, turns, end = read_journal(str(path))
+    assert [turn["text"] for turn in turns] == ["kept"]
+    assert end is None
+
+
+def test_recover_rebuilds_record_and_marks_journal_ended(tmp_path):
+    path = tmp_path / "room.jsonl"
+    write_journal(path, {"type": "start", **HEADER},
+                  {"type": "turn", "timestamp": "11:00:01", "role": "assistant", "text": "Welcome"},
+                  {"type": "turn", "timestamp": "11:00:04", "role": "user", "text": "Thanks"})
+    age(path, 3600)
+
+    record_file = recover_journal(str(path), str(tmp_path / "records"), min_age=60)
+
+    record = read_record(record_file)
+    assert record["interview_status"] == "recovered"
+    assert record["candidate_name"] == "Ada Lovelace"
+    assert [turn["text"] for turn in record["transcript"]] == ["Welcome", "Thanks"]
+    assert record["interview_id"].startswith("interview_Ada_Lovelace_")
+    assert read_journal(str(path))[2]["recovered"] is True
+    # A recovered journal now has an end marker and is not recovered twice
+    assert recover_journal(str(path), str(tmp_path / "records"), min_age=0) is None
+
+
+def test_recover_skips_journals_that_may_still_be_live(tmp_path):
+    path = tmp_path / "room.jsonl"
+    write_journal(path, {"type": "start", **HEADER}, {"type": "turn", "role": "user", "text": "still talking"})
+
+    assert recover_journal(str(path), str(tmp_path / "records"), min_age=60) is None
+    assert not (tmp_path / "records").exists()
+    assert read_journal(str(path))[2] is None
+
+
+def test_recover_skips_completed_journals(tmp_path):
+    path = tmp_path / "room.jsonl"
+    write_journal(path, {"type": "start", **HEADER}, {"type": "end", "record_file": "x.json"})
+    age(path, 3600)
+    assert recover_journal(str(path), str(tmp_path / "records"), min_age=60) is None
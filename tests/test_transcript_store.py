@@ -0,0 +1,36 @@
+import json
+
+import pytest
+
+from transcript_store import TranscriptStore, to_json
+
+
+def test_turns_read_like_dicts():
+    turn = TranscriptStore().add("user", "Hello", "11:00:00", "candidate-1")
+    assert turn['text'] == "Hello" and turn.get('role') == "user"
+    assert {**turn} == {"timestamp": "11:00:00", "role": "user", "text": "Hello", "speaker_id": "candidate-1"}
+    with pytest.raises(KeyError):
+        turn['message']
+
+
+def test_live_view_follows_the_store():
+    store = TranscriptStore()
+    view = store.view()
+    store.add("user", "one", "11:00:00")
+    assert len(view) == 1 and view[-1]['text'] == "one"
+
+
+def test_frozen_view_ignores_later_turns():
+    store = TranscriptStore()
+    for text in ("one", "two"):
+        store.add("user", text, "11:00:00")
+    view = store.view(end=len(store))
+    store.add("assistant", "three", "11:00:01")
+
+    assert len(view) == 2
+    assert [turn['text'] for turn in view] == ["one", "two"]
+    assert view[-1]['text'] == "two"
+    assert [turn['text'] for turn in view[::-1]] == ["two", "one"]
+    with pytest.raises(IndexError):
+        view[2]
+    assert [turn['text'] for turn in json.loads(json.dumps(view, default=to_json))] == ["one", "two"]
@@ -0,0 +1,176 @@
+import logging
+import os
+import re
+
+ANALYSIS_TOKEN_BUDGET = int(os.getenv("ANALYSIS_TOKEN_BUDGET", "24000"))
+COMPACTION_ENCODING = os.getenv("COMPACTION_ENCODING", "cl100k_base")
+RECENT_TURNS_SHARE = float(os.getenv("COMPACTION_RECENT_SHARE", "0.6"))
+SUMMARY_CHUNK_TURNS = int(os.getenv("COMPACTION_CHUNK_TURNS", "8"))
+# Words of a turn's first sentence kept in a level-one chunk summary
+GIST_WORDS = 25
+MIN_GIST_WORDS = 4
+SUMMARY_HEADER = "[Summary of earlier conversation]"
+RECENT_HEADER = "[Most recent conversation]"
+
+FILLER_PATTERN = re.compile(
+    r"(?<![\w'])(?:um+|uh+|erm+|er|ah+|hmm+|mm+|you know|i mean|kind of|sort of)(?![\w'])[,.]?\s*",
+    re.IGNORECASE,
+)
+REPEATED_WORD_PATTERN = re.compile(r"\b(\w+)(?:\s+\1\b)+", re.IGNORECASE)
+SENTENCE_END_PATTERN = re.compile(r"(?<=[.!?])\s+")
+
+logger = logging.getLogger("interviewer.compaction")
+
+_encoding = None
+
+
+def _get_encoding():
+    global _encoding
+    if _encoding is None:
+        try:
+            import tiktoken
+            _encoding = tiktoken.get_encoding(COMPACTION_ENCODING)
+        except Exception as e:
+            logger.warning("⚠️ tiktoken unavailable (%s), estimating token counts from text length", e)
+            _encoding = False
+    return _encoding
+
+
+def count_tokens(text: str) -> int:
+    encoding = _get_encoding()
+    if encoding:
+        return len(encoding.encode(text, disallowed_special=()))
+    return (len(text) + 3) // 4
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Keep the last `max_tokens` tokens of `text`"""
+    if max_tokens <= 0:
+        return ""
+    encoding = _get_encoding()
+    if encoding:
+        tokens = encoding.encode(text, disallowed_special=())
+        return text if len(tokens) <= max_tokens else encoding.decode(tokens[-max_tokens:])
+    return text[-max_tokens * 4:]
+
+
+def speaker_label(role: str) -> str:
+    return "Interviewer" if role == "assistant" else "Candidate"
+
+
+def format_transcript(turns) -> str:
+    """Render (speaker, text) pairs as prompt lines"""
+    return "\n".join(f"{speaker}: {text}" for speaker, text in turns)
+
+
+def drop_filler(text: str) -> str:
+    text = FILLER_PATTERN.sub("", text)
+    text = REPEATED_WORD_PATTERN.sub(r"\1", text)
+    return " ".join(text.split())
+
+
+def merge_turns(conversation_data):
+    """Merge consecutive same-speaker fragments from streaming STT into single turns, dropping filler"""
+    merged = []
+    for entry in conversation_data:
+        speaker = speaker_label(entry.get('role', 'unknown'))
+        text = drop_filler(entry.get('text', '') or '')
+        if not text:
+            continue
+        if merged and merged[-1][0] == speaker:
+            merged[-1] = (speaker, f"{merged[-1][1]} {text}")
+        else:
+            merged.append((speaker, text))
+    return merged
+
+
+def _gist(text: str, max_words: int) -> str:
+    sentence = SENTENCE_END_PATTERN.split(text, maxsplit=1)[0]
+    words = sentence.split()
+    return " ".join(words[:max_words]) + ("…" if len(words) > max_words else "")
+
+
+def _summarize_chunk(turns, max_words: int) -> str:
+    """One extractive summary of a chunk in about `max_words` words, however many turns it covers.
+    When the words can't go round, only the longest turns (in order) are kept."""
+    keep = max(1, min(len(turns), max_words // MIN_GIST_WORDS))
+    if keep < len(turns):
+        longest = sorted(range(len(turns)), key=lambda i: len(turns[i][1]), reverse=True)[:keep]
+        turns = [turns[i] for i in sorted(longest)]
+    per_turn = max(MIN_GIST_WORDS, min(GIST_WORDS, max_words // len(turns)))
+    return " / ".join(f"{speaker}: {_gist(text, per_turn)}" for speaker, text in turns)
+
+
+def compact_transcript(conversation_data, budget: int = ANALYSIS_TOKEN_BUDGET) -> dict:
+    """Fit a conversation into `budget` tokens.
+
+    Fragments are merged and filler dropped first. If that is still over budget, the most
+    recent turns are kept verbatim and older turns are summarized extractively in chunks,
+    with chunk summaries merged level by level until everything fits.
+    """
+    raw_text = format_transcript(
+        (speaker_label(entry.get('role', 'unknown')), entry.get('text', '')) for entry in conversation_data
+    )
+    tokens_before = count_tokens(raw_text)
+
+    turns = merge_turns(conversation_data)
+    text = format_transcript(turns)
+    result = {
+        "text": text,
+        "tokens_before": tokens_before,
+        "tokens_after": count_tokens(text),
+        "turns_before": len(conversation_data),
+        "turns_after": len(turns),
+        "summarized_turns": 0,
+        "summary_levels": 0,
+    }
+    if result["tokens_after"] <= budget:
+        return result
+
+    # Keep as many recent turns verbatim as fit in the recent share of the budget
+    recent_budget = int(budget * RECENT_TURNS_SHARE)
+    recent, recent_tokens = [], 0
+    for speaker, turn_text in reversed(turns):
+        turn_tokens = count_tokens(f"{speaker}: {turn_text}") + 1
+        if recent and recent_tokens + turn_tokens > recent_budget:
+            break
+        recent.insert(0, (speaker, turn_text))
+        recent_tokens += turn_tokens
+    older = turns[:len(turns) - len(recent)]
+    recent_text = format_transcript(recent)
+    if recent_tokens > recent_budget:
+        recent_text = truncate_to_tokens(recent_text, recent_budget)
+        recent_tokens = count_tokens(recent_text)
+
+    # Summarize older turns hierarchically: one summary per chunk, then merge adjacent chunks into a
+    # single summary of the same length (halving the summary) level by level until it fits
+    summary_budget = budget - recent_tokens - count_tokens(f"{SUMMARY_HEADER}\n\n\n{RECENT_HEADER}\n")
+    max_words = GIST_WORDS * SUMMARY_CHUNK_TURNS
+    chunks = [older[i:i + SUMMARY_CHUNK_TURNS] for i in range(0, len(older), SUMMARY_CHUNK_TURNS)]
+    summaries = [_summarize_chunk(chunk, max_words) for chunk in chunks]
+    levels = 1 if summaries else 0
+    summary_text = "\n".join(f"- {summary}" for summary in summaries)
+    while summaries and count_tokens(summary_text) > summary_budget and (len(chunks) > 1 or max_words > MIN_GIST_WORDS):
+        if len(chunks) > 1:
+            chunks = [sum(chunks[i:i + 2], []) for i in range(0, len(chunks), 2)]
+            levels += 1
+        else:
+            max_words = max(MIN_GIST_WORDS, max_words * 2 // 3)
+        summaries = [_summarize_chunk(chunk, max_words) for chunk in chunks]
+        summary_text = "\n".join(f"- {summary}" for summary in summaries)
+    if summary_text and count_tokens(summary_text) > summary_budget:
+        summary_text = truncate_to_tokens(summary_text, max(summary_budget, 0))
+
+    parts = []
+    if summary_text:
+        parts.append(f"{SUMMARY_HEADER}\n{summary_text}")
+    parts.append(f"{RECENT_HEADER}\n{recent_text}" if summary_text else recent_text)
+    text = "\n\n".join(parts)
+    result.update({
+        "text": text,
+        "tokens_after": count_tokens(text),
+        "turns_after": len(recent),
+        "summarized_turns": len(older),
+        "summary_levels": levels,
+    })
+    return result
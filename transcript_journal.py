@@ -0,0 +1,192 @@
+import argparse
+import asyncio
+import glob
+import json
+import logging
+import os
+import re
+import time
+import uuid
+from datetime import datetime, timezone
+
+from interview_record import INTERVIEW_RECORDS_DIR, interview_id_for, save_record
+
+logger = logging.getLogger("interviewer.journal")
+
+TRANSCRIPT_JOURNAL_DIR = os.getenv("TRANSCRIPT_JOURNAL_DIR", "journals")
+JOURNAL_FLUSH_INTERVAL = float(os.getenv("JOURNAL_FLUSH_INTERVAL", "0.5"))
+JOURNAL_BATCH_SIZE = int(os.getenv("JOURNAL_BATCH_SIZE", "64"))
+# A live session touches its journal on every batch; only older unfinished journals are treated as crashed
+JOURNAL_RECOVER_MIN_AGE = float(os.getenv("JOURNAL_RECOVER_MIN_AGE", "900"))
+
+
+def journal_path(room_name: str, journal_id: str, directory: str = TRANSCRIPT_JOURNAL_DIR) -> str:
+    """One file per session: room names can be reused, so the session's job or interview ID is part of the name"""
+    safe_name = re.sub(r"[^\w.-]", "_", f"{room_name or 'room'}_{journal_id}")
+    return os.path.join(directory, f"{safe_name}.jsonl")
+
+
+class TranscriptJournal:
+    """Append-only per-session JSONL journal written by a batching background writer.
+
+    The first record is a `start` header, every conversation entry becomes a `turn`
+    record, and a final `end` record marks that the interview artifacts were written.
+    `journal_id` (the LiveKit job ID in the worker; random when omitted) keeps a
+    reused room name from appending to an earlier session's journal.
+    """
+
+    def __init__(self, room_name: str, header: dict, directory: str = TRANSCRIPT_JOURNAL_DIR,
+                 flush_interval: float = JOURNAL_FLUSH_INTERVAL, batch_size: int = JOURNAL_BATCH_SIZE,
+                 journal_id: str = None) -> None:
+        self.room_name = room_name
+        self.journal_id = journal_id or uuid.uuid4().hex
+        self.path = journal_path(room_name, self.journal_id, directory)
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._queue = asyncio.Queue()
+        self._writer = None
+        self._closed = False
+        os.makedirs(directory, exist_ok=True)
+        self._put({"type": "start", "room": room_name, "journal_id": self.journal_id, **header})
+
+    def _put(self, record: dict):
+        record.setdefault("ts", time.time())
+        self._queue.put_nowait(record)
+        if self._writer is None or self._writer.done():
+            self._writer = asyncio.create_task(self._writer_loop())
+
+    def append(self, entry: dict):
+        """Queue a conversation entry. Never blocks the caller."""
+        if self._closed:
+            return
+        self._put({"type": "turn", **entry})
+
+    async def flush(self):
+        """Wait until every queued record has been written and fsynced"""
+        await self._queue.join()
+
+    async def close(self, **end_fields):
+        """Write the end marker, flush and stop the writer"""
+        if self._closed:
+            return
+        self._put({"type": "end", **end_fields})
+        self._closed = True
+        await self.flush()
+        if self._writer is not None:
+            self._writer.cancel()
+
+    async def _writer_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                await asyncio.to_thread(self._write_batch, batch)
+            except Exception as e:
+                logger.exception("❌ Failed to write transcript journal %s: %s", self.path, e)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _write_batch(self, batch):
+        lines = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in batch)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(lines)
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def read_journal(path: str):
+    """Read a journal file. Returns (header, turns, end_marker); a torn last line is ignored."""
+    header, turns, end = {}, [], None
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            kind = record.pop("type", None)
+            if kind == "start":
+                header = record
+            elif kind == "turn":
+                record.pop("ts", None)
+                turns.append(record)
+            elif kind == "end":
+                end = record
+    return header, turns, end
+
+
+def summary_from_journal(header: dict, turns: list, ended_at: float = None) -> dict:
+    """Build the interview summary dict saved by the agent from journal records"""
+    start_time = header.get("start_time")
+    duration_minutes = 0
+    if start_time and ended_at:
+        start = datetime.fromisoformat(start_time)
+        duration_minutes = max(0.0, (datetime.fromtimestamp(ended_at, timezone.utc) - start).total_seconds() / 60)
+    return {
+        "candidate_name": header.get("candidate_name", "Candidate"),
+        "job_description": header.get("job_description", "Undefined Position"),
+        "start_time": start_time,
+        "duration_minutes": duration_minutes,
+        "interview_status": "completed",
+        "transcript": turns,
+        "summary_notes": "Interview completed via AI interviewer",
+    }
+
+
+def recover_journal(path: str, output_dir: str = INTERVIEW_RECORDS_DIR, min_age: float = JOURNAL_RECOVER_MIN_AGE):
+    """Rebuild the interview record for a journal without an end marker, then mark it ended.
+    Returns the record path, or None if the journal was already complete or was written to
+    less than `min_age` seconds ago (its session may still be live)."""
+    ended_at = os.path.getmtime(path)
+    if time.time() - ended_at < min_age:
+        return None
+    header, turns, end = read_journal(path)
+    if end is not None:
+        return None
+    interview_summary = summary_from_journal(header, turns, ended_at)
+    interview_summary["interview_status"] = "recovered"
+    interview_summary["summary_notes"] = "Recovered from transcript journal after an interrupted session"
+
+    timestamp = datetime.fromtimestamp(ended_at).strftime("%Y%m%d_%H%M%S")
+    interview_id = interview_id_for(interview_summary["candidate_name"], timestamp)
+    record_file = save_record(interview_summary, interview_id, output_dir)
+
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps({"type": "end", "ts": time.time(), "recovered": True, "record_file": record_file}) + "\n")
+    return record_file
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Transcript journal tools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    recover = subparsers.add_parser("recover", help="Rebuild artifacts for journals with no end marker")
+    recover.add_argument("--dir", default=TRANSCRIPT_JOURNAL_DIR, help="Journal directory")
+    recover.add_argument("--output-dir", default=INTERVIEW_RECORDS_DIR, help="Where to write the rebuilt records")
+    recover.add_argument("--min-age", type=float, default=JOURNAL_RECOVER_MIN_AGE,
+                         help="Skip journals modified less than this many seconds ago (sessions may still be live)")
+    args = parser.parse_args()
+
+    recovered = 0
+    for path in sorted(glob.glob(os.path.join(args.dir, "*.jsonl"))):
+        try:
+            result = recover_journal(path, args.output_dir, args.min_age)
+        except Exception as e:
+            print(f"❌ Could not recover {path}: {e}")
+            continue
+        if result:
+            recovered += 1
+            print(f"♻️ Recovered {path} → {result}")
+    print(f"Recovered {recovered} interview(s) from {args.dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+import sys
+from collections.abc import Mapping, Sequence
+from itertools import islice
+
+TURN_FIELDS = ("timestamp", "role", "text", "speaker_id")
+
+
+class Turn(Mapping):
+    """One transcript turn. Reads like the `{'timestamp', 'role', 'text', 'speaker_id'}` dicts it
+    replaces (`turn['text']`, `turn.get('role')`, `{**turn}`) through the read-only Mapping
+    interface, but keeps its fields in slots instead of a per-turn dict."""
+
+    __slots__ = TURN_FIELDS
+
+    def __init__(self, timestamp: str, role: str, text: str, speaker_id: str = None) -> None:
+        self.timestamp = timestamp
+        # Roles and speaker ids repeat on every turn; keep one copy of each string
+        self.role = sys.intern(role)
+        self.text = text
+        self.speaker_id = sys.intern(speaker_id) if isinstance(speaker_id, str) else speaker_id
+
+    def __getitem__(self, key):
+        if key not in TURN_FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(TURN_FIELDS)
+
+    def __len__(self) -> int:
+        return len(TURN_FIELDS)
+
+    def __repr__(self) -> str:
+        return f"Turn({dict(self)!r})"
+
+
+class TranscriptView(Sequence):
+    """Read-only view of a TranscriptStore's turns; nothing is copied. A view with `end` covers only
+    the first `end` turns, so turns added after it was taken never show up in it."""
+
+    __slots__ = ("_turns", "_end")
+
+    def __init__(self, turns: list, end: int = None) -> None:
+        self._turns = turns
+        self._end = end
+
+    def __getitem__(self, index):
+        if self._end is None:
+            return self._turns[index]
+        if isinstance(index, slice):
+            return [self._turns[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("transcript view index out of range")
+        return self._turns[index]
+
+    def __len__(self) -> int:
+        if self._end is None:
+            return len(self._turns)
+        return min(self._end, len(self._turns))
+
+    def __iter__(self):
+        if self._end is None:
+            return iter(self._turns)
+        return islice(self._turns, len(self))
+
+
+class TranscriptStore:
+    """The single in-memory transcript of a session. Turns are added by the transcript handlers;
+    the save and analysis paths read them through `view()`."""
+
+    __slots__ = ("_turns",)
+
+    def __init__(self) -> None:
+        self._turns = []
+
+    def add(self, role: str, text: str, timestamp: str, speaker_id: str = None) -> Turn:
+        turn = Turn(timestamp, role, text, speaker_id)
+        self._turns.append(turn)
+        return turn
+
+    def view(self, end: int = None) -> TranscriptView:
+        """A view of the turns; pass `end=len(store)` to freeze it at the turns recorded so far"""
+        return TranscriptView(self._turns, end)
+
+    def __len__(self) -> int:
+        return len(self._turns)
+
+    def __iter__(self):
+        return iter(self._turns)
+
+
+def to_json(value):
+    """`json.dumps(default=...)` hook that writes turns and views as plain objects and lists"""
+    if isinstance(value, Mapping):
+        return dict(value)
+    if isinstance(value, Sequence):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
@@ -0,0 +1,17 @@
+import os
+
+import psutil
+
+WORKER_LOAD_THRESHOLD = float(os.getenv("WORKER_LOAD_THRESHOLD", "0.75"))
+MAX_SESSIONS_PER_WORKER = int(os.getenv("MAX_SESSIONS_PER_WORKER", "8"))
+
+
+def compute_worker_load(worker) -> float:
+    """Load in [0, 1] reported to the dispatcher: the higher of session and CPU pressure.
+
+    Sessions run in separate job processes, so machine-wide CPU use (which includes them)
+    is the saturation signal; the worker process's own event loop says nothing about it.
+    """
+    session_load = len(worker.active_jobs) / MAX_SESSIONS_PER_WORKER
+    cpu_load = psutil.cpu_percent(interval=None) / 100
+    return min(1.0, max(session_load, cpu_load))